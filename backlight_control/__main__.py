@@ -1,45 +1,63 @@
 import asyncio
-import logging
 from os import R_OK, access, path
 import sys
 
 import yaml
 
-from .hub import LightControlHub
-
-CONF_LOG_LEVEL = "log_level"
+from .log import setup_logging
 
 
 async def main_coro(config):
-    logging.basicConfig(
-        level=getattr(logging, config.get(CONF_LOG_LEVEL, ""), logging.INFO)
-    )
+    # Imported here so that --once does not load the activity monitor,
+    # logind and the rest of the daemon.
+    from .hub import LightControlHub
+
+    log_listener = setup_logging(config)
     mon = LightControlHub(config)
     try:
         await mon.start()
     except asyncio.CancelledError:
         mon.stop()
+    finally:
+        log_listener.stop()
+
+
+async def once_coro(config) -> int:
+    from .once import apply_once
+
+    log_listener = setup_logging(config)
+    try:
+        return await apply_once(config)
+    finally:
+        log_listener.stop()
 
 
 def print_usage():
-    print(f"Usage: {sys.argv[0]} <config_file>")
+    print(f"Usage: {sys.argv[0]} [--once] <config_file>")
 
 
 def main():
-    if len(sys.argv) != 2:
+    args = sys.argv[1:]
+    once = bool(args) and args[0] == "--once"
+    if once:
+        args = args[1:]
+    if len(args) != 1:
         print_usage()
         exit(1)
-    if not (path.isfile(sys.argv[1]) and access(sys.argv[1], R_OK)):
-        print(f"Path is not a file or not readable:\n\t{sys.argv[1]}\n")
+    config_path = args[0]
+    if not (path.isfile(config_path) and access(config_path, R_OK)):
+        print(f"Path is not a file or not readable:\n\t{config_path}\n")
         print_usage()
         exit(1)
     try:
-        with open(sys.argv[1]) as config_file:
+        with open(config_path) as config_file:
             config = yaml.safe_load(config_file.read())
     except OSError as e:
-        print(f"Failed to read config file:\n\t{sys.argv[1]}\n\t{e}\n")
+        print(f"Failed to read config file:\n\t{config_path}\n\t{e}\n")
         print_usage()
         exit(1)
+    if once:
+        exit(asyncio.run(once_coro(config)))
     asyncio.run(main_coro(config))
 
 
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod, abstractproperty
+from collections.abc import Hashable
 from importlib import import_module
 import logging
 from typing import TYPE_CHECKING
 
+from .call_guard import CONF_CALLS, CallGuard
 from .types import ActivityMonitorBackend, LightControlHubActivityUpdate
 
 if TYPE_CHECKING:
@@ -17,20 +19,54 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class ActivityMonitor(ABC):
+    """Base class of the activity monitors.
+
+    Monitors that watch several sources, e.g. one per seat, report each one
+    under its own key. The user is idle once every source is idle, and active
+    as soon as any source is. Only changes of that combined state reach the
+    hub, so repeated reports are cheap.
+    """
+
+    _call_guard: CallGuard | None = None
     _hub: LightControlHub
     _is_idle: bool = False
+    _sources: dict[Hashable, bool] | None = None
 
     @abstractmethod
     def __init__(self, hub: LightControlHub, config: dict):
         raise NotImplementedError
 
+    @property
+    def call_guard(self) -> CallGuard:
+        """Deadlines and circuit breaker for calls into the backend."""
+        if self._call_guard is None:
+            self._call_guard = CallGuard(type(self).__name__, {})
+        return self._call_guard
+
     @abstractproperty
     def config(self) -> dict:
         raise NotImplementedError
 
-    async def end_idle(self) -> None:
+    async def end_idle(self, source: Hashable = None) -> None:
+        await self._set_source_idle(source, False)
+
+    async def pause(self) -> None:
+        """Stop watching for activity until resume() is called."""
+        return
+
+    async def resume(self) -> None:
+        return
+
+    def reset_idle(self) -> None:
+        """Mark every known source active without reporting it.
+
+        The hub calls this when it wakes up by itself, e.g. on resume, so that
+        the next idle period is reported again. Sources are kept rather than
+        forgotten, so one of several going idle again does not pass for all.
+        """
+        if self._sources:
+            self._sources = dict.fromkeys(self._sources, False)
         self._is_idle = False
-        await self._hub.activity_update(LightControlHubActivityUpdate(is_idle=False))
 
     @abstractmethod
     async def start(self) -> None:
@@ -39,9 +75,28 @@ class ActivityMonitor(ABC):
     def stop(self) -> None:
         return
 
-    async def trigger_idle(self) -> None:
-        self._is_idle = True
-        await self._hub.activity_update(LightControlHubActivityUpdate(is_idle=True))
+    async def trigger_idle(self, source: Hashable = None) -> None:
+        await self._set_source_idle(source, True)
+
+    async def remove_source(self, source: Hashable) -> None:
+        """Forget a source that went away, e.g. an unplugged seat."""
+        if self._sources is not None and self._sources.pop(source, None) is not None:
+            await self._update_idle()
+
+    async def _set_source_idle(self, source: Hashable, is_idle: bool) -> None:
+        if self._sources is None:
+            self._sources = {}
+        if self._sources.get(source) == is_idle:
+            return
+        self._sources[source] = is_idle
+        await self._update_idle()
+
+    async def _update_idle(self) -> None:
+        is_idle = bool(self._sources) and all(self._sources.values())
+        if is_idle == self._is_idle:
+            return
+        self._is_idle = is_idle
+        await self._hub.activity_update(LightControlHubActivityUpdate(is_idle=is_idle))
 
 
 class _DummyActivityMonitor(ActivityMonitor):
@@ -84,4 +139,5 @@ def get_and_verify_activity_plugin(
             instance.__class__.__name__,
         )
 
+    instance._call_guard = CallGuard(backend.value, config.get(CONF_CALLS) or {})
     return instance
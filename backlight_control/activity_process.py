@@ -0,0 +1,239 @@
+"""Run an activity monitor in a supervised child process.
+
+The X11 and Wayland monitors run blocking client libraries in threads, which
+compete with the event loop for the GIL under heavy input. In a child process
+they only cost the daemon a line on a pipe per idle or active edge.
+
+The child is started as `python -m backlight_control.activity_process` with the
+activity monitor config as JSON argument. It writes "ready" or "failed" to
+stdout once the monitor has started, then "idle" and "active" lines. It reads
+"pause", "resume" and "reset" lines from stdin, and exits when stdin is closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from .activity_monitor import ActivityMonitor, get_and_verify_activity_plugin
+from .types import ActivityMonitorBackend, LightControlHubActivityUpdate
+
+if TYPE_CHECKING:
+    from .hub import LightControlHub
+
+CONF_PROCESS = "process"
+CONF_RESTART_DELAY = "restart_delay"
+DEFAULT_RESTART_DELAY = 1.0
+# Restarts back off exponentially up to this many seconds.
+MAX_RESTART_DELAY = 60.0
+# A child that ran at least this long resets the back-off.
+STABLE_RUN_TIME = 60.0
+
+_ACTIVE = b"active\n"
+_FAILED = b"failed\n"
+_IDLE = b"idle\n"
+_PAUSE = b"pause\n"
+_READY = b"ready\n"
+_RESET = b"reset\n"
+_RESUME = b"resume\n"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProcessActivityMonitor(ActivityMonitor):
+    """Proxy for an activity monitor running in a child process."""
+
+    # Module run in the child; tests swap in one with fake plugins.
+    _worker_module: str = __name__
+
+    def __init__(
+        self,
+        hub: LightControlHub,
+        config: dict,
+        backend: ActivityMonitorBackend,
+        log_level: str | None = None,
+    ) -> None:
+        self._hub: LightControlHub = hub
+        self._config: dict = config
+        self._backend = backend
+        self._log_level = log_level
+        self._restart_delay: float = config.get(
+            CONF_RESTART_DELAY, DEFAULT_RESTART_DELAY
+        )
+        self._process: asyncio.subprocess.Process | None = None
+        self._supervisor: asyncio.Task | None = None
+        self._paused = False
+        self._stopping = False
+        self._ready: asyncio.Future[bool] | None = None
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    async def start(self) -> None:
+        """Start the child and wait until its monitor has started."""
+        self._stopping = False
+        self._ready = asyncio.get_running_loop().create_future()
+        self._supervisor = asyncio.create_task(self._supervise())
+        if not await self._ready:
+            raise RuntimeError("Activity monitor process failed to start")
+
+    def stop(self) -> None:
+        self._stopping = True
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+        if self._process is not None and self._process.returncode is None:
+            self._process.terminate()
+
+    async def pause(self) -> None:
+        self._paused = True
+        await self._send(_PAUSE)
+
+    async def resume(self) -> None:
+        self._paused = False
+        await self._send(_RESUME)
+
+    def reset_idle(self) -> None:
+        super().reset_idle()
+        # The child keeps its own per-source state. Not drained: the pipe has
+        # room for a line, and a dead child is restarted active anyway.
+        if self._process is not None and self._process.stdin is not None:
+            self._process.stdin.write(_RESET)
+
+    async def _send(self, command: bytes) -> None:
+        if self._process is None or self._process.stdin is None:
+            return
+        try:
+            self._process.stdin.write(command)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # The supervisor restarts the child in the right state.
+            pass
+
+    def _set_ready(self, ready: bool) -> None:
+        """Answer start(); later children are not waited for."""
+        if self._ready is not None and not self._ready.done():
+            self._ready.set_result(ready)
+
+    async def _supervise(self) -> None:
+        delay = self._restart_delay
+        while not self._stopping:
+            started = time.monotonic()
+            await self._run_child()
+            if self._stopping:
+                return
+            if time.monotonic() - started >= STABLE_RUN_TIME:
+                delay = self._restart_delay
+            _LOGGER.warning(
+                "Activity monitor process exited with %s, restarting in %g s",
+                self._process.returncode if self._process else None,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+
+    async def _run_child(self) -> None:
+        config = {
+            key: value for key, value in self._config.items() if key != CONF_PROCESS
+        }
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                self._worker_module,
+                self._backend.value,
+                json.dumps(config),
+                self._log_level or "",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                # Find this package even when it is not installed.
+                env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+            )
+        except OSError as e:
+            _LOGGER.error("Failed to start activity monitor process: %s", e)
+            self._set_ready(False)
+            return
+
+        _LOGGER.debug("Started activity monitor process %d", self._process.pid)
+        if self._paused:
+            await self._send(_PAUSE)
+        # A new child starts out active and only reports changes from there.
+        if self._is_idle:
+            await self.end_idle()
+        async for line in self._process.stdout:  # type: ignore[union-attr]
+            if line == _IDLE:
+                await self.trigger_idle()
+            elif line == _ACTIVE:
+                await self.end_idle()
+            elif line == _READY:
+                self._set_ready(True)
+            elif line == _FAILED:
+                self._set_ready(False)
+        # The child exited before it got its monitor started.
+        self._set_ready(False)
+        await self._process.wait()
+
+
+class _WorkerHub:
+    """Stand-in for the hub inside the child process."""
+
+    def __init__(self) -> None:
+        self.activity_monitor: ActivityMonitor | None = None
+
+    async def activity_update(self, update: LightControlHubActivityUpdate) -> None:
+        _report(_IDLE if update.is_idle else _ACTIVE)
+
+
+def _report(line: bytes) -> None:
+    sys.stdout.buffer.write(line)
+    sys.stdout.buffer.flush()
+
+
+async def _worker(backend: ActivityMonitorBackend, config: dict) -> bool:
+    """Run the monitor until stdin is closed, return whether it started."""
+    loop = asyncio.get_running_loop()
+    hub = _WorkerHub()
+    monitor = get_and_verify_activity_plugin(backend, hub, config)  # type: ignore[arg-type]
+    hub.activity_monitor = monitor
+
+    commands = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(commands), sys.stdin
+    )
+    try:
+        await monitor.start()
+    except Exception as e:
+        _LOGGER.error("Failed to start activity monitor: %s", e)
+        monitor.stop()
+        _report(_FAILED)
+        return False
+    _report(_READY)
+    try:
+        async for line in commands:
+            if line == _PAUSE:
+                await monitor.pause()
+            elif line == _RESUME:
+                await monitor.resume()
+            elif line == _RESET:
+                monitor.reset_idle()
+    finally:
+        monitor.stop()
+    return True
+
+
+def main() -> None:
+    backend, config, log_level = sys.argv[1:4]
+    logging.basicConfig(level=getattr(logging, log_level, logging.INFO))
+    started = asyncio.run(_worker(ActivityMonitorBackend(backend), json.loads(config)))
+    # Do not wait for monitor threads still blocked in their client library.
+    sys.stdout.flush()
+    os._exit(0 if started else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Coroutine
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, TypeVar
+
+CONF_BREAKER_FAILURES = "breaker_failures"
+CONF_BREAKER_RESET = "breaker_reset"
+CONF_CALLS = "calls"
+CONF_DEADLINES = "deadlines"
+CONF_SLOW_CALL = "slow_call"
+DEFAULT_BREAKER_FAILURES = 3
+DEFAULT_BREAKER_RESET = 30.0
+DEFAULT_DEADLINE = 2.0
+DEFAULT_SLOW_CALL = 0.25
+DEADLINE_DEFAULT_KEY = "default"
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BackendCallError(Exception):
+    """A call into a plugin backend did not complete."""
+
+
+class BackendTimeoutError(BackendCallError):
+    """A call into a plugin backend missed its deadline."""
+
+
+class BackendUnavailableError(BackendCallError):
+    """The circuit breaker of a plugin backend is open."""
+
+
+@dataclass(kw_only=True)
+class CallStats:
+    calls: int = 0
+    failures: int = 0
+    rejected: int = 0
+    slow: int = 0
+    timeouts: int = 0
+    slowest: float = 0.0
+
+
+class CallGuard:
+    """Deadlines, slow call accounting and a circuit breaker for one backend.
+
+    Every call gets the deadline configured for its operation. After
+    `breaker_failures` timeouts or errors in a row the breaker opens and calls
+    are rejected right away. After `breaker_reset` seconds calls are let
+    through again: the first success closes the breaker, the first failure
+    opens it for another `breaker_reset` seconds.
+    """
+
+    def __init__(self, name: str, config: dict) -> None:
+        self.name = name
+        self.stats: dict[str, CallStats] = {}
+        deadlines = config.get(CONF_DEADLINES) or {}
+        self._default_deadline: float = deadlines.get(
+            DEADLINE_DEFAULT_KEY, DEFAULT_DEADLINE
+        )
+        self._deadlines: dict[str, float] = deadlines
+        self._slow_call: float = config.get(CONF_SLOW_CALL, DEFAULT_SLOW_CALL)
+        self._breaker_failures: int = config.get(
+            CONF_BREAKER_FAILURES, DEFAULT_BREAKER_FAILURES
+        )
+        self._breaker_reset: float = config.get(
+            CONF_BREAKER_RESET, DEFAULT_BREAKER_RESET
+        )
+        self._consecutive_failures = 0
+        self._open_until: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_until is not None and time.monotonic() < self._open_until
+
+    def deadline(self, operation: str) -> float:
+        return self._deadlines.get(operation, self._default_deadline)
+
+    async def call(self, operation: str, awaitable: Awaitable[T]) -> T:
+        """Await `awaitable` within the deadline of `operation`.
+
+        Raises BackendUnavailableError without awaiting it while the breaker is
+        open, and BackendTimeoutError if the deadline passes.
+        """
+        stats = self.stats.setdefault(operation, CallStats())
+        if self.is_open:
+            stats.rejected += 1
+            if isinstance(awaitable, Coroutine):
+                awaitable.close()
+            raise BackendUnavailableError(f"{self.name} is unavailable")
+
+        stats.calls += 1
+        deadline = self.deadline(operation)
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(deadline):
+                result = await awaitable
+        except TimeoutError as e:
+            stats.timeouts += 1
+            _LOGGER.warning(
+                "%s: %s did not complete within %.2f s",
+                self.name,
+                operation,
+                deadline,
+            )
+            self._failed()
+            raise BackendTimeoutError(f"{self.name}: {operation} timed out") from e
+        except Exception:
+            stats.failures += 1
+            self._failed()
+            raise
+
+        elapsed = time.monotonic() - started
+        stats.slowest = max(stats.slowest, elapsed)
+        if elapsed > self._slow_call:
+            stats.slow += 1
+            _LOGGER.debug("%s: slow %s took %.3f s", self.name, operation, elapsed)
+        if self._open_until is not None:
+            _LOGGER.info("%s responds again, closing circuit breaker", self.name)
+            self._open_until = None
+        self._consecutive_failures = 0
+        return result
+
+    async def try_call(
+        self, operation: str, awaitable: Awaitable[T], default: Any = None
+    ) -> T | Any:
+        """Like call(), but return `default` if the call does not complete."""
+        try:
+            return await self.call(operation, awaitable)
+        except BackendCallError as e:
+            _LOGGER.debug("%s", e)
+            return default
+
+    def log_stats(self) -> None:
+        for operation, stats in sorted(self.stats.items()):
+            _LOGGER.info(
+                "%s: %s: %d calls, %d slow, %d timeouts, %d failures,"
+                " %d rejected, slowest %.3f s",
+                self.name,
+                operation,
+                stats.calls,
+                stats.slow,
+                stats.timeouts,
+                stats.failures,
+                stats.rejected,
+                stats.slowest,
+            )
+
+    def _failed(self) -> None:
+        self._consecutive_failures += 1
+        if self._consecutive_failures < self._breaker_failures:
+            return
+        if self._open_until is None:
+            _LOGGER.warning(
+                "%s stopped responding, leaving it alone for %g s",
+                self.name,
+                self._breaker_reset,
+            )
+        # Also re-opens the breaker when the trial call after a reset fails.
+        self._open_until = time.monotonic() + self._breaker_reset
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+
+from dbus_fast import Message, MessageType
+from dbus_fast.aio import MessageBus
+from dbus_fast.errors import DBusError
+
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def watch_properties_changed(
+    bus: MessageBus,
+    sender: str,
+    path: str,
+    interface: str,
+    handler: Callable[[dict, list], None],
+) -> None:
+    """Call `handler` with PropertiesChanged of one interface of one object.
+
+    Proxy objects match PropertiesChanged of every interface of an object, so
+    the bus wakes us for properties we never use. The match rule installed here
+    also filters on the interface name (arg0), and the handler sees the raw
+    message body without any proxy dispatch.
+
+    arg0 only matches the interface name, not the properties that changed.
+    Services that keep several kinds of property on one interface still wake
+    us for all of them. For example, net.hadess.SensorProxy carries the light
+    level, the accelerometer orientation and the proximity state, so the
+    handler has to check which properties it got.
+    """
+    rule = (
+        f"type='signal',sender='{sender}',path='{path}',"
+        f"interface='{PROPERTIES_INTERFACE}',member='PropertiesChanged',"
+        f"arg0='{interface}'"
+    )
+    reply = await bus.call(
+        Message(
+            destination="org.freedesktop.DBus",
+            path="/org/freedesktop/DBus",
+            interface="org.freedesktop.DBus",
+            member="AddMatch",
+            signature="s",
+            body=[rule],
+        )
+    )
+    if reply is not None and reply.message_type == MessageType.ERROR:
+        raise DBusError(reply.error_name, reply.body[0] if reply.body else "")
+    _LOGGER.debug("Added match rule %s", rule)
+
+    def on_message(message: Message) -> None:
+        if (
+            message.message_type == MessageType.SIGNAL
+            and message.member == "PropertiesChanged"
+            and message.path == path
+            and message.interface == PROPERTIES_INTERFACE
+            and message.body[0] == interface
+        ):
+            handler(message.body[1], message.body[2])
+
+    bus.add_message_handler(on_message)
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod, abstractproperty
+from bisect import bisect_right
+from importlib import import_module
+import logging
+import math
+from typing import TYPE_CHECKING
+
+from .call_guard import CONF_CALLS, BackendCallError, CallGuard
+from .types import (
+    CONF_TYPE,
+    ConfigError,
+    DisplayBacklightBackend,
+    LightControlHubLightSensorUpdate,
+)
+
+if TYPE_CHECKING:
+    from .hub import LightControlHub
+
+CONF_CURVE = "curve"
+CONF_DISPLAY_BACKLIGHT = "display_backlight"
+CONF_LUX_HYSTERESIS = "lux_hysteresis"
+# Pairs of [lux, brightness in percent of the maximum].
+DEFAULT_CURVE = [[0, 5], [10, 20], [100, 50], [1000, 100]]
+DEFAULT_LUX_HYSTERESIS = 0.1
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DisplayBacklight(ABC):
+    """Panel backlight driven by the same light sensor as the keyboard.
+
+    The brightness follows a piecewise linear curve through the configured
+    points. Readings within `lux_hysteresis` of the last applied reading are
+    ignored, so that small fluctuations do not make the screen flicker.
+    """
+
+    target: int | None = None
+    _applied_lux: float | None = None
+    _call_guard: CallGuard | None = None
+    _config: dict
+    _written: int | None = None
+
+    @abstractmethod
+    def __init__(self, hub: LightControlHub, config: dict) -> None:
+        raise NotImplementedError
+
+    @property
+    def call_guard(self) -> CallGuard:
+        """Deadlines and circuit breaker for calls into the backend."""
+        if self._call_guard is None:
+            self._call_guard = CallGuard(type(self).__name__, {})
+        return self._call_guard
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    @property
+    def written(self) -> int | None:
+        """Return the last brightness written to the device."""
+        return self._written
+
+    def forget_written(self) -> None:
+        """Write the next value even if it was the last one written.
+
+        Used when the device may have changed without notice, e.g. in suspend.
+        """
+        self._written = None
+
+    @abstractmethod
+    async def get_current(self) -> int:
+        raise NotImplementedError
+
+    @abstractproperty
+    def maximum(self) -> int:
+        raise NotImplementedError
+
+    async def on_lighting_event(self, update: LightControlHubLightSensorUpdate) -> None:
+        if not self.needs_update(update.value):
+            return
+        self.target = self.target_for_lux(update.value)
+        _LOGGER.debug("Target display brightness: %d", self.target)
+        self._applied_lux = update.value
+        await self.write(self.target)
+
+    def needs_update(self, value: float) -> bool:
+        """Return whether a reading of `value` lux would change the output."""
+        low, high = self.lux_band(value)
+        return not low <= value < high
+
+    def lux_band(self, value: float) -> tuple[float, float]:
+        """Return the interval of readings that do not change the output."""
+        if self._applied_lux is None:
+            return (math.inf, -math.inf)
+        factor = 1 + self.config[CONF_LUX_HYSTERESIS]
+        return (
+            self._applied_lux / factor,
+            max(self._applied_lux * factor, self._applied_lux + 1),
+        )
+
+    def target_for_lux(self, value: float) -> int:
+        curve = self.config[CONF_CURVE]
+        index = bisect_right([lux for lux, _ in curve], value)
+        if index == 0:
+            percent = curve[0][1]
+        elif index == len(curve):
+            percent = curve[-1][1]
+        else:
+            (lux_low, low), (lux_high, high) = curve[index - 1], curve[index]
+            percent = low + (value - lux_low) / (lux_high - lux_low) * (high - low)
+        return max(1, round(percent / 100 * self.maximum))
+
+    @abstractmethod
+    async def set_absolute(self, value: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def start(self) -> None:
+        raise NotImplementedError
+
+    def stop(self) -> None:
+        return
+
+    async def write(self, value: int) -> None:
+        """Write `value`, unless it was the last value written."""
+        if value == self._written:
+            return
+        try:
+            await self.call_guard.call("set_absolute", self.set_absolute(value))
+        except BackendCallError as e:
+            _LOGGER.debug("Display brightness not written: %s", e)
+            return
+        self._written = value
+
+
+class _DummyDisplayBacklight(DisplayBacklight):
+    def __init__(self, hub: LightControlHub, config: dict) -> None:
+        self._config = config
+
+    async def get_current(self) -> int:
+        return 0
+
+    @property
+    def maximum(self) -> int:
+        return 0
+
+    async def on_lighting_event(self, update: LightControlHubLightSensorUpdate) -> None:
+        pass
+
+    def needs_update(self, value: float) -> bool:
+        return False
+
+    def lux_band(self, value: float) -> tuple[float, float]:
+        return (-math.inf, math.inf)
+
+    async def set_absolute(self, value: int) -> None:
+        pass
+
+    async def start(self) -> None:
+        pass
+
+
+def get_display_backlight_plugin_from_config(
+    hub: LightControlHub,
+    config: dict,
+) -> DisplayBacklight:
+    """Return DisplayBacklight from config."""
+    if config.get(CONF_DISPLAY_BACKLIGHT) is None:
+        return _DummyDisplayBacklight(hub, {})
+    try:
+        plugin = DisplayBacklightBackend(config[CONF_DISPLAY_BACKLIGHT][CONF_TYPE])
+    except ValueError as e:
+        raise ConfigError("No valid display_backlight plugin defined in config.") from e
+
+    _LOGGER.debug("Using display_backlight plugin %s", plugin.value)
+    return get_and_verify_display_backlight_plugin(
+        plugin,
+        hub,
+        config[CONF_DISPLAY_BACKLIGHT],
+    )
+
+
+def get_and_verify_display_backlight_plugin(
+    backend: DisplayBacklightBackend,
+    hub: LightControlHub,
+    config: dict,
+) -> DisplayBacklight:
+    if backend == DisplayBacklightBackend.NONE:
+        return _DummyDisplayBacklight(hub, {})
+    try:
+        module = import_module(
+            f".{backend.value}", "backlight_control.plugins.display_backlight"
+        )
+    except ImportError as e:
+        raise ImportError(f"Failed to import display backlight {backend.value}") from e
+
+    config = _parse_config(config)
+    try:
+        instance = module.get_plugin(hub, config)
+    except AttributeError as e:
+        raise AttributeError(
+            f"Module {backend.value} does not define a `get_plugin` function"
+        ) from e
+
+    if not isinstance(instance, DisplayBacklight):
+        raise RuntimeError(
+            f"Instance of {instance.__class__.__name__} does not inherit from"
+            " DisplayBacklight",
+        )
+
+    instance._call_guard = CallGuard(backend.value, config.get(CONF_CALLS) or {})
+    return instance
+
+
+def _parse_config(config: dict) -> dict:
+    """Parse config and set defaults where necessary."""
+    curve = config.get(CONF_CURVE) or DEFAULT_CURVE
+    try:
+        curve = sorted([float(lux), float(percent)] for lux, percent in curve)
+    except (TypeError, ValueError) as e:
+        raise ConfigError(
+            "display_backlight curve must be a list of [lux, percent] pairs."
+        ) from e
+    if len({lux for lux, _ in curve}) != len(curve):
+        raise ConfigError("display_backlight curve has duplicate lux values.")
+    config[CONF_CURVE] = curve
+    config[CONF_LUX_HYSTERESIS] = config.get(
+        CONF_LUX_HYSTERESIS, DEFAULT_LUX_HYSTERESIS
+    )
+    return config
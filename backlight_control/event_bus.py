@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+from typing import Generic, TypeVar
+
+from .types import (
+    EventBusOverflowPolicy,
+    LightControlHubActivityUpdate,
+    LightControlHubLightSensorUpdate,
+)
+
+CONF_OVERFLOW = "overflow"
+CONF_QUEUE_SIZE = "queue_size"
+DEFAULT_QUEUE_SIZE = 16
+
+_LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Topic(Generic[T]):
+    name: str
+    payload_type: type[T]
+
+
+ACTIVITY_TOPIC = Topic("activity", LightControlHubActivityUpdate)
+LIGHT_SENSOR_TOPIC = Topic("light_sensor", LightControlHubLightSensorUpdate)
+
+
+class Subscription(Generic[T]):
+    """A bounded queue feeding one consumer of a topic."""
+
+    def __init__(
+        self,
+        topic: Topic[T],
+        handler: Callable[[T], Awaitable[None]],
+        queue_size: int,
+        overflow: EventBusOverflowPolicy,
+    ) -> None:
+        self.topic = topic
+        self.dropped = 0
+        self._handler = handler
+        self._overflow = overflow
+        self._queue: deque[T] = deque(
+            maxlen=1 if overflow == EventBusOverflowPolicy.COALESCE else queue_size
+        )
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def put(self, payload: T) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(payload)
+        self._ready.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._consume())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _consume(self) -> None:
+        while True:
+            await self._ready.wait()
+            while self._queue:
+                payload = self._queue.popleft()
+                try:
+                    await self._handler(payload)
+                except Exception:
+                    _LOGGER.exception(
+                        "Subscriber of %s failed to handle %s", self.topic.name, payload
+                    )
+            self._ready.clear()
+
+
+class EventBus:
+    """Internal publish/subscribe bus.
+
+    Publishing never waits for subscribers. Every subscriber has its own
+    bounded queue and consumer task, so a slow subscriber only delays itself.
+    """
+
+    def __init__(self) -> None:
+        self._subscriptions: dict[Topic, list[Subscription]] = {}
+        self._started = False
+
+    def publish(self, topic: Topic[T], payload: T) -> None:
+        for subscription in self._subscriptions.get(topic, ()):
+            subscription.put(payload)
+
+    def subscribe(
+        self,
+        topic: Topic[T],
+        handler: Callable[[T], Awaitable[None]],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        overflow: EventBusOverflowPolicy = EventBusOverflowPolicy.DROP_OLDEST,
+    ) -> Subscription[T]:
+        subscription = Subscription(topic, handler, queue_size, overflow)
+        self._subscriptions.setdefault(topic, []).append(subscription)
+        if self._started:
+            subscription.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.stop()
+        self._subscriptions[subscription.topic].remove(subscription)
+
+    def start(self) -> None:
+        self._started = True
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.start()
+
+    def stop(self) -> None:
+        self._started = False
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.stop()
@@ -2,31 +2,104 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING
+import os
+import time
+from typing import TYPE_CHECKING, Any
 
 from .activity_monitor import get_and_verify_activity_plugin
-from .keyboard_backlight import get_and_verify_keyboard_backlight_plugin
-from .light_sensor import get_and_verify_light_sensor_plugin
+from .activity_process import CONF_PROCESS, ProcessActivityMonitor
+from .display_backlight import (
+    get_and_verify_display_backlight_plugin,
+    get_display_backlight_plugin_from_config,
+)
+from .event_bus import (
+    ACTIVITY_TOPIC,
+    CONF_OVERFLOW,
+    CONF_QUEUE_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    LIGHT_SENSOR_TOPIC,
+    EventBus,
+    Topic,
+)
+from .keyboard_backlight import get_keyboard_backlight_plugin_from_config
+from .light_sensor import (
+    CONF_LIGHT_SENSOR,
+    get_and_verify_light_sensor_plugin,
+    get_light_sensor_plugin_from_config,
+)
+from .log import CONF_LOG_LEVEL
+from .logind import CONF_LOGIND, DEFAULT_LOGIND, LogindMonitor
+from .memory import (
+    CONF_MEMORY_REPORT_INTERVAL,
+    CONF_MEMORY_REPORT_TOP,
+    DEFAULT_MEMORY_REPORT_TOP,
+    MemoryMonitor,
+)
+from .state import (
+    CONF_STATE_FILE,
+    CONF_STATE_MAX_AGE,
+    CONF_STATE_WRITE_INTERVAL,
+    DEFAULT_STATE_MAX_AGE,
+    DEFAULT_STATE_WRITE_INTERVAL,
+    StateStore,
+    default_state_file,
+)
+from .status_page import (
+    CONF_STATUS_PAGE,
+    DEFAULT_STATUS_PAGE,
+    StatusPage,
+    default_status_page_path,
+)
 from .types import (
+    CONF_TYPE,
     ActivityMonitorBackend,
     ConfigError,
-    KeyboardBacklightBackend,
+    DisplayBacklightBackend,
+    EventBusOverflowPolicy,
     KeyboardBacklightOperatingMode,
     LightControlHubActivityUpdate,
+    LightControlHubEvent,
     LightControlHubLightSensorUpdate,
+    LightControlHubState,
     LightSensorBackend,
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Coroutine
+
     from .activity_monitor import ActivityMonitor
-    from .keyboard_backlight import KeyboardBacklight
-    from .light_sensor import LightSensor
 
 
 CONF_ACTIVITY_MONITOR = "activity_monitor"
-CONF_KEYBOARD_BACKLIGHT = "keyboard_backlight"
-CONF_LIGHT_SENSOR = "light_sensor"
-CONF_TYPE = "type"
+CONF_DEADLINE = "deadline"
+CONF_EVENT_BUS = "event_bus"
+CONF_RELEASE_DELAY = "release_delay"
+CONF_RETRIES = "retries"
+CONF_RETRY_DELAY = "retry_delay"
+CONF_STARTUP = "startup"
+CONF_WAKE_SENSOR_DEADLINE = "wake_sensor_deadline"
+DEFAULT_RELEASE_DELAY = 30
+DEFAULT_WAKE_SENSOR_DEADLINE = 0.5
+# Plugins start in two stages: first the backlights and the light sensor, so
+# that a brightness can be applied right away, then the activity monitor.
+STAGE_ACTIVITY_MONITOR = "activity_monitor"
+STAGE_OUTPUT = "output"
+DEFAULT_STARTUP = {
+    STAGE_ACTIVITY_MONITOR: {CONF_DEADLINE: 10, CONF_RETRIES: 10, CONF_RETRY_DELAY: 2},
+    STAGE_OUTPUT: {CONF_DEADLINE: 5, CONF_RETRIES: 3, CONF_RETRY_DELAY: 1},
+}
+
+# Events that may cause I/O in each hub state. Anything else is dropped.
+ACCEPTED_EVENTS: dict[LightControlHubState, frozenset[LightControlHubEvent]] = {
+    LightControlHubState.ACTIVE_ON: frozenset(
+        {LightControlHubEvent.IDLE, LightControlHubEvent.LIGHT}
+    ),
+    LightControlHubState.ACTIVE_OFF: frozenset(
+        {LightControlHubEvent.IDLE, LightControlHubEvent.LIGHT}
+    ),
+    LightControlHubState.IDLE_OFF: frozenset({LightControlHubEvent.WAKE}),
+    LightControlHubState.SUSPENDED: frozenset(),
+}
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,99 +109,556 @@ class LightControlHub:
 
     def __init__(self, config: dict) -> None:
         self.stopping = asyncio.Event()
+        self.state = LightControlHubState.ACTIVE_ON
+        # Serializes events, so each one sees the state left by the previous.
+        self._event_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self.event_bus = EventBus()
+        self._subscribe(
+            config,
+            ACTIVITY_TOPIC,
+            self._handle_activity_update,
+            EventBusOverflowPolicy.DROP_OLDEST,
+        )
+        self._subscribe(
+            config,
+            LIGHT_SENSOR_TOPIC,
+            self._handle_light_sensor_update,
+            EventBusOverflowPolicy.COALESCE,
+        )
+        light_sensor_config = config.get(CONF_LIGHT_SENSOR) or {}
+        self._wake_sensor_deadline: float = light_sensor_config.get(
+            CONF_WAKE_SENSOR_DEADLINE, DEFAULT_WAKE_SENSOR_DEADLINE
+        )
+        # The sensor stays claimed this long into an idle period, so that
+        # short idles cause no sensor I/O.
+        self._release_delay: float = light_sensor_config.get(
+            CONF_RELEASE_DELAY, DEFAULT_RELEASE_DELAY
+        )
+        self._release_timer: asyncio.TimerHandle | None = None
+        self._sensor_claimed = True
+        self._last_reading: LightControlHubLightSensorUpdate | None = None
+
+        self._has_light_reading = False
+        self._outputs_ready = asyncio.Event()
+        self._started_at: float | None = None
+        self.time_to_first_adjustment: float | None = None
+        startup_config = config.get(CONF_STARTUP) or {}
+        self._startup: dict[str, dict] = {
+            stage: {**defaults, **(startup_config.get(stage) or {})}
+            for stage, defaults in DEFAULT_STARTUP.items()
+        }
+        self._last_lux: float | None = None
+        self._status_page: StatusPage | None = None
+        status_page_path = config.get(CONF_STATUS_PAGE, DEFAULT_STATUS_PAGE)
+        if status_page_path is True:
+            status_page_path = default_status_page_path()
+        if status_page_path:
+            self._status_page = StatusPage(os.path.expanduser(status_page_path))
+        # Start tracing before the plugins allocate anything.
+        self._memory_monitor: MemoryMonitor | None = None
+        if config.get(CONF_MEMORY_REPORT_INTERVAL):
+            self._memory_monitor = MemoryMonitor(
+                config[CONF_MEMORY_REPORT_INTERVAL],
+                config.get(CONF_MEMORY_REPORT_TOP, DEFAULT_MEMORY_REPORT_TOP),
+            )
+        self._state_store = StateStore(
+            config.get(CONF_STATE_FILE) or default_state_file(),
+            config.get(CONF_STATE_WRITE_INTERVAL, DEFAULT_STATE_WRITE_INTERVAL),
+        )
+        self._snapshot = self._state_store.load()
+        self._state_max_age: float = config.get(
+            CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE
+        )
 
         self._activity_monitor = self._get_activity_monitor_plugin_from_config(config)
-        self._keyboard_backlight = self._get_keyboard_backlight_plugin_from_config(
-            config
+        self._keyboard_backlight = get_keyboard_backlight_plugin_from_config(
+            self, config
         )
-        self._light_sensor = self._get_light_sensor_plugin_from_config(config)
+        self._light_sensor = get_light_sensor_plugin_from_config(self, config)
+        self._display_backlight = get_display_backlight_plugin_from_config(self, config)
+        self._logind: LogindMonitor | None = None
+        if config.get(CONF_LOGIND, DEFAULT_LOGIND):
+            self._logind = LogindMonitor(self)
+
+    @property
+    def activity_monitor(self) -> ActivityMonitor:
+        return self._activity_monitor
 
     async def start(self) -> None:
-        async with asyncio.TaskGroup() as tg:
-            tg.create_task(self._activity_monitor.start())
-            tg.create_task(self._keyboard_backlight.start())
-            tg.create_task(self._light_sensor.start())
+        self._started_at = time.monotonic()
+        if self._memory_monitor is not None:
+            self.create_task(self._memory_monitor.run())
+        self.event_bus.start()
+        if self._status_page is not None:
+            try:
+                self._status_page.open()
+            except OSError as e:
+                _LOGGER.warning("Failed to create status page: %s", e)
+                self._status_page = None
+            self._update_status()
+
+        await self._start_outputs()
+        self.create_task(self._start_background())
 
         await self.stopping.wait()
 
     def stop(self) -> None:
         self.stopping.set()
+        self._cancel_release()
+        self.event_bus.stop()
+        if self._last_lux is not None:
+            # The last reading still holds, so keep it fresh for a restart.
+            self._state_store.update(lux=self._last_lux)
+        self._state_store.flush()
 
         self._activity_monitor.stop()
         self._keyboard_backlight.stop()
         self._light_sensor.stop()
+        self._display_backlight.stop()
+        for plugin in (
+            self._activity_monitor,
+            self._keyboard_backlight,
+            self._light_sensor,
+            self._display_backlight,
+        ):
+            plugin.call_guard.log_stats()
+        if self._logind is not None:
+            self._logind.stop()
+        if self._status_page is not None:
+            self._status_page.close()
+
+    def create_task(self, coro: Coroutine) -> asyncio.Task:
+        """Run `coro` in a task that is kept alive until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def suspend(self) -> None:
+        """Pause all plugins, e.g. while the system sleeps or the lid is closed."""
+        async with self._event_lock:
+            if self.state == LightControlHubState.SUSPENDED:
+                return
+            _LOGGER.debug("Suspending")
+            self._set_state(LightControlHubState.SUSPENDED)
+            await asyncio.gather(
+                self._activity_monitor.call_guard.try_call(
+                    "pause", self._activity_monitor.pause()
+                ),
+                self._release_light_sensor(),
+            )
+            self._update_status()
+            self._state_store.flush()
+
+    async def resume(self) -> None:
+        """Restart all plugins after suspend().
+
+        The backlight is restored together with a fresh light sensor reading
+        first, then the activity monitor is resumed.
+        """
+        async with self._event_lock:
+            if self.state != LightControlHubState.SUSPENDED:
+                return
+            _LOGGER.debug("Resuming")
+            # Firmware may have reset the backlights while the system slept.
+            self._keyboard_backlight.forget_written()
+            self._display_backlight.forget_written()
+            await self._leave_idle(LightControlHubActivityUpdate(is_idle=False))
+            self._update_status()
+            # Idle before suspend no longer counts; the monitor starts over.
+            self._activity_monitor.reset_idle()
+            await self._activity_monitor.call_guard.try_call(
+                "resume", self._activity_monitor.resume()
+            )
+
+    async def _start_logind(self) -> None:
+        try:
+            await self._logind.start()  # type: ignore[union-attr]
+        except Exception as e:
+            _LOGGER.warning("Failed to connect to logind: %s", e)
 
     async def activity_update(self, update: LightControlHubActivityUpdate) -> None:
-        _LOGGER.debug("Got activity update: %s", update)
-        kb_update = await self._keyboard_backlight.on_idle_event(update)
-        if kb_update.mode == KeyboardBacklightOperatingMode.IDLE_OFF:
-            await self._light_sensor.pause()
-        else:
-            await self._light_sensor.resume()
+        self.event_bus.publish(ACTIVITY_TOPIC, update)
 
     async def light_sensor_update(
         self,
         update: LightControlHubLightSensorUpdate,
     ) -> None:
-        _LOGGER.debug("Got light sensor update: %s", update)
-        await self._keyboard_backlight.on_lighting_event(update)
+        self._has_light_reading = True
+        self.event_bus.publish(LIGHT_SENSOR_TOPIC, update)
 
-    def _get_activity_monitor_plugin_from_config(
+    def keyboard_backlight_changed(self) -> None:
+        """Note that the keyboard backlight level changed outside an event.
+
+        E.g. a hotkey changed it, or a coalesced write was flushed.
+        """
+        self._update_status()
+
+    def _subscribe(
         self,
         config: dict,
-    ) -> ActivityMonitor:
-        """Return ActivityMonitor from config."""
+        topic: Topic,
+        handler: Callable[[Any], Awaitable[None]],
+        default_overflow: EventBusOverflowPolicy,
+    ) -> None:
+        topic_config = (config.get(CONF_EVENT_BUS) or {}).get(topic.name) or {}
         try:
-            plugin = ActivityMonitorBackend(config[CONF_ACTIVITY_MONITOR][CONF_TYPE])
+            overflow = EventBusOverflowPolicy(
+                topic_config.get(CONF_OVERFLOW, default_overflow)
+            )
         except ValueError as e:
-            raise ConfigError(
-                "No valid activity_monitor plugin defined in config."
-            ) from e
+            raise ConfigError(f"Invalid overflow policy for {topic.name}.") from e
+        self.event_bus.subscribe(
+            topic,
+            handler,
+            topic_config.get(CONF_QUEUE_SIZE, DEFAULT_QUEUE_SIZE),
+            overflow,
+        )
 
-        _LOGGER.debug("Using activity_monitor plugin %s", plugin.value)
-        return get_and_verify_activity_plugin(
-            plugin,
-            self,
-            config[CONF_ACTIVITY_MONITOR],
+    async def _handle_activity_update(
+        self, update: LightControlHubActivityUpdate
+    ) -> None:
+        _LOGGER.debug("Got activity update: %s", update)
+        event = (
+            LightControlHubEvent.IDLE if update.is_idle else LightControlHubEvent.WAKE
         )
+        async with self._event_lock:
+            if not self._accepts(event):
+                return
+            if update.is_idle:
+                await self._enter_idle(update)
+            else:
+                await self._leave_idle(update)
+            self._update_status()
 
-    def _get_keyboard_backlight_plugin_from_config(
+    async def _handle_light_sensor_update(
         self,
-        config: dict,
-    ) -> KeyboardBacklight:
-        """Return KeyboardBacklight from config."""
+        update: LightControlHubLightSensorUpdate,
+    ) -> None:
+        _LOGGER.debug("Got light sensor update: %s", update)
+        # Readings keep arriving during the release delay, while idle.
+        self._last_reading = update
+        await self._outputs_ready.wait()
+        async with self._event_lock:
+            if not self._accepts(LightControlHubEvent.LIGHT):
+                return
+            if (
+                self.state == LightControlHubState.ACTIVE_OFF
+                and self._keyboard_backlight.target_for_lux(update.value) == 0
+                and not self._display_backlight.needs_update(update.value)
+            ):
+                _LOGGER.debug("Dropping light sensor update, backlight stays off")
+                return
+            kb_update, _ = await asyncio.gather(
+                self._keyboard_backlight.on_lighting_event(update),
+                self._display_backlight.on_lighting_event(update),
+            )
+            self._set_state(LightControlHubState(kb_update.mode))
+            self._push_light_sensor_band(update)
+            self._first_adjustment()
+            self._update_status()
+            self._state_store.update(lux=update.value, lux_unit=update.unit)
+
+    def _accepts(self, event: LightControlHubEvent) -> bool:
+        if event in ACCEPTED_EVENTS[self.state]:
+            return True
+        _LOGGER.debug("Dropping %s event in state %s", event, self.state)
+        return False
+
+    def _set_state(self, state: LightControlHubState) -> None:
+        if state != self.state:
+            _LOGGER.debug("Hub state: %s -> %s", self.state, state)
+            self.state = state
+
+    async def _enter_idle(self, update: LightControlHubActivityUpdate) -> None:
+        kb_update = await self._keyboard_backlight.on_idle_event(update)
+        self._set_state(LightControlHubState(kb_update.mode))
+        self._state_store.update(stored=self._keyboard_backlight.stored)
+        if kb_update.mode != KeyboardBacklightOperatingMode.IDLE_OFF:
+            return
+        if self._release_delay > 0:
+            self._cancel_release()
+            self._release_timer = asyncio.get_running_loop().call_later(
+                self._release_delay,
+                lambda: self.create_task(self._release_after_delay()),
+            )
+        else:
+            await self._release_light_sensor()
+
+    async def _release_after_delay(self) -> None:
+        async with self._event_lock:
+            self._release_timer = None
+            if self.state == LightControlHubState.IDLE_OFF:
+                await self._release_light_sensor()
+
+    async def _release_light_sensor(self) -> None:
+        self._cancel_release()
+        if not self._sensor_claimed:
+            return
+        _LOGGER.debug("Releasing light sensor")
+        self._sensor_claimed = False
         try:
-            plugin = KeyboardBacklightBackend(
-                config[CONF_KEYBOARD_BACKLIGHT][CONF_TYPE]
+            await self._light_sensor.call_guard.try_call(
+                "pause", self._light_sensor.pause()
             )
-        except ValueError as e:
-            raise ConfigError(
-                "No valid keyboard_backlight plugin defined in config."
-            ) from e
+        except Exception as e:
+            _LOGGER.warning("Failed to release light sensor: %s", e)
 
-        _LOGGER.debug("Using keyboard_backlight plugin %s", plugin.value)
-        return get_and_verify_keyboard_backlight_plugin(
-            plugin,
-            self,
-            config[CONF_KEYBOARD_BACKLIGHT],
+    def _cancel_release(self) -> None:
+        if self._release_timer is not None:
+            self._release_timer.cancel()
+            self._release_timer = None
+
+    async def _leave_idle(self, update: LightControlHubActivityUpdate) -> None:
+        if self._sensor_claimed:
+            # Back within the release delay: the sensor kept reporting, so the
+            # last reading is current.
+            self._cancel_release()
+            update.light_sensor_update = self._last_reading
+        else:
+            await self._claim_light_sensor(update)
+            # The wake reading does not pass through the event bus; keep it
+            # for a return within the next release delay.
+            if update.light_sensor_update is not None:
+                self._last_reading = update.light_sensor_update
+        kb_update = await self._keyboard_backlight.on_idle_event(update)
+        self._set_state(LightControlHubState(kb_update.mode))
+        if update.light_sensor_update is not None:
+            await self._display_backlight.on_lighting_event(update.light_sensor_update)
+            self._push_light_sensor_band(update.light_sensor_update)
+
+    async def _claim_light_sensor(self, update: LightControlHubActivityUpdate) -> None:
+        # Claim the sensor first, so that a fresh reading can be applied with a
+        # single write. Fall back to the stored brightness if it takes too long.
+        _LOGGER.debug("Claiming light sensor")
+        self._sensor_claimed = True
+        resume_task = asyncio.create_task(self._resume_light_sensor())
+        try:
+            async with asyncio.timeout(self._wake_sensor_deadline):
+                update.light_sensor_update = await asyncio.shield(resume_task)
+        except TimeoutError:
+            _LOGGER.debug("Light sensor missed the wake deadline")
+            self._tasks.add(resume_task)
+            resume_task.add_done_callback(self._late_light_sensor_reading)
+
+    async def _resume_light_sensor(self) -> LightControlHubLightSensorUpdate | None:
+        """Claim the light sensor and return its reading, None on failure.
+
+        A sensor that fails must not keep the backlight dark, so any error
+        leaves the wake path with the stored brightness.
+        """
+        try:
+            return await self._light_sensor.call_guard.try_call(
+                "resume", self._light_sensor.resume()
+            )
+        except Exception as e:
+            _LOGGER.error("Failed to resume light sensor: %s", e)
+            self._sensor_claimed = False
+            return None
+
+    def _update_status(self) -> None:
+        if self._status_page is None:
+            return
+        self._status_page.update(
+            lux=self._last_lux,
+            target=self._keyboard_backlight.target,
+            written=self._keyboard_backlight.written,
+            state=self.state,
+            is_idle=self.state == LightControlHubState.IDLE_OFF,
+        )
+
+    def _push_light_sensor_band(self, update: LightControlHubLightSensorUpdate) -> None:
+        """Tell the light sensor which readings would not change the output."""
+        self._last_lux = update.value
+        # Only readings that change neither backlight can be left out.
+        kb_low, kb_high = self._keyboard_backlight.lux_band(update.value)
+        display_low, display_high = self._display_backlight.lux_band(update.value)
+        low, high = max(kb_low, display_low), min(kb_high, display_high)
+        _LOGGER.debug("Light sensor band: [%s, %s)", low, high)
+        self._light_sensor.set_report_band(low, high)
+
+    async def _start_outputs(self) -> None:
+        """Start the backlights and the light sensor, the first stage.
+
+        Light sensor readings are held back until both backlights are ready.
+        A backlight or sensor that does not come up is replaced by a dummy,
+        except for the keyboard backlight.
+        """
+        stage = self._startup[STAGE_OUTPUT]
+        sensor_task = asyncio.create_task(
+            self._start_plugin(
+                "light sensor",
+                self._light_sensor.start,
+                self._light_sensor.stop,
+                stage,
+            )
         )
+        keyboard_started, display_started = await asyncio.gather(
+            self._start_plugin(
+                "keyboard backlight",
+                self._start_keyboard_backlight,
+                self._keyboard_backlight.stop,
+                stage,
+            ),
+            self._start_plugin(
+                "display backlight",
+                self._display_backlight.start,
+                self._display_backlight.stop,
+                stage,
+            ),
+        )
+        if not keyboard_started:
+            sensor_task.cancel()
+            raise RuntimeError("Failed to start the keyboard backlight")
+        if not display_started:
+            self._display_backlight = get_and_verify_display_backlight_plugin(
+                DisplayBacklightBackend.NONE, self, {}
+            )
+        self._outputs_ready.set()
+        if not await sensor_task:
+            _LOGGER.error("Continuing without light sensor")
+            self._light_sensor = get_and_verify_light_sensor_plugin(
+                LightSensorBackend.NONE, self, {}
+            )
+
+    async def _start_background(self) -> None:
+        """Attach the activity monitor, then logind.
 
-    def _get_light_sensor_plugin_from_config(
+        logind may pause the activity monitor, so it only starts once the
+        monitor is up or has given up.
+        """
+        await self._start_activity_monitor()
+        if self._logind is not None:
+            await self._start_logind()
+
+    async def _start_activity_monitor(self) -> None:
+        if not await self._start_plugin(
+            "activity monitor",
+            self._activity_monitor.start,
+            self._activity_monitor.stop,
+            self._startup[STAGE_ACTIVITY_MONITOR],
+        ):
+            _LOGGER.error("Continuing without activity monitor")
+
+    async def _start_plugin(
+        self,
+        name: str,
+        start: Callable[[], Awaitable[None]],
+        stop: Callable[[], None],
+        stage: dict,
+    ) -> bool:
+        """Start a plugin within the stage deadline, retrying on failure.
+
+        `stop` tears down whatever a failed attempt set up, e.g. a bus
+        connection, before the next attempt and after the last one.
+        """
+        attempts = stage[CONF_RETRIES] + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                async with asyncio.timeout(stage[CONF_DEADLINE]):
+                    await start()
+            except Exception as e:
+                _LOGGER.warning(
+                    "Failed to start %s (attempt %d of %d): %s",
+                    name,
+                    attempt,
+                    attempts,
+                    str(e) or "timed out",
+                )
+                try:
+                    stop()
+                except Exception as e:
+                    _LOGGER.debug("Failed to clean up %s: %s", name, e)
+                if attempt < attempts:
+                    await asyncio.sleep(stage[CONF_RETRY_DELAY])
+                continue
+            _LOGGER.debug("Started %s after %.0f ms", name, self._since_start())
+            return True
+        return False
+
+    def _first_adjustment(self) -> None:
+        """Report the time from start to the first brightness written."""
+        if self.time_to_first_adjustment is not None or (
+            self._keyboard_backlight.written is None
+            and self._display_backlight.written is None
+        ):
+            return
+        self.time_to_first_adjustment = self._since_start()
+        _LOGGER.info(
+            "First brightness adjustment %.0f ms after start",
+            self.time_to_first_adjustment,
+        )
+
+    def _since_start(self) -> float:
+        """Return the milliseconds since start()."""
+        if self._started_at is None:
+            return 0.0
+        return (time.monotonic() - self._started_at) * 1000
+
+    async def _start_keyboard_backlight(self) -> None:
+        """Start the keyboard backlight and apply the warm-start snapshot."""
+        await self._keyboard_backlight.start()
+        if self._snapshot is None:
+            return
+        if self._snapshot.stored:
+            self._keyboard_backlight.stored = self._snapshot.stored
+        if self._snapshot.lux is None:
+            return
+        if self._snapshot.age() > self._state_max_age:
+            _LOGGER.debug(
+                "Last known light level is %.0f s old, waiting for the sensor",
+                self._snapshot.age(),
+            )
+            return
+        # A reading that is already queued is newer than the snapshot.
+        async with self._event_lock:
+            if self._has_light_reading or not self._accepts(LightControlHubEvent.LIGHT):
+                return
+            _LOGGER.debug("Applying last known light level %d", self._snapshot.lux)
+            kb_update = await self._keyboard_backlight.on_lighting_event(
+                LightControlHubLightSensorUpdate(
+                    unit=self._snapshot.lux_unit,
+                    value=self._snapshot.lux,
+                )
+            )
+            self._last_lux = self._snapshot.lux
+            self._set_state(LightControlHubState(kb_update.mode))
+            self._first_adjustment()
+            self._update_status()
+
+    def _late_light_sensor_reading(self, task: asyncio.Task) -> None:
+        """Forward a wake reading that arrived after the deadline."""
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        if (update := task.result()) is not None:
+            self._has_light_reading = True
+            self._last_reading = update
+            self.event_bus.publish(LIGHT_SENSOR_TOPIC, update)
+
+    def _get_activity_monitor_plugin_from_config(
         self,
         config: dict,
-    ) -> LightSensor:
-        """Return LightSensor from config."""
-        if config.get(CONF_LIGHT_SENSOR) is None:
-            _LOGGER.info("No light sensor defined in config, falling back to none.")
-            return get_and_verify_light_sensor_plugin(LightSensorBackend.NONE, self, {})
+    ) -> ActivityMonitor:
+        """Return ActivityMonitor from config."""
         try:
-            plugin = LightSensorBackend(config[CONF_LIGHT_SENSOR][CONF_TYPE])
+            plugin = ActivityMonitorBackend(config[CONF_ACTIVITY_MONITOR][CONF_TYPE])
         except ValueError as e:
-            raise ConfigError("No valid light_sensor plugin defined in config.") from e
+            raise ConfigError(
+                "No valid activity_monitor plugin defined in config."
+            ) from e
 
-        _LOGGER.debug("Using light_sensor plugin %s", plugin.value)
-        return get_and_verify_light_sensor_plugin(
+        _LOGGER.debug("Using activity_monitor plugin %s", plugin.value)
+        if config[CONF_ACTIVITY_MONITOR].get(CONF_PROCESS):
+            return ProcessActivityMonitor(
+                self,
+                config[CONF_ACTIVITY_MONITOR],
+                plugin,
+                config.get(CONF_LOG_LEVEL),
+            )
+        return get_and_verify_activity_plugin(
             plugin,
             self,
-            config[CONF_LIGHT_SENSOR],
+            config[CONF_ACTIVITY_MONITOR],
         )
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod, abstractproperty
+import asyncio
 from importlib import import_module
 import logging
+import math
 from typing import TYPE_CHECKING
 
+from .call_guard import CONF_CALLS, BackendCallError, CallGuard
 from .types import (
+    CONF_TYPE,
+    ConfigError,
     KeyboardBacklightBackend,
+    KeyboardBacklightCapabilities,
     KeyboardBacklightOperatingMode,
     LightControlHubActivityUpdate,
     LightControlHubKeyboardBacklightUpdate,
@@ -16,6 +22,7 @@ from .types import (
 if TYPE_CHECKING:
     from .hub import LightControlHub
 
+CONF_KEYBOARD_BACKLIGHT = "keyboard_backlight"
 CONF_KEYBOARD_MIN_BRIGHTNESS = "keyboard_min_brightness"
 CONF_LUX_FOR_KEYBOARD_OFF = "lux_for_keyboard_off"
 CONF_LUX_FOR_MAX_BRIGHTNESS = "lux_for_max_brightness"
@@ -24,22 +31,65 @@ DEFAULT_KEYBOARD_MIN_BRIGHTNESS = 10
 DEFAULT_LUX_FOR_KEYBOARD_OFF = 400
 DEFAULT_LUX_FOR_MAX_BRIGHTNESS = 300
 DEFAULT_LUX_FOR_MIN_BRIGHTNESS = 10
+# Band edges are at most this many floating point steps off.
+_MAX_EDGE_ULPS = 64
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class KeyboardBacklight(ABC):
     stored: int = 0
+    target: int | None = None
+    _call_guard: CallGuard | None = None
     _config: dict
+    _flush_task: asyncio.Task | None = None
+    _hub: LightControlHub | None = None
+    _last_write: float = -math.inf
+    _pending: int | None = None
+    _written: int | None = None
 
     @abstractmethod
     def __init__(self, hub: LightControlHub, config: dict) -> None:
         raise NotImplementedError
 
+    @property
+    def call_guard(self) -> CallGuard:
+        """Deadlines and circuit breaker for calls into the backend."""
+        if self._call_guard is None:
+            self._call_guard = CallGuard(type(self).__name__, {})
+        return self._call_guard
+
+    @property
+    def capabilities(self) -> KeyboardBacklightCapabilities:
+        return KeyboardBacklightCapabilities()
+
     @property
     def config(self) -> dict:
         return self._config
 
+    @property
+    def written(self) -> int | None:
+        """Return the last brightness written to or reported by the device."""
+        return self._written
+
+    def device_changed(self, value: int) -> None:
+        """Note a brightness reported by the device.
+
+        Backends that follow changes made elsewhere, e.g. by the firmware on a
+        hotkey, call this so that writes are skipped only if the device is
+        actually at the requested level.
+        """
+        self._written = self.quantize(value)
+        if self._hub is not None:
+            self._hub.keyboard_backlight_changed()
+
+    def forget_written(self) -> None:
+        """Write the next value even if it was the last one written.
+
+        Used when the device may have changed without notice, e.g. in suspend.
+        """
+        self._written = None
+
     @abstractmethod
     async def get_current(self) -> int:
         raise NotImplementedError
@@ -53,13 +103,16 @@ class KeyboardBacklight(ABC):
     ) -> LightControlHubKeyboardBacklightUpdate:
         if update.is_idle:
             await self.update_stored()
-            await self.set_absolute(0)
+            await self.write(0)
             return LightControlHubKeyboardBacklightUpdate(
                 mode=KeyboardBacklightOperatingMode.IDLE_OFF
             )
         else:
-            if await self.get_current() == 0:
-                await self.set_absolute(self.stored)
+            if update.light_sensor_update is not None:
+                # A fresh reading is available, go straight to its target.
+                return await self.on_lighting_event(update.light_sensor_update)
+            if await self.read_current() in (0, None):
+                await self.write(self.stored)
             return LightControlHubKeyboardBacklightUpdate(
                 mode=KeyboardBacklightOperatingMode.ACTIVE_ON
             )
@@ -67,36 +120,108 @@ class KeyboardBacklight(ABC):
     async def on_lighting_event(
         self, update: LightControlHubLightSensorUpdate
     ) -> LightControlHubKeyboardBacklightUpdate:
+        target_brightness = self.target_for_lux(update.value)
+        _LOGGER.debug("Target keyboard brightness: %d", target_brightness)
+        self.target = target_brightness
+
+        await self.write(target_brightness)
         if update.value >= self.config[CONF_LUX_FOR_KEYBOARD_OFF]:
-            await self.set_absolute(0)
             return LightControlHubKeyboardBacklightUpdate(
                 mode=KeyboardBacklightOperatingMode.ACTIVE_OFF
             )
+        return LightControlHubKeyboardBacklightUpdate(
+            mode=KeyboardBacklightOperatingMode.ACTIVE_ON
+        )
 
-        if update.value <= self.config[CONF_LUX_FOR_MIN_BRIGHTNESS]:
-            target_brightness = self.config[CONF_KEYBOARD_MIN_BRIGHTNESS]
-        elif update.value >= self.config[CONF_LUX_FOR_MAX_BRIGHTNESS]:
-            target_brightness = self.maximum
-        else:
-            target_brightness = int(
-                self.config[CONF_KEYBOARD_MIN_BRIGHTNESS]
-                + (
-                    (update.value - self.config[CONF_LUX_FOR_MIN_BRIGHTNESS])
-                    / (
-                        self.config[CONF_LUX_FOR_MAX_BRIGHTNESS]
-                        - self.config[CONF_LUX_FOR_MIN_BRIGHTNESS]
-                    )
+    def lux_band(self, value: float) -> tuple[float, float]:
+        """Return the lux interval [low, high) around `value` with the same target."""
+        lux_off = self.config[CONF_LUX_FOR_KEYBOARD_OFF]
+        lux_max = self.config[CONF_LUX_FOR_MAX_BRIGHTNESS]
+        lux_min = self.config[CONF_LUX_FOR_MIN_BRIGHTNESS]
+        if value >= lux_off:
+            return lux_off, math.inf
+        if value >= lux_max:
+            return self._band_edge(lux_max, self.maximum), lux_off
+
+        span = self.maximum - self.config[CONF_KEYBOARD_MIN_BRIGHTNESS]
+        if span <= 0:
+            if value <= lux_min:
+                return -math.inf, math.nextafter(lux_min, math.inf)
+            return value, math.nextafter(value, math.inf)
+
+        step = (lux_max - lux_min) / span
+        target = self.target_for_lux(value)
+        index = target - self.config[CONF_KEYBOARD_MIN_BRIGHTNESS]
+        low = -math.inf if index == 0 else lux_min + index * step
+        high = min(lux_min + (index + 1) * step, lux_max, lux_off)
+        # The edges are computed in closed form, which can be a few ulps off
+        # the rounding in target_for_lux(). Move them onto the exact edge, so
+        # that no reading inside the band has a different target.
+        if low > -math.inf:
+            low = self._band_edge(low, target)
+        return low, self._band_edge(high, target, inside=False)
+
+    def _band_edge(self, edge: float, target: int, inside: bool = True) -> float:
+        """Move `edge` to the first reading at or above it that has `target`.
+
+        With inside=False, move it to the first reading after the band instead.
+        """
+
+        def at_edge(x: float) -> bool:
+            before = math.nextafter(x, -math.inf)
+            if inside:
+                return (
+                    self.target_for_lux(x) == target
+                    and self.target_for_lux(before) != target
                 )
-                * (self.maximum - self.config[CONF_KEYBOARD_MIN_BRIGHTNESS])
+            return (
+                self.target_for_lux(x) != target
+                and self.target_for_lux(before) == target
             )
 
-        _LOGGER.debug("Target keyboard brightness: %d", target_brightness)
+        for _ in range(_MAX_EDGE_ULPS):
+            if at_edge(edge):
+                return edge
+            in_band = self.target_for_lux(edge) == target
+            # Inside edges move down while still in the band, outside edges
+            # move down while already past it.
+            if in_band == inside:
+                edge = math.nextafter(edge, -math.inf)
+            else:
+                edge = math.nextafter(edge, math.inf)
+        return edge
 
-        await self.set_absolute(target_brightness)
-        return LightControlHubKeyboardBacklightUpdate(
-            mode=KeyboardBacklightOperatingMode.ACTIVE_ON
+    def target_for_lux(self, value: float) -> int:
+        """Return the target brightness for a light level."""
+        if value >= self.config[CONF_LUX_FOR_KEYBOARD_OFF]:
+            return 0
+        if value <= self.config[CONF_LUX_FOR_MIN_BRIGHTNESS]:
+            return self.config[CONF_KEYBOARD_MIN_BRIGHTNESS]
+        if value >= self.config[CONF_LUX_FOR_MAX_BRIGHTNESS]:
+            return self.maximum
+        return int(
+            self.config[CONF_KEYBOARD_MIN_BRIGHTNESS]
+            + (
+                (value - self.config[CONF_LUX_FOR_MIN_BRIGHTNESS])
+                / (
+                    self.config[CONF_LUX_FOR_MAX_BRIGHTNESS]
+                    - self.config[CONF_LUX_FOR_MIN_BRIGHTNESS]
+                )
+            )
+            * (self.maximum - self.config[CONF_KEYBOARD_MIN_BRIGHTNESS])
         )
 
+    def quantize(self, value: int) -> int:
+        """Return the device level closest to `value`.
+
+        A non-zero value never rounds down to off.
+        """
+        levels = self.capabilities.levels
+        if value <= 0 or levels is None or levels < 2:
+            return value
+        step = self.maximum / (levels - 1)
+        return min(self.maximum, round(max(1, round(value / step)) * step))
+
     @abstractmethod
     async def set_absolute(self, value: int) -> None:
         raise NotImplementedError
@@ -106,14 +231,97 @@ class KeyboardBacklight(ABC):
         raise NotImplementedError
 
     def stop(self) -> None:
-        return
+        """Drop a coalesced write that has not been flushed yet."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+
+    async def write(self, value: int) -> None:
+        """Write `value` quantized to a device level, within the write rate limit.
+
+        Nothing is written if the device is known to be at the quantized value
+        already. A write that comes too soon after the last one is coalesced:
+        it returns right away and a background task writes the latest value
+        once the interval has passed, so callers never wait for the limit.
+        """
+        value = self.quantize(value)
+        if self._flush_task is not None:
+            self._pending = value
+            return
+        if value == self._written:
+            return
+        loop = asyncio.get_running_loop()
+        remaining = self._last_write + self._write_interval() - loop.time()
+        if remaining > 0:
+            self._pending = value
+            self._flush_task = loop.create_task(self._flush(remaining))
+            return
+        await self._write_now(value)
+
+    async def _flush(self, delay: float) -> None:
+        """Write the latest coalesced value after `delay` seconds."""
+        try:
+            while True:
+                await asyncio.sleep(delay)
+                value = self._pending
+                if value is None or value == self._written:
+                    return
+                await self._write_now(value)
+                if self._pending == value:
+                    return
+                # A newer value arrived during the write.
+                delay = self._write_interval()
+        finally:
+            self._flush_task = None
+            self._pending = None
+
+    def _write_interval(self) -> float:
+        capabilities = self.capabilities
+        return max(capabilities.min_write_interval, capabilities.write_cost)
+
+    async def _write_now(self, value: int) -> None:
+        try:
+            await self.call_guard.call("set_absolute", self.set_absolute(value))
+        except BackendCallError as e:
+            _LOGGER.debug("Keyboard brightness not written: %s", e)
+            return
+        self._written = value
+        self._last_write = asyncio.get_running_loop().time()
+        # The hub reports its own writes; a flush happens behind its back.
+        if self._hub is not None and self._flush_task is not None:
+            self._hub.keyboard_backlight_changed()
+
+    async def read_current(self) -> int | None:
+        """Return the current brightness, or None if the backend did not answer."""
+        return await self.call_guard.try_call("get_current", self.get_current())
 
     async def update_stored(self) -> int:
-        self.stored = await self.get_current()
+        current = await self.read_current()
+        if current is not None:
+            self.stored = current
         _LOGGER.debug("Stored brightness: %d", self.stored)
         return self.stored
 
 
+def get_keyboard_backlight_plugin_from_config(
+    hub: LightControlHub,
+    config: dict,
+) -> KeyboardBacklight:
+    """Return KeyboardBacklight from config."""
+    try:
+        plugin = KeyboardBacklightBackend(config[CONF_KEYBOARD_BACKLIGHT][CONF_TYPE])
+    except ValueError as e:
+        raise ConfigError(
+            "No valid keyboard_backlight plugin defined in config."
+        ) from e
+
+    _LOGGER.debug("Using keyboard_backlight plugin %s", plugin.value)
+    return get_and_verify_keyboard_backlight_plugin(
+        plugin,
+        hub,
+        config[CONF_KEYBOARD_BACKLIGHT],
+    )
+
+
 def get_and_verify_keyboard_backlight_plugin(
     backend: KeyboardBacklightBackend,
     hub: LightControlHub,
@@ -140,6 +348,7 @@ def get_and_verify_keyboard_backlight_plugin(
             " KeyboardBacklight",
         )
 
+    instance._call_guard = CallGuard(backend.value, config.get(CONF_CALLS) or {})
     return instance
 
 
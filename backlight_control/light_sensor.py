@@ -3,21 +3,53 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from importlib import import_module
 import logging
+import math
 from typing import TYPE_CHECKING
 
-from .types import LightSensorBackend
+from .call_guard import CONF_CALLS, CallGuard
+from .types import (
+    CONF_TYPE,
+    ConfigError,
+    LightControlHubLightSensorUpdate,
+    LightSensorBackend,
+)
 
 if TYPE_CHECKING:
     from .hub import LightControlHub
 
+CONF_LIGHT_SENSOR = "light_sensor"
+
 _LOGGER = logging.getLogger(__name__)
 
 
 class LightSensor(ABC):
+    _call_guard: CallGuard | None = None
+    # Readings in [low, high) do not change the output and need not be reported.
+    _report_band: tuple[float, float] = (math.inf, -math.inf)
+
     @abstractmethod
     def __init__(self, hub: LightControlHub, config: dict) -> None:
         raise NotImplementedError
 
+    @property
+    def call_guard(self) -> CallGuard:
+        """Deadlines and circuit breaker for calls into the backend."""
+        if self._call_guard is None:
+            self._call_guard = CallGuard(type(self).__name__, {})
+        return self._call_guard
+
+    def in_report_band(self, value: float) -> bool:
+        low, high = self._report_band
+        return low <= value < high
+
+    def set_report_band(self, low: float, high: float) -> None:
+        """Only report readings outside [low, high) from now on.
+
+        Sensors that poll or wait for hardware events can use the band to back
+        off. Readings returned from resume() are never filtered.
+        """
+        self._report_band = (low, high)
+
     @abstractmethod
     async def start(self) -> None:
         raise NotImplementedError
@@ -27,7 +59,11 @@ class LightSensor(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def resume(self) -> None:
+    async def resume(self) -> LightControlHubLightSensorUpdate | None:
+        """Claim the sensor and return a fresh reading, if one is available.
+
+        The reading is returned to the caller instead of being sent to the hub.
+        """
         raise NotImplementedError
 
     def stop(self) -> None:
@@ -44,8 +80,29 @@ class _DummyLightSensor(LightSensor):
     async def pause(self) -> None:
         pass
 
-    async def resume(self) -> None:
-        pass
+    async def resume(self) -> LightControlHubLightSensorUpdate | None:
+        return None
+
+
+def get_light_sensor_plugin_from_config(
+    hub: LightControlHub,
+    config: dict,
+) -> LightSensor:
+    """Return LightSensor from config."""
+    if config.get(CONF_LIGHT_SENSOR) is None:
+        _LOGGER.info("No light sensor defined in config, falling back to none.")
+        return get_and_verify_light_sensor_plugin(LightSensorBackend.NONE, hub, {})
+    try:
+        plugin = LightSensorBackend(config[CONF_LIGHT_SENSOR][CONF_TYPE])
+    except ValueError as e:
+        raise ConfigError("No valid light_sensor plugin defined in config.") from e
+
+    _LOGGER.debug("Using light_sensor plugin %s", plugin.value)
+    return get_and_verify_light_sensor_plugin(
+        plugin,
+        hub,
+        config[CONF_LIGHT_SENSOR],
+    )
 
 
 def get_and_verify_light_sensor_plugin(
@@ -78,4 +135,5 @@ def get_and_verify_light_sensor_plugin(
         )
         return _DummyLightSensor(hub, {})
 
+    instance._call_guard = CallGuard(backend.value, config.get(CONF_CALLS) or {})
     return instance
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+import threading
+import time
+
+CONF_LOG_LEVEL = "log_level"
+CONF_LOG_RATE_BURST = "log_rate_burst"
+CONF_LOG_RATE_LIMIT = "log_rate_limit"
+DEFAULT_LOG_RATE_BURST = 20
+DEFAULT_LOG_RATE_LIMIT = 2.0
+
+
+class RateLimitFilter(logging.Filter):
+    """Rate limit repeated messages below WARNING.
+
+    Every logger and message template gets a token bucket of `burst` messages,
+    refilled at `rate` messages per second. The next message that gets through
+    reports how many were suppressed in between. Filters run in whichever
+    thread logs, so the buckets are guarded by a lock.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        super().__init__()
+        self._rate = rate
+        self._burst = burst
+        self._lock = threading.Lock()
+        self._buckets: dict[tuple[str, object], tuple[float, float]] = {}
+        self._suppressed: dict[tuple[str, object], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self._rate <= 0:
+            return True
+        key = (record.name, record.msg)
+        try:
+            hash(key)
+        except TypeError:
+            # Not a template, e.g. a logged dict.
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self._burst, now))
+            tokens = min(self._burst, tokens + (now - last) * self._rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed and isinstance(record.args, tuple):
+            msg = str(record.msg)
+            if not record.args:
+                # The message was not %-formatted so far; keep it literal.
+                msg = msg.replace("%", "%%")
+            record.msg = f"{msg} (%d similar messages suppressed)"
+            record.args = (*record.args, suppressed)
+        return True
+
+
+def setup_logging(config: dict) -> QueueListener:
+    """Route all logging through a queue to a background thread.
+
+    Returns the started listener, which must be stopped on exit to flush
+    pending records.
+    """
+    logging.basicConfig(
+        level=getattr(logging, config.get(CONF_LOG_LEVEL, ""), logging.INFO)
+    )
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    queue: SimpleQueue = SimpleQueue()
+    queue_handler = QueueHandler(queue)
+    queue_handler.addFilter(
+        RateLimitFilter(
+            config.get(CONF_LOG_RATE_LIMIT, DEFAULT_LOG_RATE_LIMIT),
+            config.get(CONF_LOG_RATE_BURST, DEFAULT_LOG_RATE_BURST),
+        )
+    )
+    root.addHandler(queue_handler)
+
+    listener = QueueListener(queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from dbus_fast import BusType
+from dbus_fast.aio import MessageBus
+from dbus_fast.introspection import Node
+
+from .dbus_signals import watch_properties_changed
+
+if TYPE_CHECKING:
+    from dbus_fast.aio.proxy_object import ProxyInterface
+
+    from .hub import LightControlHub
+
+CONF_LOGIND = "logind"
+DEFAULT_LOGIND = True
+
+_LOGGER = logging.getLogger(__name__)
+
+_MODULE_DIR = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+
+class LogindMonitor:
+    """Suspend the hub while the system sleeps or the lid is closed."""
+
+    def __init__(self, hub: LightControlHub) -> None:
+        self._hub: LightControlHub = hub
+        self._bus: MessageBus | None = None
+        self._manager: ProxyInterface | None = None
+        self._inhibitor: int | None = None
+        self._lid_closed = False
+        self._sleeping = False
+        self._update_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        self._bus = await MessageBus(
+            bus_type=BusType.SYSTEM, negotiate_unix_fd=True
+        ).connect()
+
+        with open(
+            os.path.join(_MODULE_DIR, "logind_org.freedesktop.login1.Manager.xml"),
+        ) as f:
+            node_introspection = f.read()
+
+        login1_proxy = self._bus.get_proxy_object(
+            "org.freedesktop.login1",
+            "/org/freedesktop/login1",
+            Node.parse(node_introspection),
+        )
+        self._manager = login1_proxy.get_interface("org.freedesktop.login1.Manager")
+        self._manager.on_prepare_for_sleep(self._prepare_for_sleep)  # type: ignore[attr-defined]
+        await watch_properties_changed(
+            self._bus,
+            "org.freedesktop.login1",
+            "/org/freedesktop/login1",
+            "org.freedesktop.login1.Manager",
+            self._properties_changed,
+        )
+
+        await self._inhibit()
+        self._lid_closed = bool(await self._manager.get_lid_closed())  # type: ignore[attr-defined]
+        await self._update()
+
+    def stop(self) -> None:
+        self._release_inhibitor()
+        if self._bus is not None:
+            self._bus.disconnect()
+
+    async def _inhibit(self) -> None:
+        """Delay sleep until the hub has been suspended."""
+        if self._manager is None or self._inhibitor is not None:
+            return
+        self._inhibitor = await self._manager.call_inhibit(  # type: ignore[attr-defined]
+            "sleep",
+            "backlight_control",
+            "Release the light sensor before sleeping",
+            "delay",
+        )
+
+    def _release_inhibitor(self) -> None:
+        if self._inhibitor is not None:
+            os.close(self._inhibitor)
+            self._inhibitor = None
+
+    def _prepare_for_sleep(self, start: bool) -> None:
+        _LOGGER.debug("Prepare for sleep: %s", start)
+        self._sleeping = start
+        self._hub.create_task(self._update())
+
+    def _properties_changed(
+        self,
+        changed_properties: dict,
+        invalidated_properties: list,
+    ) -> None:
+        if "LidClosed" not in changed_properties:
+            return
+        self._lid_closed = bool(changed_properties["LidClosed"].value)
+        _LOGGER.debug("Lid closed: %s", self._lid_closed)
+        self._hub.create_task(self._update())
+
+    async def _update(self) -> None:
+        """Bring the hub and the inhibitor in line with the latest state.
+
+        Signals can arrive while an earlier update is still suspending or
+        resuming the hub. Updates run one at a time, and each acts on the state
+        at the time it runs, so the last one always wins.
+        """
+        async with self._update_lock:
+            if self._sleeping or self._lid_closed:
+                await self._hub.suspend()
+            else:
+                await self._hub.resume()
+
+            if self._sleeping:
+                self._release_inhibitor()
+            else:
+                await self._inhibit()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+import logging
+import os
+import tracemalloc
+
+CONF_MEMORY_REPORT_INTERVAL = "memory_report_interval"
+CONF_MEMORY_REPORT_TOP = "memory_report_top"
+DEFAULT_MEMORY_REPORT_TOP = 5
+TRACEMALLOC_FRAMES = 25
+
+_LOGGER = logging.getLogger(__name__)
+_PACKAGE_DIR = os.path.dirname(os.path.realpath(__file__))
+_SUBSYSTEMS = (
+    "activity_monitor",
+    "display_backlight",
+    "keyboard_backlight",
+    "light_sensor",
+)
+
+
+def current_rss() -> int:
+    """Return the resident set size of this process in bytes."""
+    with open("/proc/self/statm", encoding="ascii") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def subsystem_for(traceback: tracemalloc.Traceback) -> str:
+    """Attribute an allocation to the most recent backlight_control frame."""
+    for frame in reversed(traceback):
+        path = os.path.realpath(frame.filename)
+        if not path.startswith(_PACKAGE_DIR):
+            continue
+        relative = os.path.relpath(path, _PACKAGE_DIR)
+        for subsystem in _SUBSYSTEMS:
+            if subsystem in relative:
+                return subsystem
+        return os.path.splitext(relative)[0].replace(os.sep, ".")
+    return "other"
+
+
+class MemoryMonitor:
+    """Periodically log RSS and the top allocators per subsystem."""
+
+    def __init__(self, interval: float, top: int) -> None:
+        self._interval = interval
+        self._top = top
+        self._previous: dict[str, int] = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            self.report()
+
+    def report(self) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        per_subsystem: dict[str, int] = defaultdict(int)
+        top: dict[str, list[tracemalloc.Statistic]] = defaultdict(list)
+        for stat in snapshot.statistics("traceback"):
+            subsystem = subsystem_for(stat.traceback)
+            per_subsystem[subsystem] += stat.size
+            if len(top[subsystem]) < self._top:
+                top[subsystem].append(stat)
+
+        current, peak = tracemalloc.get_traced_memory()
+        _LOGGER.info(
+            "RSS: %d kB, traced: %d kB (peak %d kB)",
+            current_rss() // 1024,
+            current // 1024,
+            peak // 1024,
+        )
+        for subsystem, size in sorted(per_subsystem.items(), key=lambda i: -i[1]):
+            _LOGGER.info(
+                "  %s: %d kB (%+d kB)",
+                subsystem,
+                size // 1024,
+                (size - self._previous.get(subsystem, size)) // 1024,
+            )
+            for stat in top[subsystem]:
+                frame = stat.traceback[-1]
+                _LOGGER.info(
+                    "    %s:%d: %d B in %d blocks",
+                    frame.filename,
+                    frame.lineno,
+                    stat.size,
+                    stat.count,
+                )
+        self._previous = dict(per_subsystem)
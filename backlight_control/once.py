@@ -0,0 +1,169 @@
+"""Apply the backlights for the current light level once, then exit.
+
+Only the light sensor and backlight plugins are loaded. The activity
+monitor, logind, event bus and status page are never imported, which keeps
+start-up short when run from udev rules, resume hooks or login scripts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+
+from .display_backlight import get_display_backlight_plugin_from_config
+from .keyboard_backlight import get_keyboard_backlight_plugin_from_config
+from .light_sensor import get_light_sensor_plugin_from_config
+from .state import (
+    CONF_STATE_FILE,
+    CONF_STATE_MAX_AGE,
+    DEFAULT_STATE_MAX_AGE,
+    StateStore,
+    default_state_file,
+)
+from .types import LightControlHubLightSensorUpdate
+
+CONF_ONCE_DEADLINE = "once_deadline"
+DEFAULT_ONCE_DEADLINE = 2.0
+# Target for the run time spent outside of waiting for the light sensor.
+ONCE_TIME_TARGET = 0.1
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class OneShotHub:
+    """Minimal hub that waits for a single light sensor reading."""
+
+    def __init__(self, config: dict) -> None:
+        self._reading: asyncio.Future[LightControlHubLightSensorUpdate] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._keyboard_backlight = get_keyboard_backlight_plugin_from_config(
+            self, config
+        )
+        self._light_sensor = get_light_sensor_plugin_from_config(self, config)
+        self._display_backlight = get_display_backlight_plugin_from_config(self, config)
+        # Seconds spent starting the light sensor and waiting for a reading.
+        self.sensor_wait = 0.0
+
+    async def light_sensor_update(
+        self, update: LightControlHubLightSensorUpdate
+    ) -> None:
+        if not self._reading.done():
+            self._reading.set_result(update)
+
+    async def apply(
+        self, deadline: float, fallback: LightControlHubLightSensorUpdate | None
+    ) -> bool:
+        """Write the backlight once. Returns False if nothing was written.
+
+        The outputs are started first, outside of `deadline`, which only
+        bounds the light sensor start and its first reading.
+        """
+        if not await self._start_outputs():
+            return False
+
+        reading = await self._read_sensor(deadline)
+        if reading is None:
+            if fallback is None:
+                return False
+            _LOGGER.warning(
+                "Using last known light level %d %s", fallback.value, fallback.unit
+            )
+            reading = fallback
+
+        results = await asyncio.gather(
+            self._keyboard_backlight.on_lighting_event(reading),
+            self._display_backlight.on_lighting_event(reading),
+            return_exceptions=True,
+        )
+        failed = False
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Failed to write backlight: %s", result)
+                failed = True
+        return not failed
+
+    async def _start_outputs(self) -> bool:
+        results = await asyncio.gather(
+            self._keyboard_backlight.start(),
+            self._display_backlight.start(),
+            return_exceptions=True,
+        )
+        started = True
+        for name, result in zip(("keyboard", "display"), results, strict=True):
+            if isinstance(result, Exception):
+                _LOGGER.error("Failed to start %s backlight: %s", name, result)
+                started = False
+        return started
+
+    async def _read_sensor(
+        self, deadline: float
+    ) -> LightControlHubLightSensorUpdate | None:
+        sensor_started = False
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(deadline):
+                await self._light_sensor.start()
+                sensor_started = True
+                return await self._reading
+        except TimeoutError:
+            _LOGGER.error("No light sensor reading within %.1f s", deadline)
+        except Exception as e:
+            _LOGGER.error("Failed to read light sensor: %s", e)
+        finally:
+            if sensor_started:
+                try:
+                    await self._light_sensor.call_guard.try_call(
+                        "pause", self._light_sensor.pause()
+                    )
+                except Exception as e:
+                    _LOGGER.debug("Failed to pause light sensor: %s", e)
+            self.sensor_wait = time.monotonic() - started
+        return None
+
+    def stop(self) -> None:
+        self._keyboard_backlight.stop()
+        self._light_sensor.stop()
+        self._display_backlight.stop()
+
+
+async def apply_once(config: dict) -> int:
+    """Apply the backlight once and return the exit code."""
+    started = time.monotonic()
+
+    snapshot = StateStore(
+        os.path.expanduser(config.get(CONF_STATE_FILE) or default_state_file()), 0
+    ).load()
+    fallback = None
+    if (
+        snapshot is not None
+        and snapshot.lux is not None
+        and snapshot.age() <= config.get(CONF_STATE_MAX_AGE, DEFAULT_STATE_MAX_AGE)
+    ):
+        fallback = LightControlHubLightSensorUpdate(
+            unit=snapshot.lux_unit, value=snapshot.lux
+        )
+
+    hub = OneShotHub(config)
+    try:
+        applied = await hub.apply(
+            config.get(CONF_ONCE_DEADLINE, DEFAULT_ONCE_DEADLINE), fallback
+        )
+    finally:
+        hub.stop()
+
+    if not applied:
+        return 1
+    elapsed = time.monotonic() - started
+    overhead = elapsed - hub.sensor_wait
+    _LOGGER.log(
+        logging.WARNING if overhead > ONCE_TIME_TARGET else logging.INFO,
+        "Applied backlights once in %.1f ms, %.1f ms of it waiting for the sensor"
+        " (target for the rest: %.0f ms)",
+        elapsed * 1000,
+        hub.sensor_wait * 1000,
+        ONCE_TIME_TARGET * 1000,
+    )
+    return 0
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from ...activity_monitor import CONF_IDLE_DELAY, ActivityMonitor
+
+if TYPE_CHECKING:
+    from ...hub import LightControlHub
+
+CONF_INPUT_DIR = "input_dir"
+CONF_RESCAN_INTERVAL = "rescan_interval"
+DEFAULT_INPUT_DIR = "/dev/input"
+DEFAULT_RESCAN_INTERVAL = 5
+SYSFS_INPUT = "/sys/class/input"
+# Event types from linux/input-event-codes.h that indicate a keyboard, button
+# or pointer, as opposed to e.g. an accelerometer or a lid switch.
+EV_KEY = 0x01
+EV_REL = 0x02
+# Read many struct input_event at once; any batch just means activity.
+READ_SIZE = 4096
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_plugin(hub: LightControlHub, config: dict):
+    config[CONF_INPUT_DIR] = config.get(CONF_INPUT_DIR, DEFAULT_INPUT_DIR)
+    config[CONF_RESCAN_INTERVAL] = config.get(
+        CONF_RESCAN_INTERVAL, DEFAULT_RESCAN_INTERVAL
+    )
+    return EvdevActivityMonitor(hub, config)
+
+
+class EvdevActivityMonitor(ActivityMonitor):
+    """Watch the input devices directly, without a display server.
+
+    Device fds are registered with the event loop. The read callback drains
+    the fd and records the time; events are never decoded. A single timer
+    fires at the idle deadline. New and removed devices are picked up by
+    rescanning the input directory.
+
+    Reading /dev/input needs membership of the 'input' group. Any readable
+    character device or FIFO named event* in `input_dir` can act as a device.
+    """
+
+    def __init__(self, hub: LightControlHub, config: dict) -> None:
+        self._hub: LightControlHub = hub
+        self._config: dict = config
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._devices: dict[str, int] = {}
+        self._last_activity: float = 0.0
+        self._deadline: asyncio.TimerHandle | None = None
+        self._rescan: asyncio.Task | None = None
+        self._paused = False
+        self._tasks: set[asyncio.Task] = set()
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._scan()
+        if not self._devices:
+            _LOGGER.warning(
+                "No input devices found in %s", self._config[CONF_INPUT_DIR]
+            )
+        self._last_activity = self._loop.time()
+        self._arm_deadline()
+        self._rescan = self._loop.create_task(self._rescan_devices())
+
+    def stop(self) -> None:
+        if self._rescan is not None:
+            self._rescan.cancel()
+            self._rescan = None
+        self._disarm_deadline()
+        for path in list(self._devices):
+            self._close_device(path)
+
+    async def pause(self) -> None:
+        self._paused = True
+        if self._rescan is not None:
+            self._rescan.cancel()
+            self._rescan = None
+        self._disarm_deadline()
+        for fd in self._devices.values():
+            self._loop.remove_reader(fd)  # type: ignore[union-attr]
+
+    async def resume(self) -> None:
+        self._paused = False
+        for path, fd in self._devices.items():
+            self._loop.add_reader(fd, self._on_readable, path, fd)  # type: ignore[union-attr]
+        # Devices may have come and gone while paused.
+        self._scan()
+        self._last_activity = self._loop.time()  # type: ignore[union-attr]
+        self._arm_deadline()
+        if self._rescan is None:
+            self._rescan = self._loop.create_task(self._rescan_devices())  # type: ignore[union-attr]
+
+    def _on_readable(self, path: str, fd: int) -> None:
+        gone = False
+        try:
+            while os.read(fd, READ_SIZE):
+                pass
+            # A FIFO without writers reads as end of file.
+            gone = True
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            if e.errno != errno.ENODEV:
+                _LOGGER.warning("Failed to read %s: %s", path, e)
+            gone = True
+
+        # Events read before the device went away, and unplugging it, are
+        # activity too.
+        self._last_activity = self._loop.time()  # type: ignore[union-attr]
+        if self._deadline is None:
+            # The deadline only lapses when idle was triggered.
+            self._arm_deadline()
+            self._create_task(self.end_idle())
+        if gone:
+            self._close_device(path)
+
+    def _on_deadline(self) -> None:
+        remaining = (
+            self._last_activity + self._config[CONF_IDLE_DELAY] - self._loop.time()  # type: ignore[union-attr]
+        )
+        if remaining > 0:
+            self._deadline = self._loop.call_later(remaining, self._on_deadline)  # type: ignore[union-attr]
+            return
+        self._deadline = None
+        self._create_task(self.trigger_idle())
+
+    def _arm_deadline(self) -> None:
+        self._disarm_deadline()
+        self._deadline = self._loop.call_at(  # type: ignore[union-attr]
+            self._last_activity + self._config[CONF_IDLE_DELAY], self._on_deadline
+        )
+
+    def _disarm_deadline(self) -> None:
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+
+    async def _rescan_devices(self) -> None:
+        while True:
+            await asyncio.sleep(self._config[CONF_RESCAN_INTERVAL])
+            self._scan()
+
+    def _scan(self) -> None:
+        input_dir = self._config[CONF_INPUT_DIR]
+        try:
+            names = os.listdir(input_dir)
+        except OSError as e:
+            _LOGGER.warning("Failed to list %s: %s", input_dir, e)
+            return
+        for name in names:
+            path = os.path.join(input_dir, name)
+            if path in self._devices or not name.startswith("event"):
+                continue
+            if not _is_user_input(name):
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+            except OSError as e:
+                _LOGGER.debug("Failed to open %s: %s", path, e)
+                continue
+            _LOGGER.debug("Watching input device %s", path)
+            self._devices[path] = fd
+            if not self._paused:
+                self._loop.add_reader(fd, self._on_readable, path, fd)  # type: ignore[union-attr]
+
+    def _close_device(self, path: str) -> None:
+        fd = self._devices.pop(path, None)
+        if fd is None:
+            return
+        _LOGGER.debug("Input device %s removed", path)
+        self._loop.remove_reader(fd)  # type: ignore[union-attr]
+        os.close(fd)
+
+    def _create_task(self, coro) -> None:
+        task = self._loop.create_task(coro)  # type: ignore[union-attr]
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def _is_user_input(name: str) -> bool:
+    """Return whether an event device reports keys, buttons or motion.
+
+    Devices without sysfs capabilities, such as test FIFOs, are accepted.
+    """
+    try:
+        with open(
+            os.path.join(SYSFS_INPUT, name, "device", "capabilities", "ev"),
+            encoding="ascii",
+        ) as f:
+            capabilities = int(f.read(), 16)
+    except (OSError, ValueError):
+        return True
+    return bool(capabilities & ((1 << EV_KEY) | (1 << EV_REL)))
@@ -26,15 +26,17 @@ def get_plugin(hub: LightControlHub, config: dict) -> ActivityMonitor:
 
 
 class GnomeDBusActivityMonitor(ActivityMonitor):
-    _active_watch: asyncio.Task | None = None
-    _bus: MessageBus
+    _bus: MessageBus | None = None
+    _fired_unknown: set[int]
     _idle_tasks: set
-    _idle_watch: int | None = None
     _idle_monitor: proxy_object.ProxyInterface | None = None
+    _watches: dict[int, bool]
 
     def __init__(self, hub: LightControlHub, config: dict) -> None:
         self._hub: LightControlHub = hub
+        self._fired_unknown = set()
         self._idle_tasks = set()
+        self._watches = {}
         config[CONF_IDLE_DELAY] = config[CONF_IDLE_DELAY] * 1000  # convert to ms
         self._config: dict = config
 
@@ -65,29 +67,113 @@ class GnomeDBusActivityMonitor(ActivityMonitor):
         self._idle_monitor = idle_monitor_proxy.get_interface(
             "org.gnome.Mutter.IdleMonitor",
         )
-        self._idle_watch = await self._idle_monitor.call_add_idle_watch(  # type: ignore[attr-defined]
-            self._config[CONF_IDLE_DELAY]
-        )
         self._idle_monitor.on_watch_fired(self._watch_fired)  # type: ignore[attr-defined]
+        await self._add_idle_watch()
+
+    def stop(self) -> None:
+        for task in self._idle_tasks:
+            task.cancel()
+        self._watches.clear()
+        self._fired_unknown.clear()
+        self._idle_monitor = None
+        if self._bus is not None:
+            # Mutter drops the watches of a client that leaves the bus.
+            self._bus.disconnect()
+            self._bus = None
+
+    async def pause(self) -> None:
+        """Remove all watches, so that Mutter sends nothing until resume()."""
+        if self._idle_monitor is None:
+            return
+        watches, self._watches = self._watches, {}
+        self._fired_unknown.clear()
+        for task in self._idle_tasks:
+            task.cancel()
+        for watch in watches:
+            await self.call_guard.try_call(
+                "remove_watch",
+                self._idle_monitor.call_remove_watch(watch),  # type: ignore[attr-defined]
+            )
+
+    async def resume(self) -> None:
+        if self._idle_monitor is None or True in self._watches.values():
+            return
+        try:
+            await self._add_idle_watch()
+        except Exception as e:
+            _LOGGER.warning("Failed to watch for idle after resume: %s", e)
+
+    async def _add_idle_watch(self) -> None:
+        idle_watch = await self.call_guard.call(
+            "add_idle_watch",
+            self._idle_monitor.call_add_idle_watch(  # type: ignore[union-attr]
+                self._config[CONF_IDLE_DELAY]
+            ),
+        )
+        self._watches[idle_watch] = True
 
     def _watch_fired(self, signal_id: int) -> None:
         _LOGGER.debug("Signal fired: %d", signal_id)
-        if signal_id == self._idle_watch:
+        is_idle = self._watches.get(signal_id)
+        if is_idle is None:
+            # Mutter may deliver a user-active watch before the reply to
+            # AddUserActiveWatch reaches us. Remember it for _arm_active_watch.
+            self._fired_unknown.add(signal_id)
+        elif is_idle:
             _LOGGER.debug("Entering Idle...")
-            if self._idle_monitor is None:
-                _LOGGER.error(
-                    "No idle monitor found."
-                    " This is a bug in the gnome_dbus activity monitor"
-                )
-                return
-            self._active_watch = asyncio.create_task(
-                self._idle_monitor.call_add_user_active_watch()  # type: ignore[attr-defined]
-            )
+            self._add_idle_task(self._arm_active_watch())
             self._add_idle_task(self.trigger_idle())
-        elif self._active_watch is None or signal_id == self._active_watch.result():
-            _LOGGER.debug("Back in action!")
-            self._active_watch = None
-            self._add_idle_task(self.end_idle())
+        else:
+            self._watches.pop(signal_id)
+            self._back_in_action()
+
+    async def _arm_active_watch(self) -> None:
+        """Register the one-shot watch that reports the end of this idle period.
+
+        Mutter only fires a user-active watch on input after it was added, so
+        input that raced the registration is caught through GetIdletime.
+        """
+        if self._idle_monitor is None:
+            _LOGGER.error(
+                "No idle monitor found."
+                " This is a bug in the gnome_dbus activity monitor"
+            )
+            return
+        active_watch = await self.call_guard.try_call(
+            "add_user_active_watch",
+            self._idle_monitor.call_add_user_active_watch(),  # type: ignore[attr-defined]
+        )
+        if active_watch is None:
+            _LOGGER.warning("Failed to watch for the end of this idle period")
+            return
+        if active_watch in self._fired_unknown:
+            self._fired_unknown.discard(active_watch)
+            self._back_in_action()
+            return
+        self._fired_unknown.clear()
+        self._watches[active_watch] = False
+
+        idle_time = await self.call_guard.try_call(
+            "get_idletime",
+            self._idle_monitor.call_get_idletime(),  # type: ignore[attr-defined]
+        )
+        if (
+            idle_time is not None
+            and self._watches.get(active_watch) is False
+            and idle_time < self._config[CONF_IDLE_DELAY]
+        ):
+            self._watches.pop(active_watch)
+            await self.call_guard.try_call(
+                "remove_watch",
+                self._idle_monitor.call_remove_watch(active_watch),  # type: ignore[attr-defined]
+            )
+            self._back_in_action()
+
+    def _back_in_action(self) -> None:
+        if not self._is_idle:
+            return
+        _LOGGER.debug("Back in action!")
+        self._add_idle_task(self.end_idle())
 
     def _add_idle_task(self, task: Coroutine) -> None:
         added_task: asyncio.Task = asyncio.create_task(task)
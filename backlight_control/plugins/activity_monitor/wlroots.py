@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from queue import Queue
 from threading import Event
 from typing import TYPE_CHECKING
 
@@ -24,14 +23,15 @@ def get_plugin(hub: LightControlHub, config: dict):
 @wayland_class("ext_idle_notification_v1")
 class WlrootsIdleNotification(wayland.ext_idle_notification_v1):
     monitor: WlrootsActivityMonitor | None = None
+    seat: int | None = None
 
     def on_idled(self):
-        _LOGGER.debug("  Idle")
-        self.monitor.idle_queue.put_nowait(True)
+        _LOGGER.debug("  Idle (seat %s)", self.seat)
+        self.monitor.post_idle_state(self.seat, True)
 
     def on_resumed(self):
-        _LOGGER.debug("  Resume")
-        self.monitor.idle_queue.put_nowait(False)
+        _LOGGER.debug("  Resume (seat %s)", self.seat)
+        self.monitor.post_idle_state(self.seat, False)
 
 
 @wayland_class("wl_registry")
@@ -40,21 +40,21 @@ class WlrootsInput(wayland.wl_registry):
 
     idler: wayland.ext_idle_notifier_v1 | None
     monitor: WlrootsActivityMonitor | None
-    notifications: list[WlrootsIdleNotification]
-    seats: list[wayland.wl_seat]
+    notifications: dict[int, WlrootsIdleNotification]
+    seats: dict[int, wayland.wl_seat]
 
     def __init__(self):
         super().__init__()
-        self.seats = []
+        self.seats = {}
         self.idler = None
-        self.notifications = []
+        self.notifications = {}
         self.monitor = None
 
     def on_global(self, name, interface, version):
         _LOGGER.debug("%s (version %s)", interface, version)
         if interface == "wl_seat":
             seat = self.bind(name, interface, version)
-            self.seats.append(seat)
+            self.seats[name] = seat
             self.maybe_subscribe()
         elif interface == "ext_idle_notifier_v1":
             self.idler = self.bind(name, interface, version)
@@ -66,27 +66,45 @@ class WlrootsInput(wayland.wl_registry):
         _LOGGER.debug("Checking if we are ready to subscribe...")
         if self.seats and self.idler:
             _LOGGER.debug("...yes we are!")
-            for seat in self.seats:
+            for name, seat in self.seats.items():
+                if name in self.notifications:
+                    continue
                 notification = self.idler.get_input_idle_notification(
                     self.monitor.config[CONF_IDLE_DELAY] * 1000, seat
                 )
                 notification.monitor = self.monitor
-                self.notifications.append(notification)
+                notification.seat = name
+                self.notifications[name] = notification
+                # A new seat counts as active until it reports otherwise.
+                self.monitor.post_idle_state(name, False)
         else:
             _LOGGER.debug("...no we're not...")
 
+    def on_global_remove(self, name):
+        if self.seats.pop(name, None) is None:
+            return
+        _LOGGER.debug("Seat %s removed", name)
+        notification = self.notifications.pop(name, None)
+        if notification is not None:
+            notification.destroy()
+        self.monitor.post_idle_state(name, None)
+
 
 class WlrootsActivityMonitor(ActivityMonitor):
+    _loop: asyncio.AbstractEventLoop
     _worker: asyncio.Future | None
     _messageprocessor: asyncio.Task | None
+    _running: Event
     _stop_event: Event
 
     def __init__(self, hub: LightControlHub, config: dict) -> None:
-        self.idle_queue: Queue = Queue()
+        self.idle_queue: asyncio.Queue = asyncio.Queue()
         self._hub: LightControlHub = hub
         self._config: dict = config
         self._worker = None
         self._messageprocessor = None
+        self._running = Event()
+        self._running.set()
         self._stop_event = Event()
 
     @property
@@ -94,31 +112,52 @@ class WlrootsActivityMonitor(ActivityMonitor):
         return self._config
 
     async def start(self) -> None:
-        loop = asyncio.get_running_loop()
-        self._worker = loop.run_in_executor(None, self._monitor, self._stop_event)
-        self._messageprocessor = loop.create_task(self._process())
+        self._loop = asyncio.get_running_loop()
+        # Every worker thread gets its own event, so a retry after stop()
+        # does not start a thread that exits right away.
+        self._stop_event = Event()
+        self._worker = self._loop.run_in_executor(None, self._monitor, self._stop_event)
+        self._messageprocessor = self._loop.create_task(self._process())
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._running.set()
+        if self._messageprocessor is not None:
+            self._messageprocessor.cancel()
+            self._messageprocessor = None
+
+    async def pause(self) -> None:
+        self._running.clear()
+
+    async def resume(self) -> None:
+        self._running.set()
+
+    def post_idle_state(self, seat: int, is_idle: bool | None) -> None:
+        """Hand the idle state of a seat from the Wayland thread to the event loop.
+
+        None means that the seat was removed.
+        """
+        self._loop.call_soon_threadsafe(self.idle_queue.put_nowait, (seat, is_idle))
 
     def _monitor(self, stopping: Event) -> None:
         display = wayland.wl_display()
         registry = display.get_registry()
         registry.monitor = self
 
-        while True:
+        while not stopping.is_set():
+            if not self._running.is_set():
+                self._running.wait()
+                continue
             display.dispatch_timeout(0.1)
-            if stopping.is_set():
-                return
 
     async def _process(self):
         while True:
             _LOGGER.debug("Waiting for idle events")
-            while self.idle_queue.empty():
-                await asyncio.sleep(0.1)
-            state = self.idle_queue.get()
-            _LOGGER.debug("Got event: %s", state)
-            if state:
-                await self.trigger_idle()
+            seat, state = await self.idle_queue.get()
+            _LOGGER.debug("Got event for seat %s: %s", seat, state)
+            if state is None:
+                await self.remove_source(seat)
+            elif state:
+                await self.trigger_idle(seat)
             else:
-                await self.end_idle()
+                await self.end_idle(seat)
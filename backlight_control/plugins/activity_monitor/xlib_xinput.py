@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from contextlib import suppress
 import logging
 from typing import TYPE_CHECKING
 
 from Xlib.display import Display
 from Xlib.ext import xinput
+import Xlib.threaded  # noqa: F401
 
 from ...activity_monitor import CONF_IDLE_DELAY, ActivityMonitor
 
@@ -24,22 +24,51 @@ def get_plugin(hub: LightControlHub, config: dict):
 
 
 class XlibXinputActivityMonitor(ActivityMonitor):
-    _countdown: asyncio.Task
-    _event_trigger: asyncio.Task
-    _worker: asyncio.Task
+    _countdown: asyncio.Task | None = None
+    _worker: asyncio.Task | None = None
     _root: Window
 
     def __init__(self, hub: LightControlHub, config: dict) -> None:
         self._hub: LightControlHub = hub
         self._config: dict = config
+        self._activity: asyncio.Event = asyncio.Event()
+        self._last_event: float = 0.0
         self._tpe: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self._display: Display | None = None
+        self._running: asyncio.Event = asyncio.Event()
+        self._running.set()
 
     @property
     def config(self) -> dict:
         return self._config
 
+    def stop(self) -> None:
+        # The X connection stays open for another start().
+        for task in (self._worker, self._countdown):
+            if task is not None:
+                task.cancel()
+        self._worker = None
+        self._countdown = None
+
+    async def pause(self) -> None:
+        # The executor keeps waiting for X events, which are dropped until
+        # resume(); only the idle countdown stops.
+        self._running.clear()
+        if self._countdown is not None:
+            self._countdown.cancel()
+            self._countdown = None
+
+    async def resume(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._last_event = loop.time()
+        self._running.set()
+        if self._countdown is None:
+            self._countdown = loop.create_task(self._start_countdown())
+
     async def start(self) -> None:
-        display = Display()
+        if self._display is None:
+            self._display = await asyncio.to_thread(Display)
+        display = self._display
 
         version_info = display.xinput_query_version()
         _LOGGER.debug(
@@ -63,7 +92,8 @@ class XlibXinputActivityMonitor(ActivityMonitor):
         )
 
         def dc(fut):
-            fut.result()
+            if not fut.cancelled():
+                fut.result()
 
         loop = asyncio.get_running_loop()
         self._worker = loop.create_task(self.monitor(self._root))
@@ -71,17 +101,30 @@ class XlibXinputActivityMonitor(ActivityMonitor):
 
     async def monitor(self, root: Window) -> None:
         loop = asyncio.get_running_loop()
-        while True:
-            if self._is_idle:
-                await self.end_idle()
-
+        self._last_event = loop.time()
+        if self._running.is_set():
             self._countdown = loop.create_task(self._start_countdown())
+        while True:
             await loop.run_in_executor(self._tpe, root.display.next_event)
+            if not self._running.is_set():
+                continue
+            self._last_event = loop.time()
+            self._activity.set()
 
-            self._countdown.cancel()
-            with suppress(asyncio.CancelledError):
-                await self._countdown
+            if self._is_idle:
+                await self.end_idle()
 
     async def _start_countdown(self) -> None:
-        await asyncio.sleep(self._config[CONF_IDLE_DELAY])
-        await self.trigger_idle()
+        """Trigger idle once no event arrived for the idle delay.
+
+        A single task follows the deadline instead of one task per X event.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = self._last_event + self._config[CONF_IDLE_DELAY] - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            self._activity.clear()
+            await self.trigger_idle()
+            await self._activity.wait()
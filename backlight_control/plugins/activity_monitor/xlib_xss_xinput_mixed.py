@@ -6,6 +6,7 @@ import logging
 from typing import TYPE_CHECKING
 
 from Xlib.display import Display
+import Xlib.threaded  # noqa: F401
 
 from ...activity_monitor import CONF_IDLE_DELAY, ActivityMonitor
 
@@ -22,19 +23,36 @@ def get_plugin(hub: LightControlHub, config: dict):
 
 
 class XlibXssXinputMixedActivityMonitor(ActivityMonitor):
-    _worker: asyncio.Task
+    _worker: asyncio.Task | None = None
 
     def __init__(self, hub: LightControlHub, config: dict) -> None:
         self._hub: LightControlHub = hub
         self._config: dict = config
         self._tpe: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self._running: asyncio.Event = asyncio.Event()
+        self._running.set()
+        self._display: Display | None = None
 
     @property
     def config(self) -> dict:
         return self._config
 
+    def stop(self) -> None:
+        # The X connection stays open for another start().
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    async def pause(self) -> None:
+        self._running.clear()
+
+    async def resume(self) -> None:
+        self._running.set()
+
     async def start(self) -> None:
-        display = Display()
+        if self._display is None:
+            self._display = await asyncio.to_thread(Display)
+        display = self._display
 
         xss_version_info = display.screensaver_query_version()
         _LOGGER.debug(
@@ -59,6 +77,7 @@ class XlibXssXinputMixedActivityMonitor(ActivityMonitor):
         idle_delay_ms = self.config[CONF_IDLE_DELAY] * 1000
 
         while True:
+            await self._running.wait()
             while root.display.pending_events():
                 root.display.next_event()
             if not self._is_idle:
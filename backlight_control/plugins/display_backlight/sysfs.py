@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from dbus_fast import BusType
+from dbus_fast.aio import MessageBus
+from dbus_fast.introspection import Node
+
+from ...display_backlight import DisplayBacklight
+
+if TYPE_CHECKING:
+    from dbus_fast.aio.proxy_object import ProxyInterface
+
+    from ...hub import LightControlHub
+
+CONF_DEVICE = "device"
+CONF_LOGIND = "logind"
+DEFAULT_LOGIND = True
+SYSFS_BACKLIGHT = "/sys/class/backlight"
+# Preferred device types, as in systemd-backlight.
+DEVICE_TYPES = ("firmware", "platform", "raw")
+
+_LOGGER = logging.getLogger(__name__)
+
+_MODULE_DIR = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+
+def get_plugin(hub: LightControlHub, config: dict):
+    config[CONF_DEVICE] = config.get(CONF_DEVICE)
+    config[CONF_LOGIND] = config.get(CONF_LOGIND, DEFAULT_LOGIND)
+    return SysfsDisplayBacklight(hub, config)
+
+
+class SysfsDisplayBacklight(DisplayBacklight):
+    """Backlight under /sys/class/backlight.
+
+    Writing to sysfs needs root or a udev rule, so by default the brightness is
+    set through the SetBrightness method of the logind session instead.
+    """
+
+    def __init__(self, hub: LightControlHub, config: dict) -> None:
+        self._config = config
+        self._maximum: int = 1
+        self._hub: LightControlHub = hub
+        self._device: str | None = None
+        self._bus: MessageBus | None = None
+        self._session: ProxyInterface | None = None
+
+    async def get_current(self) -> int:
+        if self._device is None:
+            raise RuntimeError("No backlight device. Call start() first.")
+        return self._read("actual_brightness")
+
+    @property
+    def maximum(self) -> int:
+        return self._maximum
+
+    async def set_absolute(self, value: int) -> None:
+        if self._device is None:
+            raise RuntimeError("No backlight device. Call start() first.")
+        if not 0 <= value <= self._maximum:
+            return
+        if self._session is not None:
+            await self._session.call_set_brightness(  # type: ignore[attr-defined]
+                "backlight", self._device, value
+            )
+        else:
+            with open(self._path("brightness"), "w", encoding="ascii") as f:
+                f.write(str(value))
+
+    async def start(self) -> None:
+        self._device = self._config[CONF_DEVICE] or _find_device()
+        self._maximum = self._read("max_brightness")
+        _LOGGER.debug(
+            "Using backlight device %s, maximum %d", self._device, self._maximum
+        )
+        if not self._config[CONF_LOGIND]:
+            return
+
+        self._bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        with open(
+            os.path.join(_MODULE_DIR, "sysfs_org.freedesktop.login1.Session.xml"),
+            encoding="utf-8",
+        ) as f:
+            node_introspection = f.read()
+        session_proxy = self._bus.get_proxy_object(
+            "org.freedesktop.login1",
+            "/org/freedesktop/login1/session/auto",
+            Node.parse(node_introspection),
+        )
+        self._session = session_proxy.get_interface("org.freedesktop.login1.Session")
+
+    def stop(self) -> None:
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+        self._session = None
+
+    def _path(self, attribute: str) -> str:
+        return os.path.join(SYSFS_BACKLIGHT, self._device or "", attribute)
+
+    def _read(self, attribute: str) -> int:
+        with open(self._path(attribute), encoding="ascii") as f:
+            return int(f.read())
+
+
+def _find_device() -> str:
+    """Return the preferred backlight device."""
+    devices: dict[str, str] = {}
+    try:
+        names = sorted(os.listdir(SYSFS_BACKLIGHT))
+    except OSError as e:
+        raise RuntimeError(f"Failed to list {SYSFS_BACKLIGHT}: {e}") from e
+    for name in names:
+        try:
+            with open(
+                os.path.join(SYSFS_BACKLIGHT, name, "type"), encoding="ascii"
+            ) as f:
+                devices.setdefault(f.read().strip(), name)
+        except OSError:
+            continue
+    for device_type in DEVICE_TYPES:
+        if device_type in devices:
+            return devices[device_type]
+    raise RuntimeError(f"No backlight device found in {SYSFS_BACKLIGHT}")
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from Xlib import X, Xatom
+from Xlib.display import Display
+from Xlib.ext import randr
+from Xlib.protocol import rq
+import Xlib.threaded  # noqa: F401
+
+from ...display_backlight import DisplayBacklight
+
+if TYPE_CHECKING:
+    from ...hub import LightControlHub
+
+CONF_OUTPUT = "output"
+BACKLIGHT_ATOMS = ("Backlight", "BACKLIGHT")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_plugin(hub: LightControlHub, config: dict):
+    config[CONF_OUTPUT] = config.get(CONF_OUTPUT)
+    return XRandRDisplayBacklight(hub, config)
+
+
+class _GetOutputProperty(randr.GetOutputProperty):
+    """GetOutputProperty with the value decoded as 32 bit integers.
+
+    python-xlib decodes the value as a list of bytes regardless of the format,
+    which truncates every backlight value above 255.
+    """
+
+    _reply = rq.Struct(
+        rq.ReplyCode(),
+        rq.Format("value", 1),
+        rq.Card16("sequence_number"),
+        rq.ReplyLength(),
+        rq.Card32("property_type"),
+        rq.Card32("bytes_after"),
+        rq.LengthOf("value", 4),
+        rq.Pad(12),
+        rq.List("value", rq.Card32Obj),
+    )
+
+
+class XRandRDisplayBacklight(DisplayBacklight):
+    """Backlight property of a RandR output, as set by `xrandr --set`."""
+
+    def __init__(self, hub: LightControlHub, config: dict) -> None:
+        self._config = config
+        self._maximum: int = 100
+        self._minimum: int = 0
+        self._hub: LightControlHub = hub
+        self._display: Display | None = None
+        self._output: int | None = None
+        self._backlight_atom: int | None = None
+
+    async def get_current(self) -> int:
+        if self._display is None or self._output is None:
+            raise RuntimeError("Not connected to X. Call start() first.")
+        return await asyncio.to_thread(self._get_current)
+
+    @property
+    def maximum(self) -> int:
+        return self._maximum
+
+    async def set_absolute(self, value: int) -> None:
+        if self._display is None or self._output is None:
+            raise RuntimeError("Not connected to X. Call start() first.")
+        if 0 <= value <= self._maximum:
+            await asyncio.to_thread(self._set_absolute, value)
+
+    async def start(self) -> None:
+        # X requests block until the server replies, so they run in a thread.
+        # The plugin has its own connection and works with any activity
+        # monitor.
+        self._display = await asyncio.to_thread(Display)
+        await asyncio.to_thread(self._find_output, self._display)
+
+    def stop(self) -> None:
+        if self._display is not None:
+            self._display.close()
+        self._display = None
+        self._output = None
+
+    def _find_output(self, display: Display) -> None:
+        if not display.has_extension(randr.extname):
+            raise RuntimeError("The X server does not support RandR.")
+
+        root = display.screen().root
+        resources = root.xrandr_get_screen_resources()  # type: ignore[attr-defined]
+        for output in resources.outputs:
+            name = display.xrandr_get_output_info(  # type: ignore[attr-defined]
+                output, resources.config_timestamp
+            ).name
+            if self._config[CONF_OUTPUT] not in (None, name):
+                continue
+            atoms = display.xrandr_list_output_properties(output).atoms  # type: ignore[attr-defined]
+            for atom_name in BACKLIGHT_ATOMS:
+                atom = display.get_atom(atom_name, only_if_exists=True)
+                if atom != X.NONE and atom in atoms:
+                    break
+            else:
+                continue
+            _LOGGER.debug("Using backlight of output %s", name)
+            self._output = output
+            self._backlight_atom = atom
+            break
+        else:
+            raise RuntimeError(
+                f"No RandR output with a backlight found: {self._config[CONF_OUTPUT]}"
+            )
+
+        valid_values = display.xrandr_query_output_property(  # type: ignore[attr-defined]
+            self._output, self._backlight_atom
+        ).valid_values
+        self._minimum, maximum = valid_values[0], valid_values[-1]
+        self._maximum = maximum - self._minimum
+
+    def _get_current(self) -> int:
+        reply = _GetOutputProperty(
+            display=self._display.display,  # type: ignore[union-attr]
+            opcode=self._display.display.get_extension_major(randr.extname),  # type: ignore[union-attr]
+            output=self._output,
+            property=self._backlight_atom,
+            type=Xatom.INTEGER,
+            long_offset=0,
+            long_length=1,
+            delete=False,
+            pending=False,
+        )
+        return int(reply.value[0]) - self._minimum
+
+    def _set_absolute(self, value: int) -> None:
+        self._display.xrandr_change_output_property(  # type: ignore[union-attr]
+            self._output,
+            self._backlight_atom,
+            Xatom.INTEGER,
+            X.PropModeReplace,
+            (32, [value + self._minimum]),
+        )
+        self._display.flush()  # type: ignore[union-attr]
@@ -8,7 +8,9 @@ from dbus_fast import BusType
 from dbus_fast.aio import MessageBus
 from dbus_fast.introspection import Node
 
+from ...dbus_signals import watch_properties_changed
 from ...keyboard_backlight import KeyboardBacklight
+from ...types import KeyboardBacklightCapabilities
 
 if TYPE_CHECKING:
     from dbus_fast.aio.proxy_object import ProxyInterface
@@ -29,14 +31,22 @@ class DBusGnomeKeyboardBacklight(KeyboardBacklight):
         self._config = config
         self._maximum: int = 100
         self.stored: int = 1
+        self._current: int = 0
+        self._steps: int | None = None
         self._hub: LightControlHub = hub
         self._bus: MessageBus | None = None
         self._kbd_backlight: ProxyInterface | None = None
 
+    @property
+    def capabilities(self) -> KeyboardBacklightCapabilities:
+        # Steps is the number of steps above off, i.e. the UPower maximum.
+        levels = self._steps + 1 if self._steps is not None else None
+        return KeyboardBacklightCapabilities(levels=levels, write_cost=0.02)
+
     async def get_current(self) -> int:
         if not self._kbd_backlight:
             raise RuntimeError("Not connected to DBus. Call start() first.")
-        return int(await self._kbd_backlight.get_brightness())  # type: ignore[attr-defined]
+        return self._current
 
     @property
     def maximum(self) -> int:
@@ -47,6 +57,7 @@ class DBusGnomeKeyboardBacklight(KeyboardBacklight):
             raise RuntimeError("Not connected to DBus. Call start() first.")
         if 0 <= value <= self._maximum:
             await self._kbd_backlight.set_brightness(value)  # type: ignore[attr-defined]
+            self._current = value
 
     async def start(self) -> None:
         self._bus = await MessageBus(bus_type=BusType.SESSION).connect()
@@ -64,4 +75,32 @@ class DBusGnomeKeyboardBacklight(KeyboardBacklight):
         self._kbd_backlight = kbd_backlight_proxy.get_interface(
             "org.gnome.SettingsDaemon.Power.Keyboard",
         )
-        self.stored = await self._kbd_backlight.get_brightness()  # type: ignore[attr-defined]
+        await watch_properties_changed(
+            self._bus,
+            "org.gnome.SettingsDaemon.Power",
+            "/org/gnome/SettingsDaemon/Power",
+            "org.gnome.SettingsDaemon.Power.Keyboard",
+            self._properties_changed,
+        )
+        self._steps = int(await self._kbd_backlight.get_steps())  # type: ignore[attr-defined]
+        self._current = int(await self._kbd_backlight.get_brightness())  # type: ignore[attr-defined]
+        self.stored = self._current
+        self.device_changed(self._current)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+        self._kbd_backlight = None
+
+    def _properties_changed(
+        self,
+        changed_properties: dict,
+        invalidated_properties: list,
+    ) -> None:
+        """Keep the local brightness mirror in sync with gnome-settings-daemon."""
+        if "Brightness" in changed_properties:
+            self._current = int(changed_properties["Brightness"].value)
+            _LOGGER.debug("Brightness changed: %d", self._current)
+            self.device_changed(self._current)
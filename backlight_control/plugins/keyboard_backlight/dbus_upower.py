@@ -9,6 +9,7 @@ from dbus_fast.aio import MessageBus
 from dbus_fast.introspection import Node
 
 from ...keyboard_backlight import KeyboardBacklight
+from ...types import KeyboardBacklightCapabilities
 
 if TYPE_CHECKING:
     from dbus_fast.aio.proxy_object import ProxyInterface
@@ -29,14 +30,19 @@ class DBusUPowerKeyboardBacklight(KeyboardBacklight):
         self._config = config
         self._maximum: int = 1
         self.stored: int = 1
+        self._current: int = 0
         self._hub: LightControlHub = hub
         self._bus: MessageBus | None = None
         self._kbd_backlight: ProxyInterface | None = None
 
+    @property
+    def capabilities(self) -> KeyboardBacklightCapabilities:
+        return KeyboardBacklightCapabilities(levels=self._maximum + 1, write_cost=0.01)
+
     async def get_current(self) -> int:
         if not self._kbd_backlight:
             raise RuntimeError("Not connected to DBus. Call start() first.")
-        return int(await self._kbd_backlight.call_get_brightness())  # type: ignore[attr-defined]
+        return self._current
 
     @property
     def maximum(self) -> int:
@@ -47,6 +53,7 @@ class DBusUPowerKeyboardBacklight(KeyboardBacklight):
             raise RuntimeError("Not connected to DBus. Call start() first.")
         if 0 <= value <= self._maximum:
             await self._kbd_backlight.call_set_brightness(value)  # type: ignore[attr-defined]
+            self._current = value
 
     async def start(self) -> None:
         self._bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
@@ -66,5 +73,30 @@ class DBusUPowerKeyboardBacklight(KeyboardBacklight):
         self._kbd_backlight = kbd_backlight_proxy.get_interface(
             "org.freedesktop.UPower.KbdBacklight",
         )
+        self._kbd_backlight.on_brightness_changed(self._brightness_changed)  # type: ignore[attr-defined]
+        self._kbd_backlight.on_brightness_changed_with_source(  # type: ignore[attr-defined]
+            self._brightness_changed_with_source
+        )
         self._maximum = await self._kbd_backlight.call_get_max_brightness()  # type: ignore[attr-defined]
-        self.stored = await self._kbd_backlight.call_get_brightness()  # type: ignore[attr-defined]
+        self._current = await self._kbd_backlight.call_get_brightness()  # type: ignore[attr-defined]
+        self.stored = self._current
+        self.device_changed(self._current)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+        self._kbd_backlight = None
+
+    def _brightness_changed(self, value: int) -> None:
+        """Keep the local brightness mirror in sync with UPower."""
+        _LOGGER.debug("Brightness changed: %d", value)
+        self._current = int(value)
+        self.device_changed(self._current)
+
+    def _brightness_changed_with_source(self, value: int, source: str) -> None:
+        """Keep the local brightness mirror in sync with UPower."""
+        _LOGGER.debug("Brightness changed by %s: %d", source, value)
+        self._current = int(value)
+        self.device_changed(self._current)
@@ -2,27 +2,40 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 
 from ...keyboard_backlight import KeyboardBacklight
+from ...types import KeyboardBacklightCapabilities
 
 if TYPE_CHECKING:
+    from asyncio.subprocess import Process
+    from collections.abc import Awaitable
+
     from ...hub import LightControlHub
 
 CONF_CONTROL = "control"
 CONF_FADE_FPS = "fade_fps"
 CONF_FADE_TIME = "fade_time"
+CONF_LEVELS = "levels"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
 DEFAULT_CONTROL = "chromeos::kbd_backlight"
 DEFAULT_FADE_FPS = 30
 DEFAULT_FADE_TIME = 300
+DEFAULT_MIN_WRITE_INTERVAL = 0.5
 
 _LOGGER = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def get_plugin(hub: LightControlHub, config: dict):
     config[CONF_CONTROL] = config.get(CONF_CONTROL, DEFAULT_CONTROL)
     config[CONF_FADE_FPS] = config.get(CONF_FADE_FPS, DEFAULT_FADE_FPS)
     config[CONF_FADE_TIME] = config.get(CONF_FADE_TIME, DEFAULT_FADE_TIME)
+    config[CONF_LEVELS] = config.get(CONF_LEVELS)
+    config[CONF_MIN_WRITE_INTERVAL] = config.get(
+        CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+    )
     return XBacklightKeyboardBacklight(hub, config)
 
 
@@ -33,6 +46,14 @@ class XBacklightKeyboardBacklight(KeyboardBacklight):
         self.stored: int = 1
         self._hub: LightControlHub = hub
 
+    @property
+    def capabilities(self) -> KeyboardBacklightCapabilities:
+        return KeyboardBacklightCapabilities(
+            levels=self._config[CONF_LEVELS],
+            min_write_interval=self._config[CONF_MIN_WRITE_INTERVAL],
+            write_cost=self._config[CONF_FADE_TIME] / 1000,
+        )
+
     async def get_current(self) -> int:
         proc = await asyncio.create_subprocess_exec(
             "xbacklight",
@@ -41,7 +62,7 @@ class XBacklightKeyboardBacklight(KeyboardBacklight):
             "-get",
             stdout=asyncio.subprocess.PIPE,
         )
-        output, _ = await proc.communicate()
+        output, _ = await _wait_or_kill(proc.communicate(), proc)
         return int(output)
 
     @property
@@ -60,7 +81,17 @@ class XBacklightKeyboardBacklight(KeyboardBacklight):
             "-fps",
             str(self._config[CONF_FADE_FPS]),
         )
-        await proc.wait()
+        await _wait_or_kill(proc.wait(), proc)
 
     async def start(self) -> None:
         pass
+
+
+async def _wait_or_kill(awaitable: Awaitable[T], proc: Process) -> T:
+    """Kill a hanging xbacklight if the call is cancelled, e.g. on a deadline."""
+    try:
+        return await awaitable
+    except asyncio.CancelledError:
+        if proc.returncode is None:
+            proc.kill()
+        raise
@@ -9,6 +9,7 @@ from dbus_fast import BusType
 from dbus_fast.aio import MessageBus
 from dbus_fast.introspection import Node
 
+from ...dbus_signals import watch_properties_changed
 from ...light_sensor import LightSensor
 from ...types import LightControlHubLightSensorUpdate
 
@@ -31,9 +32,15 @@ class DBusSensorProxyLightSensor(LightSensor):
         self._hub: LightControlHub = hub
         self._iio_sensor: ProxyInterface | None = None
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._light_level_unit: str = ""
+        self._update_tasks: set[asyncio.Task] = set()
+        self._bus: MessageBus | None = None
+        self._signals = 0
+        self._signals_in_band = 0
+        self._signals_without_light = 0
 
     async def start(self) -> None:
-        bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
+        self._bus = bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
 
         with open(
             os.path.join(_MODULE_DIR, "dbus_sensorproxy_net.hadess.SensorProxy.xml"),
@@ -50,43 +57,75 @@ class DBusSensorProxyLightSensor(LightSensor):
         )
 
         self._loop = asyncio.get_running_loop()
-
-        def on_properties_changed(
-            interface_name,
-            changed_properties,
-            invalidated_properties,
-        ):
-            update = LightControlHubLightSensorUpdate(
-                unit="",
-                value=0,
-            )
-            for changed, variant in changed_properties.items():
-                _LOGGER.debug("property changed: %s - %s", changed, variant.value)
-                if changed == "LightLevelUnit":
-                    update.unit = variant.value
-                elif changed == "LightLevel":
-                    update.value = int(variant.value)
-            self._update_task = self._loop.create_task(self._send_update(update))
-
         self._iio_dbus_properties = iio_sensor_proxy.get_interface(
             "org.freedesktop.DBus.Properties",
         )
-        self._iio_dbus_properties.on_properties_changed(on_properties_changed)  # type: ignore[attr-defined]
+        await watch_properties_changed(
+            bus,
+            "net.hadess.SensorProxy",
+            "/net/hadess/SensorProxy",
+            "net.hadess.SensorProxy",
+            self._properties_changed,
+        )
 
-        await self.resume()
+        update = await self.resume()
+        await self._send_update(update)
 
-    async def resume(self):
-        await self._iio_sensor.call_claim_light()
-        await self._send_update(
-            LightControlHubLightSensorUpdate(
-                unit=await self._iio_sensor.get_light_level_unit(),  # type: ignore[attr-defined]
-                value=int(await self._iio_sensor.get_light_level()),  # type: ignore[attr-defined]
-            )
+    async def resume(self) -> LightControlHubLightSensorUpdate:
+        # Both messages are queued on the bus before either reply is awaited.
+        # The service handles them in order, so GetAll sees the claimed sensor.
+        _, properties = await asyncio.gather(
+            self._iio_sensor.call_claim_light(),  # type: ignore[attr-defined]
+            self._iio_dbus_properties.call_get_all("net.hadess.SensorProxy"),  # type: ignore[attr-defined]
+        )
+        if not self._light_level_unit and "LightLevelUnit" in properties:
+            self._light_level_unit = properties["LightLevelUnit"].value
+        return LightControlHubLightSensorUpdate(
+            unit=self._light_level_unit,
+            value=int(properties["LightLevel"].value),
         )
 
     async def pause(self):
         await self._iio_sensor.call_release_light()
 
+    def stop(self) -> None:
+        _LOGGER.info(
+            "Dropped %d of %d sensor proxy signals inside the report band"
+            " and %d without a light level",
+            self._signals_in_band,
+            self._signals,
+            self._signals_without_light,
+        )
+        if self._bus is not None:
+            # Disconnecting also drops the claim and the match rule.
+            self._bus.disconnect()
+            self._bus = None
+
+    def _properties_changed(
+        self,
+        changed_properties: dict,
+        invalidated_properties: list,
+    ) -> None:
+        self._signals += 1
+        if "LightLevelUnit" in changed_properties:
+            self._light_level_unit = changed_properties["LightLevelUnit"].value
+        # Accelerometer and proximity changes share the interface, so the
+        # match rule cannot keep them out.
+        level = changed_properties.get("LightLevel")
+        if level is None:
+            self._signals_without_light += 1
+            return
+        if self.in_report_band(level.value):
+            self._signals_in_band += 1
+            return
+        _LOGGER.debug("Light level changed: %s", level.value)
+        update = LightControlHubLightSensorUpdate(
+            unit=self._light_level_unit,
+            value=int(level.value),
+        )
+        update_task = self._loop.create_task(self._send_update(update))
+        self._update_tasks.add(update_task)
+        update_task.add_done_callback(self._update_tasks.discard)
+
     async def _send_update(self, update: LightControlHubLightSensorUpdate):
         await self._hub.light_sensor_update(update)
-        self._update_task = None
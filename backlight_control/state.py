@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass, fields
+import json
+import logging
+import os
+import tempfile
+import time
+
+CONF_STATE_FILE = "state_file"
+CONF_STATE_MAX_AGE = "state_max_age"
+CONF_STATE_WRITE_INTERVAL = "state_write_interval"
+DEFAULT_STATE_MAX_AGE = 600
+DEFAULT_STATE_WRITE_INTERVAL = 30
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def default_state_file() -> str:
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.expanduser(
+        "~/.local/state"
+    )
+    return os.path.join(state_home, "backlight_control", "state.json")
+
+
+@dataclass(kw_only=True)
+class StateSnapshot:
+    lux: int | None = None
+    lux_unit: str = ""
+    stored: int | None = None
+    # Time of the last write, up to which `lux` was known to be current.
+    timestamp: float = 0.0
+
+    def age(self) -> float:
+        """Return the seconds since the snapshot was written."""
+        return time.time() - self.timestamp
+
+
+class StateStore:
+    """Keep a small state snapshot on disk across restarts.
+
+    Writes are atomic and happen at most once every `write_interval` seconds.
+    """
+
+    def __init__(self, path: str, write_interval: float) -> None:
+        self._path = os.path.expanduser(path)
+        self._write_interval = write_interval
+        self._last_write: float = 0.0
+        self._scheduled: asyncio.TimerHandle | None = None
+        self._write_task: asyncio.Future | None = None
+        self.snapshot = StateSnapshot()
+
+    def load(self) -> StateSnapshot | None:
+        """Load the snapshot from disk, or return None if there is none."""
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _LOGGER.warning("Failed to load state from %s: %s", self._path, e)
+            return None
+
+        known = {field.name for field in fields(StateSnapshot)}
+        self.snapshot = StateSnapshot(
+            **{key: value for key, value in data.items() if key in known}
+        )
+        _LOGGER.debug("Loaded state: %s", self.snapshot)
+        return self.snapshot
+
+    def update(self, **changes) -> None:
+        """Update the snapshot and schedule a write."""
+        for key, value in changes.items():
+            setattr(self.snapshot, key, value)
+        if self._scheduled is not None:
+            return
+        loop = asyncio.get_running_loop()
+        delay = max(0.0, self._last_write + self._write_interval - time.monotonic())
+        self._scheduled = loop.call_later(delay, self._write_soon, loop)
+
+    def flush(self) -> None:
+        """Write pending changes right away."""
+        if self._scheduled is None:
+            return
+        self._scheduled.cancel()
+        self._scheduled = None
+        self._write(self._serialize())
+
+    def _write_soon(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._scheduled = None
+        self._last_write = time.monotonic()
+        self._write_task = loop.run_in_executor(None, self._write, self._serialize())
+
+    def _serialize(self) -> str:
+        self.snapshot.timestamp = time.time()
+        return json.dumps(asdict(self.snapshot))
+
+    def _write(self, data: str) -> None:
+        directory = os.path.dirname(self._path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".state-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            _LOGGER.warning("Failed to write state to %s: %s", self._path, e)
@@ -0,0 +1,154 @@
+"""Shared-memory status page for status bars and widgets.
+
+The daemon keeps its current state in a small memory-mapped file, by default
+$XDG_RUNTIME_DIR/backlight_control/status. The layout is fixed, little endian:
+
+    offset  type     field
+    0       char[4]  magic, b"BLCS"
+    4       uint16   layout version, currently 1
+    8       uint64   sequence counter
+    16      float64  last lux reading, NaN if unknown
+    24      int32    target keyboard brightness, -1 if unknown
+    28      int32    last written keyboard brightness, -1 if unknown
+    32      uint8    hub state, see STATUS_STATES
+    33      uint8    1 if the user is idle
+    40      float64  time of the last update, seconds since the epoch
+
+The sequence counter is odd while an update is in progress. The writer stores
+the odd counter, then the fields, then the even counter as a separate final
+store. Readers read the counter, retry while it is odd, copy the page and read
+the counter again; the copy is only used if both reads match. See
+read_status().
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+
+from .types import LightControlHubState
+
+CONF_STATUS_PAGE = "status_page"
+DEFAULT_STATUS_PAGE = True
+STATUS_LAYOUT = struct.Struct("<4sH2xQdiiBB6xd")
+STATUS_MAGIC = b"BLCS"
+STATUS_STATES = (
+    LightControlHubState.ACTIVE_ON,
+    LightControlHubState.ACTIVE_OFF,
+    LightControlHubState.IDLE_OFF,
+    LightControlHubState.SUSPENDED,
+)
+STATUS_VERSION = 1
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def default_status_page_path() -> str | None:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        return None
+    return os.path.join(runtime_dir, "backlight_control", "status")
+
+
+@dataclass(kw_only=True)
+class Status:
+    sequence: int
+    lux: float
+    target: int
+    written: int
+    state: LightControlHubState
+    is_idle: bool
+    timestamp: float
+
+
+class StatusPage:
+    """Writer side of the status page."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._map: mmap.mmap | None = None
+        self._sequence = 0
+
+    def open(self) -> None:
+        os.makedirs(os.path.dirname(self._path), mode=0o700, exist_ok=True)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, STATUS_LAYOUT.size)
+            self._map = mmap.mmap(fd, STATUS_LAYOUT.size)
+        finally:
+            os.close(fd)
+        self._sequence = 0
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def update(
+        self,
+        *,
+        lux: float | None,
+        target: int | None,
+        written: int | None,
+        state: LightControlHubState,
+        is_idle: bool,
+    ) -> None:
+        if self._map is None:
+            return
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+        STATUS_LAYOUT.pack_into(
+            self._map,
+            0,
+            STATUS_MAGIC,
+            STATUS_VERSION,
+            self._sequence,
+            math.nan if lux is None else lux,
+            -1 if target is None else target,
+            -1 if written is None else written,
+            STATUS_STATES.index(state),
+            is_idle,
+            time.time(),
+        )
+        self._sequence += 1
+        _SEQUENCE.pack_into(self._map, _SEQUENCE_OFFSET, self._sequence)
+
+
+def read_status(path: str, retries: int = 100) -> Status | None:
+    """Read a consistent copy of the status page, or None if there is none."""
+    try:
+        with open(path, "rb") as f:
+            page = mmap.mmap(f.fileno(), STATUS_LAYOUT.size, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    with page:
+        for _ in range(retries):
+            (sequence,) = _SEQUENCE.unpack_from(page, _SEQUENCE_OFFSET)
+            if sequence % 2:
+                continue
+            data = page[: STATUS_LAYOUT.size]
+            (check,) = _SEQUENCE.unpack_from(page, _SEQUENCE_OFFSET)
+            if check != sequence:
+                continue
+            magic, version, _, *fields = STATUS_LAYOUT.unpack(data)
+            if magic != STATUS_MAGIC or version != STATUS_VERSION:
+                return None
+            lux, target, written, state, is_idle, timestamp = fields
+            return Status(
+                sequence=sequence,
+                lux=lux,
+                target=target,
+                written=written,
+                state=STATUS_STATES[state],
+                is_idle=bool(is_idle),
+                timestamp=timestamp,
+            )
+    _LOGGER.debug("Status page kept changing while reading")
+    return None
@@ -0,0 +1,349 @@
+"""Offline parameter sweep for the keyboard backlight policy.
+
+Replays recorded light sensor readings and user activity against a grid of
+keyboard backlight settings and reports how each candidate would behave.
+
+Lux recordings are CSV files with `timestamp,lux` rows. Activity recordings
+hold one timestamp per line, for every moment the user was active.
+"""
+
+from __future__ import annotations
+
+import argparse
+from itertools import product
+import sys
+
+import numpy as np
+
+from .activity_monitor import CONF_IDLE_DELAY, DEFAULT_IDLE_DELAY
+from .keyboard_backlight import (
+    CONF_KEYBOARD_MIN_BRIGHTNESS,
+    CONF_LUX_FOR_KEYBOARD_OFF,
+    CONF_LUX_FOR_MAX_BRIGHTNESS,
+    CONF_LUX_FOR_MIN_BRIGHTNESS,
+    DEFAULT_KEYBOARD_MIN_BRIGHTNESS,
+    DEFAULT_LUX_FOR_KEYBOARD_OFF,
+    DEFAULT_LUX_FOR_MAX_BRIGHTNESS,
+    DEFAULT_LUX_FOR_MIN_BRIGHTNESS,
+)
+
+PARAMETERS = {
+    CONF_LUX_FOR_MIN_BRIGHTNESS: DEFAULT_LUX_FOR_MIN_BRIGHTNESS,
+    CONF_LUX_FOR_MAX_BRIGHTNESS: DEFAULT_LUX_FOR_MAX_BRIGHTNESS,
+    CONF_LUX_FOR_KEYBOARD_OFF: DEFAULT_LUX_FOR_KEYBOARD_OFF,
+    CONF_KEYBOARD_MIN_BRIGHTNESS: DEFAULT_KEYBOARD_MIN_BRIGHTNESS,
+    CONF_IDLE_DELAY: DEFAULT_IDLE_DELAY,
+}
+DEFAULT_CHUNK_CELLS = 4_000_000
+
+
+def parse_values(spec: str) -> np.ndarray:
+    """Parse `a,b,c` or `start:stop:step` (stop inclusive) into values."""
+    if ":" in spec:
+        start, stop, step = (float(part) for part in spec.split(":"))
+        return np.arange(start, stop + step / 2, step)
+    return np.array([float(part) for part in spec.split(",")])
+
+
+def build_grid(values: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Return the cartesian product of all parameter values as flat arrays."""
+    names = list(values)
+    combinations = np.array(list(product(*values.values())), dtype=float)
+    return {name: combinations[:, i] for i, name in enumerate(names)}
+
+
+def segment(
+    lux: np.ndarray,
+    lux_index: np.ndarray,
+    activity: np.ndarray,
+    idle_delay: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Split the recording into segments in which nothing changes.
+
+    Segment boundaries are lux readings, activity and the moments the idle
+    delay expires. Every segment is identified by a state key, two per
+    distinct lux value (active and idle). Returns the key and duration of
+    every segment.
+    """
+    start = min(lux[0, 0], activity[0]) if activity.size else lux[0, 0]
+    end = max(lux[-1, 0], activity[-1]) if activity.size else lux[-1, 0]
+    times = np.unique(np.concatenate([lux[:, 0], activity, activity + idle_delay]))
+    times = times[(times >= start) & (times < end)]
+    durations = np.diff(np.append(times, end))
+
+    lux_position = np.searchsorted(lux[:, 0], times, side="right") - 1
+    activity_position = np.searchsorted(activity, times, side="right") - 1
+    last_activity = np.where(
+        activity_position >= 0, activity[np.clip(activity_position, 0, None)], start
+    )
+    is_idle = times - last_activity >= idle_delay
+    keys = lux_index[np.clip(lux_position, 0, None)] * 2 + is_idle
+    return keys, durations
+
+
+class Transitions:
+    """State transitions of a segmented recording, counted per lux value.
+
+    `prefix` is the 2D prefix sum of the active to active transition counts,
+    indexed by lux value. `to_idle` and `from_idle` count the transitions
+    from and to every active lux value, and `active_time` is the time spent
+    active at every lux value.
+    """
+
+    def __init__(self, keys: np.ndarray, durations: np.ndarray, size: int) -> None:
+        changed = keys[:-1] != keys[1:]
+        before, after = keys[:-1][changed], keys[1:][changed]
+        lux_before, lux_after = before // 2, after // 2
+        idle_before, idle_after = before % 2 == 1, after % 2 == 1
+
+        active = ~idle_before & ~idle_after
+        counts = np.bincount(
+            (lux_before[active] + 1) * (size + 1) + lux_after[active] + 1,
+            minlength=(size + 1) ** 2,
+        ).reshape(size + 1, size + 1)
+        self.prefix = counts.cumsum(axis=0).cumsum(axis=1)
+        self.total = int(active.sum())
+        self.to_idle = np.bincount(
+            lux_before[~idle_before & idle_after], minlength=size
+        )
+        self.from_idle = np.bincount(
+            lux_after[idle_before & ~idle_after], minlength=size
+        )
+        key_durations = np.bincount(keys, weights=durations, minlength=2 * size)
+        self.active_time = key_durations[0::2]
+        self.idle_time = float(key_durations[1::2].sum())
+
+
+def target_levels(
+    grid: dict[str, np.ndarray],
+    lux: np.ndarray,
+    maximum: int,
+) -> np.ndarray:
+    """Return the target brightness for every candidate and lux value.
+
+    This mirrors KeyboardBacklight.target_for_lux exactly, with one row per
+    candidate and one column per lux value. Targets are not clipped to
+    [0, maximum], as the live policy does not clip them either.
+    """
+    lux_min = grid[CONF_LUX_FOR_MIN_BRIGHTNESS][:, None]
+    lux_max = grid[CONF_LUX_FOR_MAX_BRIGHTNESS][:, None]
+    lux_off = grid[CONF_LUX_FOR_KEYBOARD_OFF][:, None]
+    kb_min = grid[CONF_KEYBOARD_MIN_BRIGHTNESS][:, None]
+    lux = lux[None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        target = np.trunc(
+            kb_min + (lux - lux_min) / (lux_max - lux_min) * (maximum - kb_min)
+        )
+    # Applied in reverse order of the checks in target_for_lux, so that the
+    # first matching check wins.
+    target = np.where(lux >= lux_max, maximum, target)
+    target = np.where(lux <= lux_min, kb_min, target)
+    target = np.where(lux >= lux_off, 0, target)
+    return target.astype(np.int64)
+
+
+def quantize_levels(target: np.ndarray, maximum: int, levels: int | None) -> np.ndarray:
+    """Return the device levels written for `target`, as KeyboardBacklight.quantize."""
+    if levels is None or levels < 2:
+        return target
+    step = maximum / (levels - 1)
+    quantized = np.minimum(
+        maximum, np.round(np.maximum(1, np.round(target / step)) * step)
+    ).astype(np.int64)
+    return np.where(target <= 0, target, quantized)
+
+
+def evaluate(
+    grid: dict[str, np.ndarray],
+    lux_values: np.ndarray,
+    transitions: Transitions,
+    maximum: int,
+    levels: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Apply the backlight policy for every candidate in `grid` at once.
+
+    A write is counted whenever the hub calls set_absolute, i.e. whenever the
+    quantized target differs from the last value written. This includes
+    writes outside [0, maximum], which the backends ignore. Time with such a
+    target is reported as rejected instead of at a level.
+
+    Counting the transitions between two lux values with a different level
+    would cost candidates x distinct transitions. Instead the transition
+    counts are kept in a matrix with a 2D prefix sum. Below lux_for_keyboard_off
+    the level is monotonic in lux, so every level covers one contiguous range
+    of lux values and the transitions within it are one rectangle of the
+    matrix. Level 0 is the only one that may also occur above
+    lux_for_keyboard_off, which adds two more rectangles.
+    """
+    size = lux_values.size
+    level = quantize_levels(target_levels(grid, lux_values, maximum), maximum, levels)
+    candidates = level.shape[0]
+    prefix = transitions.prefix
+    index = np.arange(size)
+
+    def rectangle(rows_start, rows_end, columns_start, columns_end):
+        return (
+            prefix[rows_end, columns_end]
+            - prefix[rows_start, columns_end]
+            - prefix[rows_end, columns_start]
+            + prefix[rows_start, columns_start]
+        )
+
+    # Transitions between lux values in the same run of equal levels.
+    change = level[:, 1:] != level[:, :-1]
+    run_end = np.ones(level.shape, dtype=bool)
+    run_end[:, :-1] = change
+    run_start = np.zeros(level.shape, dtype=np.int64)
+    run_start[:, 1:] = np.where(change, index[1:], 0)
+    run_start = np.maximum.accumulate(run_start, axis=1)
+    unchanged = np.where(
+        run_end, rectangle(run_start, index + 1, run_start, index + 1), 0
+    ).sum(axis=1)
+
+    # Transitions between a level 0 below and one above lux_for_keyboard_off.
+    off = np.searchsorted(lux_values, grid[CONF_LUX_FOR_KEYBOARD_OFF])
+    zero = (level == 0) & (index < off[:, None])
+    zero_start, zero_end = _span(zero)
+    separate = (zero_end > zero_start) & (zero_end < off)
+    unchanged += np.where(
+        separate,
+        rectangle(zero_start, zero_end, off, size)
+        + rectangle(off, size, zero_start, zero_end),
+        0,
+    )
+
+    # Levels above 0 also form a single range of lux values.
+    on = level > 0
+    on_start, on_end = _span(on)
+    toggles = (
+        rectangle(on_start, on_end, 0, size)
+        + rectangle(0, size, on_start, on_end)
+        - 2 * rectangle(on_start, on_end, on_start, on_end)
+    )
+
+    # Entering idle writes 0, leaving it writes the level for the lux value.
+    idle_edges = transitions.to_idle + transitions.from_idle
+    writes = transitions.total - unchanged + (level != 0) @ idle_edges
+    toggles += on @ idle_edges
+
+    valid = (level >= 0) & (level <= maximum)
+    offsets = np.arange(candidates)[:, None] * (maximum + 1)
+    time_at_level = np.bincount(
+        (np.where(valid, level, 0) + offsets).ravel(),
+        weights=np.where(valid, transitions.active_time, 0).ravel(),
+        minlength=candidates * (maximum + 1),
+    ).reshape(candidates, maximum + 1)
+    time_at_level[:, 0] += transitions.idle_time
+    return {
+        "writes": writes,
+        "toggles": toggles,
+        "time_at_level": time_at_level,
+        "rejected_time": np.where(valid, 0, transitions.active_time).sum(axis=1),
+    }
+
+
+def sweep(
+    grid: dict[str, np.ndarray],
+    lux: np.ndarray,
+    activity: np.ndarray,
+    maximum: int,
+    levels: int | None = None,
+    chunk_cells: int = DEFAULT_CHUNK_CELLS,
+) -> dict[str, np.ndarray]:
+    """Evaluate every candidate in `grid` against the recording.
+
+    Lux values are truncated to integers, like the light sensor plugins do.
+    `levels` is the number of device levels including off, as in
+    KeyboardBacklightCapabilities. Candidates are processed in chunks of at
+    most `chunk_cells` array cells.
+    """
+    lux = np.column_stack([lux[:, 0], np.trunc(lux[:, 1])])
+    lux_values, lux_index = np.unique(lux[:, 1], return_inverse=True)
+    size = grid[CONF_IDLE_DELAY].size
+    results = {
+        "writes": np.zeros(size, dtype=np.int64),
+        "toggles": np.zeros(size, dtype=np.int64),
+        "time_at_level": np.zeros((size, maximum + 1)),
+        "rejected_time": np.zeros(size),
+    }
+    # The largest arrays in evaluate() hold one cell per lux value, plus the
+    # time at every level.
+    chunk_size = max(1, chunk_cells // (lux_values.size + maximum + 1))
+
+    for idle_delay in np.unique(grid[CONF_IDLE_DELAY]):
+        keys, durations = segment(lux, lux_index, activity, idle_delay)
+        transitions = Transitions(keys, durations, lux_values.size)
+        rows = np.flatnonzero(grid[CONF_IDLE_DELAY] == idle_delay)
+        for start in range(0, rows.size, chunk_size):
+            chunk_rows = rows[start : start + chunk_size]
+            chunk = {name: values[chunk_rows] for name, values in grid.items()}
+            chunk_results = evaluate(chunk, lux_values, transitions, maximum, levels)
+            for key, value in chunk_results.items():
+                results[key][chunk_rows] = value
+    return results
+
+
+def _span(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the first and one past the last True column of every row.
+
+    Rows without any True column get an empty span.
+    """
+    size = mask.shape[1]
+    found = mask.any(axis=1)
+    start = np.where(found, mask.argmax(axis=1), 0)
+    end = np.where(found, size - mask[:, ::-1].argmax(axis=1), 0)
+    return start, end
+
+
+def write_report(
+    grid: dict[str, np.ndarray],
+    results: dict[str, np.ndarray],
+    out=sys.stdout,
+) -> None:
+    levels = results["time_at_level"].shape[1]
+    header = [
+        *grid,
+        "writes",
+        "toggles",
+        "seconds_rejected",
+        *(f"seconds_at_{i}" for i in range(levels)),
+    ]
+    print(",".join(header), file=out)
+    for i in range(results["writes"].size):
+        row = [f"{grid[name][i]:g}" for name in grid]
+        row += [str(results["writes"][i]), str(results["toggles"][i])]
+        row += [f"{results['rejected_time'][i]:g}"]
+        row += [f"{seconds:g}" for seconds in results["time_at_level"][i]]
+        print(",".join(row), file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("lux", help="CSV file with timestamp,lux rows")
+    parser.add_argument("activity", help="file with one activity timestamp per line")
+    parser.add_argument(
+        "--maximum", type=int, required=True, help="maximum keyboard brightness"
+    )
+    parser.add_argument(
+        "--levels",
+        type=int,
+        help="number of device brightness levels including off, if quantized",
+    )
+    for name, default in PARAMETERS.items():
+        parser.add_argument(
+            f"--{name}",
+            default=str(default),
+            help=f"values as a,b,c or start:stop:step (default: {default})",
+        )
+    args = parser.parse_args()
+
+    lux = np.loadtxt(args.lux, delimiter=",", comments="#", ndmin=2)
+    activity = np.sort(np.loadtxt(args.activity, comments="#", ndmin=1))
+    lux = lux[np.argsort(lux[:, 0])]
+    grid = build_grid({name: parse_values(getattr(args, name)) for name in PARAMETERS})
+    write_report(grid, sweep(grid, lux, activity, args.maximum, args.levels))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from enum import StrEnum
 
+# Config key selecting the plugin of a config section.
+CONF_TYPE = "type"
+
 
 class ActivityMonitorBackend(StrEnum):
+    EVDEV = "evdev"
     GNOME_DBUS = "gnome_dbus"
     WLROOTS = "wlroots"
     XLIB_XINPUT = "xlib_xinput"
@@ -13,18 +19,54 @@ class ConfigError(RuntimeError):
     """Raised when invalid config is encountered."""
 
 
+class DisplayBacklightBackend(StrEnum):
+    NONE = "none"
+    SYSFS = "sysfs"
+    XRANDR = "xrandr"
+
+
+class EventBusOverflowPolicy(StrEnum):
+    COALESCE = "coalesce"
+    DROP_OLDEST = "drop_oldest"
+
+
 class KeyboardBacklightBackend(StrEnum):
     DBUS_GNOME = "dbus_gnome"
     DBUS_UPOWER = "dbus_upower"
     XBACKLIGHT = "xbacklight"
 
 
+@dataclass(frozen=True, kw_only=True)
+class KeyboardBacklightCapabilities:
+    # Number of distinct levels including off, or None if every value from 0 to
+    # maximum is a distinct level.
+    levels: int | None = None
+    # Minimum time in seconds between two writes.
+    min_write_interval: float = 0.0
+    # Rough time in seconds one write takes to settle, e.g. a fade done by the
+    # backend. Writes are never spaced closer than this.
+    write_cost: float = 0.0
+
+
 class KeyboardBacklightOperatingMode(StrEnum):
     ACTIVE_OFF = "active_off"
     ACTIVE_ON = "active_on"
     IDLE_OFF = "idle_off"
 
 
+class LightControlHubEvent(StrEnum):
+    IDLE = "idle"
+    LIGHT = "light"
+    WAKE = "wake"
+
+
+class LightControlHubState(StrEnum):
+    ACTIVE_OFF = "active_off"
+    ACTIVE_ON = "active_on"
+    IDLE_OFF = "idle_off"
+    SUSPENDED = "suspended"
+
+
 class LightSensorBackend(StrEnum):
     DBUS_SENSORPROXY = "dbus_sensorproxy"
     NONE = "none"
@@ -33,6 +75,7 @@ class LightSensorBackend(StrEnum):
 @dataclass(kw_only=True)
 class LightControlHubActivityUpdate:
     is_idle: bool
+    light_sensor_update: LightControlHubLightSensorUpdate | None = None
 
 
 @dataclass(kw_only=True)
@@ -0,0 +1,58 @@
+"""Activity monitor child process with a fake plugin, for the supervisor tests.
+
+Run in place of backlight_control.activity_process. The fake monitor appends
+every call it gets to the file named by the "log" config option.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import types
+
+from backlight_control import activity_process
+from backlight_control.activity_monitor import ActivityMonitor
+
+
+class ChildActivityMonitor(ActivityMonitor):
+    def __init__(self, hub, config: dict) -> None:
+        self._hub = hub
+        self._config = config
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    def _log(self, call: str) -> None:
+        with open(self._config["log"], "a", encoding="ascii") as f:
+            f.write(f"{call}\n")
+
+    async def start(self) -> None:
+        self._log("start")
+        if self._config.get("fail"):
+            raise OSError("no display")
+        if crash_after := self._config.get("crash_after"):
+            asyncio.get_running_loop().call_later(crash_after, os._exit, 1)
+        if self._config.get("idle"):
+            await self.trigger_idle()
+
+    async def pause(self) -> None:
+        self._log("pause")
+
+    async def resume(self) -> None:
+        self._log("resume")
+
+    def reset_idle(self) -> None:
+        super().reset_idle()
+        self._log("reset")
+
+    def stop(self) -> None:
+        self._log("stop")
+
+
+if __name__ == "__main__":
+    module = types.ModuleType("wlroots")
+    module.get_plugin = ChildActivityMonitor
+    sys.modules["backlight_control.plugins.activity_monitor.wlroots"] = module
+    activity_process.main()
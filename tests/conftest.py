@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from backlight_control.activity_monitor import ActivityMonitor
+from backlight_control.hub import LightControlHub
+from backlight_control.keyboard_backlight import (
+    CONF_KEYBOARD_MIN_BRIGHTNESS,
+    CONF_LUX_FOR_KEYBOARD_OFF,
+    CONF_LUX_FOR_MAX_BRIGHTNESS,
+    CONF_LUX_FOR_MIN_BRIGHTNESS,
+    KeyboardBacklight,
+)
+from backlight_control.light_sensor import LightSensor
+from backlight_control.types import (
+    KeyboardBacklightCapabilities,
+    LightControlHubLightSensorUpdate,
+)
+
+
+class FakeKeyboardBacklight(KeyboardBacklight):
+    """Keyboard backlight that records every value written."""
+
+    def __init__(self, hub, config: dict) -> None:
+        self._hub = hub
+        self._config = config
+        self._maximum: int = config.get("maximum", 100)
+        self._levels: int | None = config.get("levels")
+        self.current = 0
+        self.writes: list[int] = []
+
+    @property
+    def capabilities(self) -> KeyboardBacklightCapabilities:
+        return KeyboardBacklightCapabilities(
+            levels=self._levels,
+            min_write_interval=self._config.get("min_write_interval", 0.0),
+            write_cost=self._config.get("write_cost", 0.0),
+        )
+
+    async def get_current(self) -> int:
+        return self.current
+
+    @property
+    def maximum(self) -> int:
+        return self._maximum
+
+    async def set_absolute(self, value: int) -> None:
+        self.writes.append(value)
+        if 0 <= value <= self._maximum:
+            self.current = value
+
+    async def start(self) -> None:
+        pass
+
+
+class FakeLightSensor(LightSensor):
+    """Light sensor that returns `reading` on resume and counts the calls."""
+
+    def __init__(self, hub, config: dict) -> None:
+        self.hub = hub
+        self.reading: LightControlHubLightSensorUpdate | None = None
+        self.pauses = 0
+        self.resumes = 0
+
+    async def start(self) -> None:
+        pass
+
+    async def pause(self) -> None:
+        self.pauses += 1
+
+    async def resume(self) -> LightControlHubLightSensorUpdate | None:
+        self.resumes += 1
+        return self.reading
+
+
+class FakeActivityMonitor(ActivityMonitor):
+    def __init__(self, hub, config: dict) -> None:
+        self._hub = hub
+        self._config = config
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    async def start(self) -> None:
+        pass
+
+
+FAKE_PLUGINS = {
+    "activity_monitor": FakeActivityMonitor,
+    "keyboard_backlight": FakeKeyboardBacklight,
+    "light_sensor": FakeLightSensor,
+}
+
+
+def keyboard_config(
+    lux_min: float = 10,
+    lux_max: float = 300,
+    lux_off: float = 400,
+    kb_min: float = 10,
+    **extra,
+) -> dict:
+    return {
+        CONF_LUX_FOR_MIN_BRIGHTNESS: lux_min,
+        CONF_LUX_FOR_MAX_BRIGHTNESS: lux_max,
+        CONF_LUX_FOR_KEYBOARD_OFF: lux_off,
+        CONF_KEYBOARD_MIN_BRIGHTNESS: kb_min,
+        **extra,
+    }
+
+
+def lux(value: int) -> LightControlHubLightSensorUpdate:
+    return LightControlHubLightSensorUpdate(unit="lux", value=value)
+
+
+async def settle() -> None:
+    """Let the event bus deliver everything published so far."""
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def fake_plugins(monkeypatch):
+    """Make the fake plugins available under real plugin names."""
+    for category, name in (
+        ("activity_monitor", "wlroots"),
+        ("keyboard_backlight", "xbacklight"),
+        ("light_sensor", "dbus_sensorproxy"),
+    ):
+        module = types.ModuleType(name)
+        module.get_plugin = FAKE_PLUGINS[category]
+        monkeypatch.setitem(
+            sys.modules, f"backlight_control.plugins.{category}.{name}", module
+        )
+
+
+@pytest.fixture
+def hub_config(tmp_path) -> dict:
+    return {
+        "activity_monitor": {"type": "wlroots"},
+        "keyboard_backlight": {"type": "xbacklight", **keyboard_config()},
+        "light_sensor": {"type": "dbus_sensorproxy"},
+        "logind": False,
+        "state_file": str(tmp_path / "state.json"),
+        "status_page": False,
+    }
+
+
+@pytest.fixture
+async def make_hub(fake_plugins):
+    """Return a factory for started hubs with fake plugins."""
+    started: list[tuple[LightControlHub, asyncio.Task]] = []
+
+    async def make(config: dict) -> LightControlHub:
+        hub = LightControlHub(config)
+        task = asyncio.create_task(hub.start())
+        started.append((hub, task))
+        await hub._outputs_ready.wait()
+        await settle()
+        return hub
+
+    yield make
+    for hub, task in started:
+        hub.stop()
+        await task
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backlight_control.activity_process import ProcessActivityMonitor
+from backlight_control.types import ActivityMonitorBackend
+
+
+class Hub:
+    def __init__(self) -> None:
+        self.updates: list[bool] = []
+
+    async def activity_update(self, update) -> None:
+        self.updates.append(update.is_idle)
+
+
+async def wait_for(predicate, timeout: float = 5) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def log(tmp_path):
+    path = tmp_path / "calls"
+    path.touch()
+    return path
+
+
+def calls(log) -> list[str]:
+    return log.read_text().split()
+
+
+@pytest.fixture
+async def make_monitor(log, monkeypatch):
+    monkeypatch.setattr(
+        ProcessActivityMonitor, "_worker_module", "tests.activity_child"
+    )
+    monitors = []
+
+    async def make(**config) -> tuple[Hub, ProcessActivityMonitor]:
+        hub = Hub()
+        monitor = ProcessActivityMonitor(
+            hub,
+            {"log": str(log), "restart_delay": 0.01, **config},
+            ActivityMonitorBackend.WLROOTS,
+        )
+        monitors.append(monitor)
+        await monitor.start()
+        return hub, monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.stop()
+        if monitor._process is not None:
+            await monitor._process.wait()
+
+
+async def test_start_waits_for_the_child_monitor(log, make_monitor):
+    hub, monitor = await make_monitor(idle=True)
+    assert calls(log) == ["start"]
+    assert hub.updates == [True]
+
+
+async def test_start_fails_with_the_child_monitor(log, make_monitor):
+    with pytest.raises(RuntimeError):
+        await make_monitor(fail=True)
+    assert calls(log)[:2] == ["start", "stop"]
+
+
+async def test_reset_idle_is_forwarded(log, make_monitor):
+    hub, monitor = await make_monitor(idle=True)
+    monitor.reset_idle()
+    await wait_for(lambda: "reset" in calls(log))
+    assert not monitor._is_idle
+
+
+async def test_pause_and_resume_are_forwarded(log, make_monitor):
+    hub, monitor = await make_monitor()
+    await monitor.pause()
+    await monitor.resume()
+    await wait_for(lambda: len(calls(log)) == 3)
+    assert calls(log) == ["start", "pause", "resume"]
+
+
+async def test_crashed_child_is_restarted_in_the_same_state(log, make_monitor):
+    hub, monitor = await make_monitor(idle=True, crash_after=0.1)
+    await monitor.pause()
+    await wait_for(lambda: calls(log).count("start") == 2)
+    await wait_for(lambda: len(hub.updates) == 3)
+    # The new child starts out active, then reports idle again.
+    assert hub.updates == [True, False, True]
+    # It is paused like the one it replaces.
+    await wait_for(lambda: calls(log)[-1] == "pause")
+    assert calls(log)[:4] == ["start", "pause", "start", "pause"]
+
+
+async def test_stop_ends_the_child_for_good(log, make_monitor):
+    hub, monitor = await make_monitor()
+    process = monitor._process
+    monitor.stop()
+    await asyncio.wait_for(process.wait(), 5)
+    await asyncio.sleep(0.1)
+    assert monitor._process is process
+    assert calls(log).count("start") == 1
+    assert monitor._supervisor.done()
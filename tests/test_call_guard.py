@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backlight_control import call_guard
+from backlight_control.call_guard import (
+    BackendTimeoutError,
+    BackendUnavailableError,
+    CallGuard,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [0.0]
+    monkeypatch.setattr(call_guard.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_guard(**config) -> CallGuard:
+    return CallGuard(
+        "test",
+        {
+            "deadlines": {"default": 0.05, "slow_op": 0.2},
+            "breaker_failures": 2,
+            "breaker_reset": 10,
+            **config,
+        },
+    )
+
+
+async def ok(value: int = 1) -> int:
+    return value
+
+
+async def hang() -> None:
+    await asyncio.sleep(1)
+
+
+async def fail() -> None:
+    raise OSError("broken")
+
+
+async def test_result_and_stats():
+    guard = make_guard()
+    assert await guard.call("read", ok(5)) == 5
+    assert guard.stats["read"].calls == 1
+    assert guard.deadline("read") == 0.05
+    assert guard.deadline("slow_op") == 0.2
+
+
+async def test_timeout():
+    guard = make_guard()
+    with pytest.raises(BackendTimeoutError):
+        await guard.call("read", hang())
+    assert guard.stats["read"].timeouts == 1
+    assert not guard.is_open
+
+
+async def test_errors_propagate_and_count():
+    guard = make_guard()
+    with pytest.raises(OSError):
+        await guard.call("write", fail())
+    assert guard.stats["write"].failures == 1
+
+
+async def test_breaker_opens_and_rejects(clock):
+    guard = make_guard()
+    for _ in range(2):
+        with pytest.raises(OSError):
+            await guard.call("write", fail())
+    assert guard.is_open
+    coroutine = ok()
+    with pytest.raises(BackendUnavailableError):
+        await guard.call("write", coroutine)
+    # The rejected coroutine was closed rather than left unawaited.
+    assert coroutine.cr_frame is None
+    assert guard.stats["write"].rejected == 1
+
+
+async def test_breaker_trial_call(clock):
+    guard = make_guard()
+    for _ in range(2):
+        with pytest.raises(OSError):
+            await guard.call("write", fail())
+    clock[0] = 10
+    # A failing trial call opens the breaker again right away.
+    with pytest.raises(OSError):
+        await guard.call("write", fail())
+    assert guard.is_open
+    clock[0] = 20
+    assert await guard.call("write", ok()) == 1
+    assert not guard.is_open
+    # A single failure after recovery does not open it.
+    with pytest.raises(OSError):
+        await guard.call("write", fail())
+    assert not guard.is_open
+
+
+async def test_success_resets_failure_count():
+    guard = make_guard()
+    with pytest.raises(OSError):
+        await guard.call("write", fail())
+    await guard.call("write", ok())
+    with pytest.raises(OSError):
+        await guard.call("write", fail())
+    assert not guard.is_open
+
+
+async def test_try_call_returns_default():
+    guard = make_guard()
+    assert await guard.try_call("read", hang(), default=-1) == -1
+    assert await guard.try_call("read", ok(3), default=-1) == 3
+
+
+async def test_slow_calls_are_counted():
+    guard = make_guard(slow_call=0)
+
+    async def sleep() -> None:
+        await asyncio.sleep(0.01)
+
+    await guard.call("read", sleep())
+    assert guard.stats["read"].slow == 1
+    assert guard.stats["read"].slowest >= 0.01
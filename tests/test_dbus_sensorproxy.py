@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+
+from dbus_fast import Variant
+
+from backlight_control.plugins.light_sensor.dbus_sensorproxy import (
+    DBusSensorProxyLightSensor,
+)
+
+from .conftest import settle
+
+
+class Hub:
+    def __init__(self) -> None:
+        self.updates: list[float] = []
+
+    async def light_sensor_update(self, update) -> None:
+        self.updates.append(update.value)
+
+
+async def test_signals_are_counted_by_drop_reason():
+    hub = Hub()
+    sensor = DBusSensorProxyLightSensor(hub)
+    sensor._loop = asyncio.get_running_loop()
+    sensor.set_report_band(100, 200)
+    for changed in (
+        {"LightLevel": Variant("d", 150.0)},
+        {"AccelerometerOrientation": Variant("s", "normal")},
+        {"ProximityNear": Variant("b", True)},
+        {"LightLevel": Variant("d", 250.0)},
+    ):
+        sensor._properties_changed(changed, [])
+    await settle()
+    assert hub.updates == [250]
+    assert sensor._signals == 4
+    assert sensor._signals_in_band == 1
+    assert sensor._signals_without_light == 2
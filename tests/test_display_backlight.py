@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+import types
+
+import pytest
+
+from backlight_control.display_backlight import get_display_backlight_plugin_from_config
+from backlight_control.keyboard_backlight import (
+    get_keyboard_backlight_plugin_from_config,
+)
+from backlight_control.types import ConfigError
+
+pytest.importorskip("Xlib")
+
+from backlight_control.plugins.display_backlight import xrandr  # noqa: E402
+
+
+class FakeDisplay:
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def make_hub():
+    return types.SimpleNamespace()
+
+
+def test_xrandr_is_a_display_backlight():
+    backlight = get_display_backlight_plugin_from_config(
+        make_hub(), {"display_backlight": {"type": "xrandr"}}
+    )
+    assert isinstance(backlight, xrandr.XRandRDisplayBacklight)
+    assert backlight.target_for_lux(1000) == backlight.maximum
+    with pytest.raises(ConfigError):
+        get_keyboard_backlight_plugin_from_config(
+            make_hub(), {"keyboard_backlight": {"type": "xrandr"}}
+        )
+
+
+async def test_xrandr_opens_and_closes_its_own_display(monkeypatch):
+    display = FakeDisplay()
+    opened_in = []
+
+    def open_display():
+        opened_in.append(threading.current_thread())
+        return display
+
+    monkeypatch.setattr(xrandr, "Display", open_display)
+    monkeypatch.setattr(
+        xrandr.XRandRDisplayBacklight, "_find_output", lambda self, display: None
+    )
+    backlight = xrandr.get_plugin(make_hub(), {})
+    await backlight.start()
+    assert opened_in != [threading.main_thread()]
+    backlight.stop()
+    assert display.closed
+    # Safe to call again, e.g. after a failed start.
+    backlight.stop()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+import pytest
+
+from backlight_control.plugins.activity_monitor import evdev
+
+
+class Hub:
+    def __init__(self) -> None:
+        self.updates: list[bool] = []
+
+    async def activity_update(self, update) -> None:
+        self.updates.append(update.is_idle)
+
+
+class InputDir:
+    """Directory of FIFOs standing in for /dev/input/event*."""
+
+    def __init__(self, path) -> None:
+        self.path = path
+        self.writers: dict[str, int] = {}
+
+    def add(self, name: str) -> None:
+        path = os.path.join(self.path, name)
+        os.mkfifo(path)
+        # Opening for reading first keeps the write end from blocking.
+        reader = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        self.writers[name] = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        os.close(reader)
+
+    def send(self, name: str) -> None:
+        os.write(self.writers[name], b"\0" * 24)
+
+    def unplug(self, name: str) -> None:
+        os.close(self.writers.pop(name))
+        os.unlink(os.path.join(self.path, name))
+
+    def close(self) -> None:
+        for fd in self.writers.values():
+            os.close(fd)
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    path = tmp_path / "input"
+    path.mkdir()
+    directory = InputDir(str(path))
+    yield directory
+    directory.close()
+
+
+@pytest.fixture
+def sysfs_input(tmp_path, monkeypatch):
+    """Empty stand-in for /sys/class/input, so no real device is consulted."""
+    path = tmp_path / "sysfs"
+    path.mkdir()
+    monkeypatch.setattr(evdev, "SYSFS_INPUT", str(path))
+    return path
+
+
+def set_capabilities(sysfs_input, name: str, ev: str) -> None:
+    path = sysfs_input / name / "device" / "capabilities"
+    path.mkdir(parents=True)
+    (path / "ev").write_text(f"{ev}\n")
+
+
+@pytest.fixture
+async def make_monitor(input_dir, sysfs_input):
+    monitors = []
+
+    async def make(idle_delay: float = 0.1, rescan_interval: float = 0.05):
+        hub = Hub()
+        monitor = evdev.get_plugin(
+            hub,
+            {
+                "idle_delay": idle_delay,
+                "input_dir": input_dir.path,
+                "rescan_interval": rescan_interval,
+            },
+        )
+        await monitor.start()
+        monitors.append(monitor)
+        return hub, monitor
+
+    yield make
+    for monitor in monitors:
+        monitor.stop()
+
+
+async def test_idle_and_activity(input_dir, make_monitor):
+    input_dir.add("event0")
+    hub, monitor = await make_monitor()
+    await asyncio.sleep(0.15)
+    assert hub.updates == [True]
+    input_dir.send("event0")
+    await asyncio.sleep(0.01)
+    assert hub.updates == [True, False]
+
+
+async def test_pause_stops_rescan_and_resume_restarts_it(input_dir, make_monitor):
+    hub, monitor = await make_monitor(idle_delay=10)
+    await monitor.pause()
+    assert monitor._rescan is None
+    input_dir.add("event1")
+    await asyncio.sleep(0.1)
+    assert not monitor._devices
+    await monitor.resume()
+    assert list(monitor._devices) == [os.path.join(input_dir.path, "event1")]
+    assert monitor._rescan is not None
+    input_dir.add("event2")
+    await asyncio.sleep(0.1)
+    assert len(monitor._devices) == 2
+
+
+async def test_paused_monitor_ignores_input(input_dir, make_monitor):
+    input_dir.add("event0")
+    hub, monitor = await make_monitor(idle_delay=0.05)
+    await monitor.pause()
+    input_dir.send("event0")
+    await asyncio.sleep(0.1)
+    assert hub.updates == []
+
+
+async def test_input_before_unplug_counts_as_activity(input_dir, make_monitor):
+    input_dir.add("event0")
+    hub, monitor = await make_monitor()
+    await asyncio.sleep(0.15)
+    assert hub.updates == [True]
+    # The events and the end of file arrive in the same read callback.
+    input_dir.send("event0")
+    input_dir.unplug("event0")
+    await asyncio.sleep(0.01)
+    assert hub.updates == [True, False]
+    assert not monitor._devices
+
+
+async def test_rescan_picks_up_new_devices(input_dir, make_monitor):
+    hub, monitor = await make_monitor(idle_delay=0.1)
+    await asyncio.sleep(0.15)
+    assert hub.updates == [True]
+    input_dir.add("event3")
+    await asyncio.sleep(0.1)
+    input_dir.send("event3")
+    await asyncio.sleep(0.01)
+    assert hub.updates == [True, False]
+
+
+async def test_devices_without_user_input_are_skipped(
+    input_dir, sysfs_input, make_monitor
+):
+    # A lid switch reports EV_SYN and EV_SW only; a keyboard has EV_KEY.
+    set_capabilities(sysfs_input, "event0", "21")
+    set_capabilities(sysfs_input, "event1", "120013")
+    input_dir.add("event0")
+    input_dir.add("event1")
+    hub, monitor = await make_monitor(idle_delay=10)
+    assert list(monitor._devices) == [os.path.join(input_dir.path, "event1")]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+
+from backlight_control.event_bus import EventBus, Topic
+from backlight_control.types import EventBusOverflowPolicy
+
+from .conftest import settle
+
+TOPIC = Topic("test", int)
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.received: list[int] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, payload: int) -> None:
+        await self.release.wait()
+        self.received.append(payload)
+
+
+async def test_drop_oldest_keeps_newest():
+    bus = EventBus()
+    recorder = Recorder()
+    subscription = bus.subscribe(
+        TOPIC, recorder, queue_size=3, overflow=EventBusOverflowPolicy.DROP_OLDEST
+    )
+    for payload in range(5):
+        bus.publish(TOPIC, payload)
+    bus.start()
+    await settle()
+    assert recorder.received == [2, 3, 4]
+    assert subscription.dropped == 2
+    bus.stop()
+
+
+async def test_coalesce_keeps_latest():
+    bus = EventBus()
+    recorder = Recorder()
+    subscription = bus.subscribe(
+        TOPIC, recorder, queue_size=16, overflow=EventBusOverflowPolicy.COALESCE
+    )
+    for payload in range(5):
+        bus.publish(TOPIC, payload)
+    bus.start()
+    await settle()
+    assert recorder.received == [4]
+    assert subscription.dropped == 4
+    bus.stop()
+
+
+async def test_slow_subscriber_only_delays_itself():
+    bus = EventBus()
+    slow = Recorder()
+    slow.release.clear()
+    fast = Recorder()
+    bus.subscribe(TOPIC, slow, queue_size=2)
+    bus.subscribe(TOPIC, fast, queue_size=2)
+    bus.start()
+    for payload in range(4):
+        bus.publish(TOPIC, payload)
+        await settle()
+    assert fast.received == [0, 1, 2, 3]
+    assert slow.received == []
+    slow.release.set()
+    await settle()
+    # The first payload was taken before it blocked; the rest overflowed.
+    assert slow.received == [0, 2, 3]
+    bus.stop()
+
+
+async def test_failing_handler_keeps_consuming():
+    bus = EventBus()
+    received = []
+
+    async def handler(payload: int) -> None:
+        if payload == 0:
+            raise RuntimeError("boom")
+        received.append(payload)
+
+    bus.subscribe(TOPIC, handler)
+    bus.start()
+    bus.publish(TOPIC, 0)
+    bus.publish(TOPIC, 1)
+    await settle()
+    assert received == [1]
+    bus.stop()
+
+
+async def test_unsubscribe_stops_delivery():
+    bus = EventBus()
+    recorder = Recorder()
+    bus.start()
+    subscription = bus.subscribe(TOPIC, recorder)
+    bus.publish(TOPIC, 1)
+    await settle()
+    bus.unsubscribe(subscription)
+    bus.publish(TOPIC, 2)
+    await settle()
+    assert recorder.received == [1]
+    bus.stop()
@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import time
+
+from backlight_control.logind import LogindMonitor
+from backlight_control.status_page import read_status
+from backlight_control.types import LightControlHubState
+
+from .conftest import FakeActivityMonitor, FakeLightSensor, lux, settle
+
+
+def write_state(hub_config: dict, age: float, **snapshot) -> None:
+    with open(hub_config["state_file"], "w", encoding="utf-8") as f:
+        json.dump({**snapshot, "timestamp": time.time() - age}, f)
+
+
+async def test_warm_start_applies_recent_snapshot(make_hub, hub_config):
+    write_state(hub_config, 10, lux=100, lux_unit="lux", stored=42)
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    assert keyboard.stored == 42
+    assert keyboard.writes == [keyboard.target_for_lux(100)]
+    assert hub.time_to_first_adjustment is not None
+
+
+async def test_warm_start_snapshot_is_published(make_hub, hub_config, tmp_path):
+    write_state(hub_config, 10, lux=100, lux_unit="lux", stored=42)
+    hub_config["status_page"] = str(tmp_path / "status")
+    hub = await make_hub(hub_config)
+    status = read_status(hub_config["status_page"])
+    target = hub._keyboard_backlight.target_for_lux(100)
+    assert (status.lux, status.target, status.written) == (100, target, target)
+    assert status.state == LightControlHubState.ACTIVE_ON
+
+
+async def test_device_change_is_published(make_hub, hub_config, tmp_path):
+    hub_config["status_page"] = str(tmp_path / "status")
+    hub = await make_hub(hub_config)
+    await hub.light_sensor_update(lux(100))
+    await settle()
+    # E.g. the firmware turned the backlight off on a hotkey.
+    hub._keyboard_backlight.device_changed(0)
+    assert read_status(hub_config["status_page"]).written == 0
+
+
+async def test_warm_start_skips_stale_snapshot(make_hub, hub_config):
+    write_state(hub_config, 3600, lux=100, lux_unit="lux", stored=42)
+    hub = await make_hub(hub_config)
+    assert hub._keyboard_backlight.stored == 42
+    assert hub._keyboard_backlight.writes == []
+
+
+async def test_live_reading_wins_over_snapshot(make_hub, hub_config, monkeypatch):
+    write_state(hub_config, 10, lux=100, lux_unit="lux")
+
+    async def start_with_reading(self):
+        await self.hub.light_sensor_update(lux(350))
+
+    monkeypatch.setattr(FakeLightSensor, "start", start_with_reading)
+    hub = await make_hub(hub_config)
+    await settle()
+    keyboard = hub._keyboard_backlight
+    assert keyboard.writes[-1] == keyboard.target_for_lux(350)
+    assert keyboard.target_for_lux(100) not in keyboard.writes
+    assert hub.state == LightControlHubState.ACTIVE_ON
+
+
+async def test_stop_refreshes_snapshot(make_hub, hub_config):
+    write_state(hub_config, 3600, lux=100, lux_unit="lux")
+    hub = await make_hub(hub_config)
+    await hub.light_sensor_update(lux(200))
+    await settle()
+    hub.stop()
+    with open(hub_config["state_file"], encoding="utf-8") as f:
+        state = json.load(f)
+    assert state["lux"] == 200
+    assert time.time() - state["timestamp"] < 5
+
+
+async def test_resume_rewrites_backlight(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    hub._light_sensor.reading = lux(100)
+    await hub.light_sensor_update(lux(100))
+    await settle()
+    await hub.suspend()
+    # The firmware may have reset the backlight in suspend without notice.
+    keyboard.current = 0
+    await hub.resume()
+    target = keyboard.target_for_lux(100)
+    assert keyboard.writes == [target, target]
+    assert hub.state == LightControlHubState.ACTIVE_ON
+
+
+async def test_idle_is_reported_again_after_resume(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    monitor = hub._activity_monitor
+    await hub.light_sensor_update(lux(100))
+    await monitor.trigger_idle()
+    await settle()
+    assert hub.state == LightControlHubState.IDLE_OFF
+    await hub.suspend()
+    await hub.resume()
+    assert hub.state == LightControlHubState.ACTIVE_ON
+    await monitor.trigger_idle()
+    await settle()
+    assert hub.state == LightControlHubState.IDLE_OFF
+
+
+async def test_one_source_idle_after_resume_is_not_idle(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    monitor = hub._activity_monitor
+    await hub.light_sensor_update(lux(100))
+    await monitor.trigger_idle("seat0")
+    await monitor.trigger_idle("seat1")
+    await settle()
+    assert hub.state == LightControlHubState.IDLE_OFF
+    await hub.suspend()
+    await hub.resume()
+    # seat1 counts as active again until it says otherwise.
+    await monitor.trigger_idle("seat0")
+    await settle()
+    assert hub.state == LightControlHubState.ACTIVE_ON
+    await monitor.trigger_idle("seat1")
+    await settle()
+    assert hub.state == LightControlHubState.IDLE_OFF
+
+
+async def test_failed_start_is_cleaned_up_before_retry(
+    make_hub, hub_config, monkeypatch
+):
+    calls = []
+
+    async def flaky_start(self):
+        calls.append("start")
+        if calls.count("start") == 1:
+            raise OSError("not yet")
+        await self.hub.light_sensor_update(lux(100))
+
+    monkeypatch.setattr(FakeLightSensor, "start", flaky_start)
+    monkeypatch.setattr(FakeLightSensor, "stop", lambda self: calls.append("stop"))
+    hub_config["startup"] = {"output": {"retry_delay": 0}}
+    hub = await make_hub(hub_config)
+    await settle()
+    assert calls == ["start", "stop", "start"]
+    assert isinstance(hub._light_sensor, FakeLightSensor)
+
+
+async def test_logind_starts_after_activity_monitor(make_hub, hub_config, monkeypatch):
+    calls = []
+
+    async def slow_start(self):
+        calls.append("activity monitor started")
+        await asyncio.sleep(0.01)
+        calls.append("activity monitor ready")
+
+    async def start_logind(self):
+        calls.append("logind")
+
+    monkeypatch.setattr(FakeActivityMonitor, "start", slow_start)
+    monkeypatch.setattr(LogindMonitor, "start", start_logind)
+    hub_config["logind"] = True
+    await make_hub(hub_config)
+    await asyncio.sleep(0.05)
+    assert calls == [
+        "activity monitor started",
+        "activity monitor ready",
+        "logind",
+    ]
+
+
+async def test_wake_with_failing_sensor_restores_stored(
+    make_hub, hub_config, monkeypatch
+):
+    hub_config["light_sensor"]["release_delay"] = 0
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    await hub.light_sensor_update(lux(100))
+    await hub._activity_monitor.trigger_idle()
+    await settle()
+    assert hub.state == LightControlHubState.IDLE_OFF
+
+    async def broken_resume(self):
+        raise OSError("sensor proxy went away")
+
+    monkeypatch.setattr(FakeLightSensor, "resume", broken_resume)
+    await hub._activity_monitor.end_idle()
+    await settle()
+    target = keyboard.target_for_lux(100)
+    assert keyboard.writes == [target, 0, target]
+    assert hub.state == LightControlHubState.ACTIVE_ON
+    assert not hub._sensor_claimed
+
+
+async def test_band_is_pushed_to_the_sensor(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    sensor = hub._light_sensor
+    await hub.light_sensor_update(lux(100))
+    await settle()
+    low, high = keyboard.lux_band(100)
+    assert sensor._report_band == (low, high)
+    assert sensor.in_report_band(low)
+    assert not sensor.in_report_band(high)
+    # A reading at the upper edge leaves the band and is applied.
+    await hub.light_sensor_update(lux(high))
+    await settle()
+    assert keyboard.writes[-1] == keyboard.target_for_lux(high)
+    assert sensor._report_band == keyboard.lux_band(high)
+
+
+async def test_band_stays_open_while_the_backlight_is_off(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    await hub.light_sensor_update(lux(1000))
+    await settle()
+    assert hub.state == LightControlHubState.ACTIVE_OFF
+    assert hub._light_sensor._report_band == (400, math.inf)
+    assert hub._light_sensor.in_report_band(5000)
+    assert not hub._light_sensor.in_report_band(399)
+
+
+async def test_light_while_idle_does_not_light_keyboard(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    await hub.light_sensor_update(lux(100))
+    await hub._activity_monitor.trigger_idle()
+    await settle()
+    writes = list(keyboard.writes)
+    assert writes[-1] == 0
+    await hub.light_sensor_update(lux(50))
+    await settle()
+    assert keyboard.writes == writes
+    assert hub.state == LightControlHubState.IDLE_OFF
+    # The reading is not lost: waking up applies it.
+    await hub._activity_monitor.end_idle()
+    await settle()
+    assert keyboard.writes[-1] == keyboard.target_for_lux(50)
+
+
+async def test_nothing_is_written_while_suspended(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    monitor = hub._activity_monitor
+    await hub.light_sensor_update(lux(100))
+    await settle()
+    await hub.suspend()
+    writes = list(keyboard.writes)
+    await hub.light_sensor_update(lux(50))
+    await monitor.trigger_idle()
+    await monitor.end_idle()
+    await settle()
+    assert keyboard.writes == writes
+    assert hub.state == LightControlHubState.SUSPENDED
+
+
+async def test_idle_racing_a_light_reading_leaves_keyboard_off(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    await hub.light_sensor_update(lux(100))
+    await settle()
+    # Both are queued before either handler runs.
+    await hub.light_sensor_update(lux(50))
+    await hub._activity_monitor.trigger_idle()
+    await hub.light_sensor_update(lux(20))
+    await settle()
+    assert keyboard.writes[-1] == 0
+    assert hub.state == LightControlHubState.IDLE_OFF
+
+
+async def test_wake_in_bright_light_keeps_keyboard_off(make_hub, hub_config):
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    await hub.light_sensor_update(lux(1000))
+    await settle()
+    assert hub.state == LightControlHubState.ACTIVE_OFF
+    await hub._activity_monitor.trigger_idle()
+    await settle()
+    await hub._activity_monitor.end_idle()
+    await settle()
+    assert set(keyboard.writes) == {0}
+    assert hub.state == LightControlHubState.ACTIVE_OFF
+
+
+async def test_rate_limited_write_does_not_hold_the_event_lock(
+    make_hub, hub_config, tmp_path
+):
+    hub_config["keyboard_backlight"]["min_write_interval"] = 0.05
+    hub_config["status_page"] = str(tmp_path / "status")
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    await hub.light_sensor_update(lux(100))
+    await settle()
+    await hub.light_sensor_update(lux(50))
+    await hub.light_sensor_update(lux(20))
+    await settle()
+    # The write is waiting for the interval, but the hub is free.
+    assert not hub._event_lock.locked()
+    assert keyboard.writes[-1] == keyboard.target_for_lux(100)
+    await asyncio.sleep(0.1)
+    assert keyboard.writes[-1] == keyboard.target_for_lux(20)
+    # The flush is published although no event followed it.
+    assert read_status(hub_config["status_page"]).written == keyboard.writes[-1]
+
+
+async def idle_until_released(hub) -> None:
+    sensor = hub._light_sensor
+    pauses = sensor.pauses
+    await hub._activity_monitor.trigger_idle()
+    await asyncio.sleep(0.1)
+    assert sensor.pauses == pauses + 1
+
+
+async def test_return_within_release_delay_uses_wake_reading(make_hub, hub_config):
+    hub_config["light_sensor"]["release_delay"] = 0.05
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    monitor = hub._activity_monitor
+    await hub.light_sensor_update(lux(10))
+    await settle()
+    await idle_until_released(hub)
+    # It got brighter while the sensor was released.
+    hub._light_sensor.reading = lux(290)
+    await monitor.end_idle()
+    await settle()
+    # A short idle keeps the sensor, and no new reading arrives.
+    await monitor.trigger_idle()
+    await settle()
+    await monitor.end_idle()
+    await settle()
+    dim, bright = keyboard.target_for_lux(10), keyboard.target_for_lux(290)
+    assert keyboard.writes == [dim, 0, bright, 0, bright]
+    assert hub._light_sensor.resumes == 1
+
+
+async def test_return_after_release_delay_reads_sensor_again(make_hub, hub_config):
+    hub_config["light_sensor"]["release_delay"] = 0.05
+    hub = await make_hub(hub_config)
+    keyboard = hub._keyboard_backlight
+    monitor = hub._activity_monitor
+    await hub.light_sensor_update(lux(10))
+    await settle()
+    await idle_until_released(hub)
+    hub._light_sensor.reading = lux(290)
+    await monitor.end_idle()
+    await settle()
+    await idle_until_released(hub)
+    hub._light_sensor.reading = lux(100)
+    await monitor.end_idle()
+    await settle()
+    assert keyboard.writes[-1] == keyboard.target_for_lux(100)
+    assert hub._light_sensor.resumes == 2
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import math
+
+import pytest
+
+from backlight_control.plugins.keyboard_backlight import xbacklight
+from backlight_control.plugins.keyboard_backlight.dbus_gnome import (
+    DBusGnomeKeyboardBacklight,
+)
+from backlight_control.types import LightControlHubActivityUpdate
+
+from .conftest import FakeKeyboardBacklight, keyboard_config, lux
+
+
+def make_keyboard(**extra) -> FakeKeyboardBacklight:
+    return FakeKeyboardBacklight(None, keyboard_config(**extra))
+
+
+async def test_repeated_write_is_skipped():
+    keyboard = make_keyboard()
+    await keyboard.write(40)
+    await keyboard.write(40)
+    assert keyboard.writes == [40]
+
+
+async def test_write_after_external_change():
+    keyboard = make_keyboard()
+    await keyboard.write(40)
+    # E.g. the firmware turned the backlight off on a hotkey.
+    keyboard.device_changed(0)
+    await keyboard.write(40)
+    assert keyboard.writes == [40, 40]
+
+
+async def test_no_write_if_device_already_at_level():
+    keyboard = make_keyboard()
+    await keyboard.write(40)
+    keyboard.device_changed(70)
+    await keyboard.write(70)
+    assert keyboard.writes == [40]
+
+
+async def test_device_change_is_compared_by_level():
+    keyboard = make_keyboard(levels=4)
+    await keyboard.write(67)
+    # GNOME may report a step as 66 percent.
+    keyboard.device_changed(66)
+    await keyboard.write(67)
+    assert keyboard.writes == [67]
+
+
+async def test_forget_written():
+    keyboard = make_keyboard()
+    await keyboard.write(40)
+    keyboard.forget_written()
+    await keyboard.write(40)
+    assert keyboard.writes == [40, 40]
+
+
+async def test_rate_limited_writes_are_coalesced():
+    keyboard = make_keyboard(min_write_interval=0.05)
+    await keyboard.write(40)
+    # Too soon: both return without waiting and only the latest is written.
+    await asyncio.wait_for(keyboard.write(60), 0.01)
+    await asyncio.wait_for(keyboard.write(80), 0.01)
+    assert keyboard.writes == [40]
+    await asyncio.sleep(0.1)
+    assert keyboard.writes == [40, 80]
+
+
+async def test_writes_are_spaced_by_write_cost():
+    keyboard = make_keyboard(min_write_interval=0.01, write_cost=0.05)
+    await keyboard.write(40)
+    await asyncio.sleep(0.02)
+    await keyboard.write(60)
+    assert keyboard.writes == [40]
+    await asyncio.sleep(0.05)
+    assert keyboard.writes == [40, 60]
+
+
+def test_xbacklight_rate_limits_by_default():
+    keyboard = xbacklight.get_plugin(None, {xbacklight.CONF_FADE_TIME: 0})
+    assert keyboard.capabilities.min_write_interval > 0
+
+
+async def test_coalesced_write_back_to_written_is_dropped():
+    keyboard = make_keyboard(min_write_interval=0.05)
+    await keyboard.write(40)
+    await keyboard.write(60)
+    await keyboard.write(40)
+    await asyncio.sleep(0.1)
+    assert keyboard.writes == [40]
+
+
+async def test_stop_drops_coalesced_write():
+    keyboard = make_keyboard(min_write_interval=0.05)
+    await keyboard.write(40)
+    await keyboard.write(60)
+    keyboard.stop()
+    await asyncio.sleep(0.1)
+    assert keyboard.writes == [40]
+
+
+def test_quantize():
+    keyboard = make_keyboard(maximum=100, levels=4)
+    assert [keyboard.quantize(v) for v in (0, 1, 16, 17, 50, 84, 100)] == [
+        0,
+        33,
+        33,
+        33,
+        67,
+        100,
+        100,
+    ]
+    assert make_keyboard(maximum=100).quantize(37) == 37
+
+
+async def test_idle_and_wake():
+    keyboard = make_keyboard()
+    await keyboard.on_lighting_event(lux(100))
+    target = keyboard.target_for_lux(100)
+    await keyboard.on_idle_event(LightControlHubActivityUpdate(is_idle=True))
+    assert keyboard.stored == target
+    await keyboard.on_idle_event(LightControlHubActivityUpdate(is_idle=False))
+    assert keyboard.writes == [target, 0, target]
+
+
+def test_gnome_levels_include_off():
+    keyboard = DBusGnomeKeyboardBacklight(None, keyboard_config())
+    keyboard._steps = 3
+    assert keyboard.capabilities.levels == 4
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        keyboard_config(),
+        keyboard_config(lux_min=0, lux_max=50, lux_off=60, kb_min=1, maximum=3),
+        keyboard_config(lux_min=3.3, lux_max=777.7, lux_off=900, kb_min=1, maximum=255),
+    ],
+)
+def test_lux_band_edges_match_target(config):
+    keyboard = FakeKeyboardBacklight(None, config)
+    for step in range(-50, 10_000):
+        value = step / 10
+        low, high = keyboard.lux_band(value)
+        target = keyboard.target_for_lux(value)
+        assert low <= value < high
+        # Both ends of the band have the target, the readings just outside
+        # do not.
+        if low > -math.inf:
+            assert keyboard.target_for_lux(low) == target
+            assert keyboard.target_for_lux(math.nextafter(low, -math.inf)) != target
+        if high < math.inf:
+            assert keyboard.target_for_lux(math.nextafter(high, -math.inf)) == target
+            assert keyboard.target_for_lux(high) != target
+
+
+def test_lux_band_above_off():
+    keyboard = make_keyboard()
+    assert keyboard.lux_band(1000) == (400, math.inf)
+    assert keyboard.lux_band(400) == (400, math.inf)
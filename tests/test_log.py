@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import logging
+import threading
+
+from backlight_control import log
+from backlight_control.log import RateLimitFilter
+
+
+def make_record(msg: object, *args: object, name: str = "test") -> logging.LogRecord:
+    return logging.LogRecord(name, logging.INFO, __file__, 0, msg, args, None)
+
+
+def test_burst_then_suppress(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(log.time, "monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(rate=1.0, burst=2)
+    passed = [rate_limit.filter(make_record("Got %d", i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    now[0] = 1.0
+    record = make_record("Got %d", 5)
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "Got 5 (3 similar messages suppressed)"
+
+
+def test_buckets_are_per_logger_and_template(monkeypatch):
+    monkeypatch.setattr(log.time, "monotonic", lambda: 0.0)
+    rate_limit = RateLimitFilter(rate=1.0, burst=1)
+    assert rate_limit.filter(make_record("a"))
+    assert rate_limit.filter(make_record("b"))
+    assert rate_limit.filter(make_record("a", name="other"))
+    assert not rate_limit.filter(make_record("a"))
+
+
+def test_literal_percent_survives_suppression_note(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(log.time, "monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(rate=1.0, burst=1)
+    rate_limit.filter(make_record("At 100%"))
+    rate_limit.filter(make_record("At 100%"))
+    now[0] = 1.0
+    record = make_record("At 100%")
+    assert rate_limit.filter(record)
+    assert record.getMessage() == "At 100% (1 similar messages suppressed)"
+
+
+def test_warnings_and_unhashable_messages_pass():
+    rate_limit = RateLimitFilter(rate=1.0, burst=0)
+    record = make_record("Failed")
+    record.levelno = logging.WARNING
+    assert rate_limit.filter(record)
+    assert rate_limit.filter(make_record({"a": 1}))
+
+
+def test_concurrent_loggers_share_one_budget(monkeypatch):
+    monkeypatch.setattr(log.time, "monotonic", lambda: 0.0)
+    rate_limit = RateLimitFilter(rate=1.0, burst=100)
+    passed = []
+    start = threading.Barrier(8)
+
+    def spam() -> None:
+        start.wait()
+        passed.append(sum(rate_limit.filter(make_record("Tick")) for _ in range(50)))
+
+    threads = [threading.Thread(target=spam) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(passed) == 100
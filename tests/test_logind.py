@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import os
+
+from dbus_fast import Variant
+
+from backlight_control.logind import LogindMonitor
+
+from .conftest import settle
+
+
+class Hub:
+    """Records suspend() and resume(), each taking a moment like the real one."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def create_task(self, coro) -> asyncio.Task:
+        return asyncio.create_task(coro)
+
+    async def suspend(self) -> None:
+        self.calls.append("suspend")
+        await asyncio.sleep(0.01)
+        self.calls.append("suspended")
+
+    async def resume(self) -> None:
+        self.calls.append("resume")
+        await asyncio.sleep(0.01)
+        self.calls.append("resumed")
+
+
+class Manager:
+    """Hands out delay inhibitors as pipe ends, like logind hands out fds."""
+
+    def __init__(self) -> None:
+        self.inhibitors: list[int] = []
+
+    async def call_inhibit(self, what, who, why, mode) -> int:
+        assert (what, mode) == ("sleep", "delay")
+        read_end, write_end = os.pipe()
+        os.close(write_end)
+        self.inhibitors.append(read_end)
+        return read_end
+
+
+def is_open(fd: int) -> bool:
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+def make_monitor() -> LogindMonitor:
+    monitor = LogindMonitor(Hub())
+    monitor._manager = Manager()
+    return monitor
+
+
+async def test_sleep_suspends_then_releases_inhibitor():
+    monitor = make_monitor()
+    await monitor._update()
+    (inhibitor,) = monitor._manager.inhibitors
+    monitor._prepare_for_sleep(True)
+    await asyncio.sleep(0.05)
+    assert monitor._hub.calls[-2:] == ["suspend", "suspended"]
+    # Sleep only goes ahead once the hub has released the sensor.
+    assert not is_open(inhibitor)
+    assert monitor._inhibitor is None
+
+
+async def test_wake_resumes_and_takes_new_inhibitor():
+    monitor = make_monitor()
+    await monitor._update()
+    monitor._prepare_for_sleep(True)
+    await asyncio.sleep(0.05)
+    monitor._prepare_for_sleep(False)
+    await asyncio.sleep(0.05)
+    assert monitor._hub.calls[-2:] == ["resume", "resumed"]
+    assert len(monitor._manager.inhibitors) == 2
+    assert monitor._inhibitor == monitor._manager.inhibitors[-1]
+    assert is_open(monitor._inhibitor)
+    monitor.stop()
+    assert not is_open(monitor._manager.inhibitors[-1])
+
+
+async def test_updates_do_not_interleave():
+    monitor = make_monitor()
+    monitor._prepare_for_sleep(True)
+    await settle()
+    # Wake arrives while the hub is still suspending.
+    assert monitor._hub.calls == ["suspend"]
+    monitor._prepare_for_sleep(False)
+    await asyncio.sleep(0.05)
+    assert monitor._hub.calls == ["suspend", "suspended", "resume", "resumed"]
+    # The last signal wins: awake, holding an inhibitor for the next sleep.
+    assert is_open(monitor._inhibitor)
+    monitor.stop()
+
+
+async def test_lid_close_suspends_without_releasing_inhibitor():
+    monitor = make_monitor()
+    await monitor._update()
+    monitor._properties_changed({"LidClosed": Variant("b", True)}, [])
+    await asyncio.sleep(0.05)
+    assert monitor._hub.calls[-2:] == ["suspend", "suspended"]
+    assert is_open(monitor._inhibitor)
+    monitor._properties_changed({"LidClosed": Variant("b", False)}, [])
+    await asyncio.sleep(0.05)
+    assert monitor._hub.calls[-2:] == ["resume", "resumed"]
+    monitor.stop()
+
+
+async def test_other_properties_are_ignored():
+    monitor = make_monitor()
+    monitor._properties_changed({"IdleHint": Variant("b", True)}, [])
+    await settle()
+    assert monitor._hub.calls == []
@@ -0,0 +1,108 @@
+"""Drive the hub through many synthetic events and check memory stays flat.
+
+The default run is short enough for every test run. Set SOAK_EVENTS for a
+real soak, e.g. SOAK_EVENTS=1000000 takes about three minutes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import gc
+import os
+import sys
+import tracemalloc
+
+from dbus_fast import Variant
+
+from backlight_control.plugins.light_sensor.dbus_sensorproxy import (
+    DBusSensorProxyLightSensor,
+)
+
+from .conftest import lux
+
+SOAK_EVENTS = int(os.environ.get("SOAK_EVENTS", 10_000))
+# Tracing makes every allocation several times slower, so only part of the
+# soak runs under tracemalloc. The rest is checked by allocated block count.
+TRACED_EVENTS = min(SOAK_EVENTS, 50_000)
+WARM_UP_EVENTS = min(SOAK_EVENTS, 20_000)
+MAX_BLOCK_GROWTH = 1_000
+MAX_TRACED_GROWTH = 64 * 1024
+
+
+class FakeSensorProxy:
+    """Replies of iio-sensor-proxy, for the real sensorproxy plugin."""
+
+    def __init__(self) -> None:
+        self.level = 0.0
+
+    async def call_claim_light(self) -> None:
+        pass
+
+    async def call_release_light(self) -> None:
+        pass
+
+    async def call_get_all(self, interface: str) -> dict:
+        return {
+            "LightLevel": Variant("d", self.level),
+            "LightLevelUnit": Variant("s", "lux"),
+        }
+
+
+async def drive(hub, sensor, proxy, events: int) -> None:
+    """Send light signals, idle edges and the odd suspend, in a fixed cycle."""
+    monitor = hub.activity_monitor
+    for i in range(events):
+        step = i % 100
+        if step == 40:
+            await monitor.trigger_idle()
+        elif step == 60:
+            await monitor.end_idle()
+        elif step == 99 and i % 1000 == 999:
+            await hub.suspend()
+            await hub.resume()
+        elif step % 7 == 0:
+            # Light readings that the hub applied before, in a different order.
+            await hub.light_sensor_update(lux(i % 500))
+        else:
+            proxy.level = float(i % 450)
+            sensor._properties_changed({"LightLevel": Variant("d", proxy.level)}, [])
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+
+async def test_memory_stays_flat(make_hub, hub_config):
+    hub_config["light_sensor"]["release_delay"] = 0
+    hub = await make_hub(hub_config)
+    proxy = FakeSensorProxy()
+    sensor = DBusSensorProxyLightSensor(hub)
+    sensor._loop = asyncio.get_running_loop()
+    sensor._iio_sensor = proxy
+    sensor._iio_dbus_properties = proxy
+    hub._light_sensor = sensor
+
+    # Only keep the last writes, the list itself would grow otherwise.
+    hub._keyboard_backlight.writes = deque(maxlen=100)
+
+    await drive(hub, sensor, proxy, WARM_UP_EVENTS)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    await drive(hub, sensor, proxy, SOAK_EVENTS - TRACED_EVENTS)
+    gc.collect()
+    block_growth = sys.getallocatedblocks() - blocks
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        await drive(hub, sensor, proxy, TRACED_EVENTS)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "lineno"))
+    top = "\n".join(str(stat) for stat in after.compare_to(before, "lineno")[:5])
+
+    assert hub._keyboard_backlight.writes
+    assert sensor._signals > SOAK_EVENTS // 2
+    assert block_growth < MAX_BLOCK_GROWTH, f"{block_growth} more blocks"
+    assert growth < MAX_TRACED_GROWTH, f"grew by {growth} bytes:\n{top}"
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import time
+
+import pytest
+
+from backlight_control import once
+from backlight_control.once import ONCE_TIME_TARGET, apply_once
+from backlight_control.state import StateStore
+
+from .conftest import FakeKeyboardBacklight, FakeLightSensor, lux
+
+
+@pytest.fixture
+def once_config(hub_config) -> dict:
+    return {**hub_config, "once_deadline": 0.2}
+
+
+@pytest.fixture
+def keyboards(monkeypatch) -> list[FakeKeyboardBacklight]:
+    created = []
+    original = FakeKeyboardBacklight.__init__
+
+    def init(self, hub, config):
+        original(self, hub, config)
+        created.append(self)
+
+    monkeypatch.setattr(FakeKeyboardBacklight, "__init__", init)
+    return created
+
+
+def sensor_reads(monkeypatch, value: int | None, delay: float = 0) -> None:
+    async def start(self):
+        if value is None:
+            return
+        await asyncio.sleep(delay)
+        await self.hub.light_sensor_update(lux(value))
+
+    monkeypatch.setattr(FakeLightSensor, "start", start)
+
+
+def write_snapshot(config: dict, value: int) -> None:
+    store = StateStore(config["state_file"], 0)
+    store.update(lux=value, lux_unit="lux")
+    store.flush()
+
+
+async def test_applies_reading(fake_plugins, once_config, keyboards, monkeypatch):
+    sensor_reads(monkeypatch, 100)
+    assert await apply_once(once_config) == 0
+    (keyboard,) = keyboards
+    assert keyboard.writes == [keyboard.target_for_lux(100)]
+
+
+async def test_falls_back_to_snapshot(
+    fake_plugins, once_config, keyboards, monkeypatch
+):
+    sensor_reads(monkeypatch, None)
+    write_snapshot(once_config, 200)
+    assert await apply_once(once_config) == 0
+    (keyboard,) = keyboards
+    assert keyboard.writes == [keyboard.target_for_lux(200)]
+
+
+async def test_fails_without_reading(fake_plugins, once_config, keyboards, monkeypatch):
+    sensor_reads(monkeypatch, None)
+    assert await apply_once(once_config) == 1
+    assert keyboards[0].writes == []
+
+
+async def test_sensor_error_uses_snapshot(
+    fake_plugins, once_config, keyboards, monkeypatch
+):
+    async def start(self):
+        raise OSError("no sensor")
+
+    monkeypatch.setattr(FakeLightSensor, "start", start)
+    write_snapshot(once_config, 200)
+    assert await apply_once(once_config) == 0
+    assert keyboards[0].writes == [keyboards[0].target_for_lux(200)]
+
+
+async def test_output_start_failure(fake_plugins, once_config, keyboards, monkeypatch):
+    async def start(self):
+        raise OSError("no backlight")
+
+    monkeypatch.setattr(FakeKeyboardBacklight, "start", start)
+    sensor_reads(monkeypatch, 100)
+    assert await apply_once(once_config) == 1
+    assert keyboards[0].writes == []
+
+
+async def test_slow_output_start_does_not_use_sensor_deadline(
+    fake_plugins, once_config, keyboards, monkeypatch
+):
+    async def start(self):
+        await asyncio.sleep(0.3)
+
+    monkeypatch.setattr(FakeKeyboardBacklight, "start", start)
+    sensor_reads(monkeypatch, 100)
+    assert await apply_once(once_config) == 0
+    assert keyboards[0].writes == [keyboards[0].target_for_lux(100)]
+
+
+async def test_time_target(fake_plugins, once_config, keyboards, monkeypatch):
+    sensor_reads(monkeypatch, 100, delay=0.05)
+    hubs = []
+    original = once.OneShotHub.__init__
+
+    def init(self, config):
+        original(self, config)
+        hubs.append(self)
+
+    monkeypatch.setattr(once.OneShotHub, "__init__", init)
+    started = time.monotonic()
+    assert await apply_once(once_config) == 0
+    elapsed = time.monotonic() - started
+    assert hubs[0].sensor_wait >= 0.05
+    assert elapsed - hubs[0].sensor_wait < ONCE_TIME_TARGET
+
+
+def test_skips_daemon_imports():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, backlight_control.once;print(' '.join(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout.split()
+    for module in (
+        "backlight_control.hub",
+        "backlight_control.activity_monitor",
+        "backlight_control.event_bus",
+        "backlight_control.status_page",
+    ):
+        assert module not in loaded
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+import time
+
+from backlight_control.state import StateSnapshot, StateStore
+
+
+async def test_round_trip(tmp_path):
+    path = tmp_path / "state" / "state.json"
+    store = StateStore(str(path), 0)
+    store.update(lux=120, lux_unit="lux", stored=3)
+    store.flush()
+
+    snapshot = StateStore(str(path), 0).load()
+    assert snapshot is not None
+    assert (snapshot.lux, snapshot.lux_unit, snapshot.stored) == (120, "lux", 3)
+    assert snapshot.age() < 5
+
+
+def test_missing_or_broken_file(tmp_path):
+    assert StateStore(str(tmp_path / "missing.json"), 0).load() is None
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+    assert StateStore(str(broken), 0).load() is None
+
+
+def test_unknown_keys_are_ignored(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"lux": 5, "target": 40, "is_idle": True}))
+    assert StateStore(str(path), 0).load() == StateSnapshot(lux=5)
+
+
+def test_age():
+    assert StateSnapshot(timestamp=time.time() - 100).age() >= 100
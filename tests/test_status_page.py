@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import math
+import threading
+
+from backlight_control.status_page import (
+    _SEQUENCE,
+    _SEQUENCE_OFFSET,
+    StatusPage,
+    read_status,
+)
+from backlight_control.types import LightControlHubState
+
+
+def open_page(tmp_path) -> tuple[StatusPage, str]:
+    path = str(tmp_path / "run" / "status")
+    page = StatusPage(path)
+    page.open()
+    return page, path
+
+
+def test_round_trip(tmp_path):
+    page, path = open_page(tmp_path)
+    page.update(
+        lux=123.5,
+        target=40,
+        written=33,
+        state=LightControlHubState.IDLE_OFF,
+        is_idle=True,
+    )
+    status = read_status(path)
+    page.close()
+    assert status is not None
+    assert status.sequence == 2
+    assert (status.lux, status.target, status.written) == (123.5, 40, 33)
+    assert status.state == LightControlHubState.IDLE_OFF
+    assert status.is_idle
+
+
+def test_unknown_values(tmp_path):
+    page, path = open_page(tmp_path)
+    page.update(
+        lux=None,
+        target=None,
+        written=None,
+        state=LightControlHubState.ACTIVE_ON,
+        is_idle=False,
+    )
+    status = read_status(path)
+    page.close()
+    assert status is not None
+    assert math.isnan(status.lux)
+    assert (status.target, status.written) == (-1, -1)
+
+
+def test_missing_or_empty_page(tmp_path):
+    assert read_status(str(tmp_path / "missing")) is None
+    page, path = open_page(tmp_path)
+    # Opened but never written: no magic yet.
+    assert read_status(path) is None
+    page.close()
+
+
+def test_update_in_progress_is_not_read(tmp_path):
+    page, path = open_page(tmp_path)
+    page.update(
+        lux=1.0,
+        target=1,
+        written=1,
+        state=LightControlHubState.ACTIVE_ON,
+        is_idle=False,
+    )
+    # As if the writer died between the odd and the even store.
+    _SEQUENCE.pack_into(page._map, _SEQUENCE_OFFSET, 3)
+    assert read_status(path, retries=3) is None
+    page.close()
+
+
+def test_concurrent_reads_are_consistent(tmp_path):
+    page, path = open_page(tmp_path)
+    stop = threading.Event()
+
+    def write() -> None:
+        value = 0
+        while not stop.is_set():
+            value += 1
+            page.update(
+                lux=float(value),
+                target=value,
+                written=value,
+                state=LightControlHubState.ACTIVE_ON,
+                is_idle=bool(value % 2),
+            )
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        reads = 0
+        while reads < 2000:
+            status = read_status(path)
+            if status is None:
+                continue
+            reads += 1
+            assert status.lux == status.target == status.written
+            assert status.is_idle == bool(status.target % 2)
+            assert status.sequence == 2 * status.target
+    finally:
+        stop.set()
+        writer.join()
+        page.close()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from itertools import product
+
+import pytest
+
+from backlight_control.activity_monitor import CONF_IDLE_DELAY
+from backlight_control.keyboard_backlight import (
+    CONF_KEYBOARD_MIN_BRIGHTNESS,
+    CONF_LUX_FOR_KEYBOARD_OFF,
+    CONF_LUX_FOR_MAX_BRIGHTNESS,
+    CONF_LUX_FOR_MIN_BRIGHTNESS,
+)
+
+from .conftest import FakeKeyboardBacklight, keyboard_config
+
+np = pytest.importorskip("numpy")
+sweep = pytest.importorskip("backlight_control.sweep")
+
+# Includes degenerate cells: lux_min >= lux_max, lux_off below the curve and
+# keyboard_min_brightness above the maximum.
+GRID_VALUES = {
+    CONF_LUX_FOR_MIN_BRIGHTNESS: [0, 10, 50, 300],
+    CONF_LUX_FOR_MAX_BRIGHTNESS: [10, 100, 300],
+    CONF_LUX_FOR_KEYBOARD_OFF: [5, 100, 400],
+    CONF_KEYBOARD_MIN_BRIGHTNESS: [0, 1, 2, 10],
+    CONF_IDLE_DELAY: [3, 20],
+}
+
+
+def make_grid() -> dict:
+    return sweep.build_grid({name: np.array(v) for name, v in GRID_VALUES.items()})
+
+
+def keyboard_for(grid: dict, i: int, maximum: int, levels=None):
+    return FakeKeyboardBacklight(
+        None,
+        keyboard_config(
+            lux_min=grid[CONF_LUX_FOR_MIN_BRIGHTNESS][i],
+            lux_max=grid[CONF_LUX_FOR_MAX_BRIGHTNESS][i],
+            lux_off=grid[CONF_LUX_FOR_KEYBOARD_OFF][i],
+            kb_min=grid[CONF_KEYBOARD_MIN_BRIGHTNESS][i],
+            maximum=maximum,
+            levels=levels,
+        ),
+    )
+
+
+def recording(seed: int = 0, length: int = 2000):
+    rng = np.random.default_rng(seed)
+    times = np.sort(rng.choice(length, length // 4, replace=False)).astype(float)
+    lux = np.column_stack(
+        [times, rng.choice([0, 5, 10, 40, 99, 150, 350, 500], times.size)]
+    )
+    activity = np.sort(rng.choice(length, length // 30, replace=False)).astype(float)
+    return lux, activity
+
+
+@pytest.mark.parametrize("maximum", [3, 100])
+def test_target_levels_matches_target_for_lux(maximum):
+    grid = make_grid()
+    lux = np.array(
+        [0, 1, 5, 9, 10, 11, 50, 99, 100, 101, 299, 300, 301, 399, 400, 9999]
+    )
+    levels = sweep.target_levels(grid, lux, maximum)
+    for i in range(grid[CONF_IDLE_DELAY].size):
+        kb = keyboard_for(grid, i, maximum)
+        assert levels[i].tolist() == [kb.target_for_lux(value) for value in lux]
+
+
+@pytest.mark.parametrize(("maximum", "levels"), [(3, 4), (100, 4), (100, 11), (255, 3)])
+def test_quantize_levels_matches_quantize(maximum, levels):
+    kb = FakeKeyboardBacklight(None, keyboard_config(maximum=maximum, levels=levels))
+    target = np.arange(-1, maximum + 20)
+    assert sweep.quantize_levels(target, maximum, levels).tolist() == [
+        kb.quantize(int(value)) for value in target
+    ]
+
+
+def replay(kb, keys, durations, lux_values):
+    """Replay the segments through the live policy, one write at a time."""
+    maximum = kb.maximum
+    time_at_level = [0.0] * (maximum + 1)
+    writes = toggles = 0
+    rejected = 0.0
+    written = None
+    for key, duration in zip(keys, durations, strict=True):
+        # Idle segments are off, active ones at the target for their lux value.
+        value = 0 if key % 2 else kb.quantize(kb.target_for_lux(lux_values[key // 2]))
+        if written is not None and value != written:
+            writes += 1
+            toggles += (value > 0) != (written > 0)
+        written = value
+        if 0 <= value <= maximum:
+            time_at_level[int(value)] += duration
+        else:
+            rejected += duration
+    return writes, toggles, time_at_level, rejected
+
+
+@pytest.mark.parametrize(("maximum", "levels"), [(3, None), (100, None), (100, 4)])
+def test_sweep_matches_replay(maximum, levels):
+    grid = make_grid()
+    lux, activity = recording()
+    results = sweep.sweep(grid, lux, activity, maximum, levels, chunk_cells=100)
+
+    lux_values, lux_index = np.unique(lux[:, 1], return_inverse=True)
+    for idle_delay in GRID_VALUES[CONF_IDLE_DELAY]:
+        keys, durations = sweep.segment(lux, lux_index, activity, idle_delay)
+        for i in np.flatnonzero(grid[CONF_IDLE_DELAY] == idle_delay):
+            kb = keyboard_for(grid, i, maximum, levels)
+            writes, toggles, time_at_level, rejected = replay(
+                kb, keys, durations, lux_values
+            )
+            assert results["writes"][i] == writes
+            assert results["toggles"][i] == toggles
+            assert results["time_at_level"][i] == pytest.approx(time_at_level)
+            assert results["rejected_time"][i] == pytest.approx(rejected)
+
+
+def test_parse_values():
+    assert sweep.parse_values("1,2.5,4").tolist() == [1, 2.5, 4]
+    assert sweep.parse_values("0:10:5").tolist() == [0, 5, 10]
+
+
+def test_build_grid_is_cartesian_product():
+    grid = sweep.build_grid({"a": np.array([1, 2]), "b": np.array([3, 4, 5])})
+    pairs = list(zip(grid["a"].tolist(), grid["b"].tolist(), strict=True))
+    assert pairs == list(product([1, 2], [3, 4, 5]))